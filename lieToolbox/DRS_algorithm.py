@@ -1,10 +1,211 @@
-import execjs, os
+"""This file stores the Domino Robinson-Schensted algorithm for signed
+permutations. It is a native port of the insertion procedure in Tableau.js
+(Devra Garfinkle Johnson, MIT License), so no JS runtime is needed.
+"""
+
+import os
 #from tkinter import *
 
+
+def firstGreater(count: int, number: int, value) -> int:
+    """This function returns the first k < count with value(k) > number, or
+    count, by bisection, for value increasing in k (bisect_right with a key,
+    which needs Python 3.10).
+    """
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if number < value(mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+class Domino:
+    """This class stores the content, location and orientation of one domino
+    in a domino tableau.
+    """
+    __slots__ = ('n', 'x', 'y', 'horizontal')
+
+    def __init__(dmn, n: int, x: int = 0, y: int = 0, horizontal: bool = True):
+        dmn.n = n
+        dmn.x = x
+        dmn.y = y
+        dmn.horizontal = horizontal
+
+    def serialize(dmn):
+        return {'n': dmn.n, 'x': dmn.x, 'y': dmn.y, 'horizontal': dmn.horizontal}
+
+
+class DominoTableau:
+    """This class handles a domino tableau of type C (no zero square), which
+    is filled by the Domino Robinson-Schensted insertion. The grid stores a
+    reference to the covering domino in each box, row by row.
+    """
+
+    def __init__(dt):
+        dt.dominoList = []
+        dt.grid = []
+        dt.columnLengths = []
+
+    def get(dt, x, y):
+        if y < len(dt.grid) and x < len(dt.grid[y]):
+            return dt.grid[y][x]
+        return None
+
+    def set(dt, x, y, dmn):
+        if y == len(dt.grid):
+            dt.grid.append([])
+        row = dt.grid[y]
+        if x == len(row):
+            row.append(dmn)
+        else:
+            row[x] = dmn
+        if x == len(dt.columnLengths):
+            dt.columnLengths.append(0)
+        if dt.columnLengths[x] <= y:
+            dt.columnLengths[x] = y + 1
+
+    def addDomino(dt, dmn):
+        dt.set(dmn.x, dmn.y, dmn)
+        if dmn.horizontal:
+            dt.set(dmn.x + 1, dmn.y, dmn)
+        else:
+            dt.set(dmn.x, dmn.y + 1, dmn)
+
+    def columnLength(dt, x):
+        if x < len(dt.columnLengths):
+            return dt.columnLengths[x]
+        return 0
+
+    def rowData(dt, y, number):
+        """Find the first box in row y whose content exceeds number, together
+        with the domino(s) bumped by a horizontal domino placed there.
+        """
+        row = dt.grid[y] if y < len(dt.grid) else []
+        x = firstGreater(len(row), number, lambda k: row[k].n)
+        if x == len(row):
+            return x, None, None
+        domino1 = row[x]
+        domino2 = domino1 if domino1.horizontal else dt.get(x + 1, y)
+        return x, domino1, domino2
+
+    def columnData(dt, x, number):
+        """Find the first box in column x whose content exceeds number, together
+        with the domino(s) bumped by a vertical domino placed there.
+        """
+        grid = dt.grid
+        y = firstGreater(dt.columnLength(x), number, lambda k: grid[k][x].n)
+        if y == dt.columnLength(x):
+            return y, None, None
+        domino1 = grid[y][x]
+        domino2 = domino1 if not domino1.horizontal else dt.get(x, y + 1)
+        return y, domino1, domino2
+
+    def nextRobinsonSchensted(dt, rsNumber: int):
+        """This function adds one signed number to the tableau using the Domino
+        Robinson-Schensted procedure, positive numbers start as a horizontal
+        domino in the first row and negative ones as a vertical domino in the
+        first column.
+        """
+        m = abs(rsNumber)
+        if rsNumber > 0:
+            x, domino1, domino2 = dt.rowData(0, m)
+            y, horizontal = 0, True
+        else:
+            y, domino1, domino2 = dt.columnData(0, m)
+            x, horizontal = 0, False
+        newDomino = Domino(m, x, y, horizontal)
+        dt.dominoList.append(newDomino)
+        dt.addDomino(newDomino)
+
+        while domino1 is not None:
+            if horizontal:
+                if domino1.horizontal:
+                    y = domino1.y + 1
+                    x, nextDomino1, nextDomino2 = dt.rowData(y, domino1.n)
+                    domino1.x, domino1.y = x, y
+                    dt.addDomino(domino1)
+                    domino1, domino2 = nextDomino1, nextDomino2
+                else:
+                    nextDomino = dt.get(x + 1, y + 1)
+                    domino1.y += 1
+                    domino1.horizontal = True
+                    dt.set(x + 1, y + 1, domino1)
+                    x += 1
+                    horizontal = False
+                    domino1, domino2 = domino2, nextDomino
+            else:
+                if not domino1.horizontal:
+                    x = domino1.x + 1
+                    y, nextDomino1, nextDomino2 = dt.columnData(x, domino1.n)
+                    domino1.x, domino1.y = x, y
+                    dt.addDomino(domino1)
+                    domino1, domino2 = nextDomino1, nextDomino2
+                else:
+                    nextDomino = dt.get(x + 1, y + 1)
+                    domino1.x += 1
+                    domino1.horizontal = False
+                    dt.set(x + 1, y + 1, domino1)
+                    y += 1
+                    horizontal = True
+                    domino1, domino2 = domino2, nextDomino
+        return x, y, horizontal
+
+    def verticalNum(dt):
+        count = 0
+        for dmn in dt.dominoList:
+            if not dmn.horizontal:
+                count += 1
+        return count
+
+    def serialize(dt):
+        """This function returns the same structure as the tableau object of
+        Tableau.js, i.e. a dominoList sorted by content and a dominoGrid.
+        """
+        dominoList = sorted(dt.dominoList, key=lambda dmn: dmn.n)
+        rowLengths = [len(row) for row in dt.grid]
+        return {'dominoList': [dmn.serialize() for dmn in dominoList],
+                'dominoGrid': {'grid': [[dmn.serialize() for dmn in row]
+                                        for row in dt.grid],
+                               'rowLengths': rowLengths,
+                               'columnLengths': list(dt.columnLengths)}}
+
+
+def dominoInsertion(w):
+    """Insert a signed permutation into an empty domino tableau.
+
+    Args:
+        w (list): signed permutation, e.g. [-3, 1, -2, 5, -4]
+
+    Returns:
+        DominoTableau: the resulting tableau
+    """
+    dt = DominoTableau()
+    for k in w:
+        dt.nextRobinsonSchensted(int(k))
+    return dt
+
+
 def w2DominoTableau(w):
+    return dominoInsertion(w).serialize()
+
+
+def w2VerticalDominoBoxes(w):
+    """Counting mode of the Domino Robinson-Schensted algorithm, which returns
+    only the number of vertical dominoes without building the tableau dict.
+    """
+    return dominoInsertion(w).verticalNum()
+
+
+def w2DominoTableauJS(w):
+    """Reference implementation running Tableau.js, kept for cross-checking.
+    It requires PyExecJS and a JS runtime.
+    """
+    import execjs
     node = execjs.get()
-    file_path = os.path.join('lieToolbox', 'Tableau.js')
-    #file_path = os.path.join('Tableau.js')
+    file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Tableau.js')
     with open(file_path, encoding='utf-8') as file:
         ctx2 = node.compile(file.read())
     strw = [str(i) for i in w]
@@ -35,25 +236,26 @@ def vertical_domino_boxes(domino):
 #         else:
 #             dmn_wd = d
 #             dmn_ht = 2*d
-#         tableau_cv.create_rectangle(x0+d*dmn['x'], 
-#                                     y0+d*dmn['y'], 
-#                                     x0+d*dmn['x']+dmn_wd, 
+#         tableau_cv.create_rectangle(x0+d*dmn['x'],
+#                                     y0+d*dmn['y'],
+#                                     x0+d*dmn['x']+dmn_wd,
 #                                     y0+d*dmn['y']+dmn_ht)
-#         tableau_cv.create_text(x0+d*dmn['x']+dmn_wd/2, 
-#                                y0+d*dmn['y']+dmn_ht/2, 
+#         tableau_cv.create_text(x0+d*dmn['x']+dmn_wd/2,
+#                                y0+d*dmn['y']+dmn_ht/2,
 #                                text=str(dmn['n']))
 #     tableau_cv.pack()
 #     base.mainloop()
-    
+
 if __name__ == '__main__':
     domino = w2DominoTableau([-3,1,-2,5,-4])
     #printDominoTableau(domino)
     print(vertical_domino_boxes(domino))
+    print(w2VerticalDominoBoxes([-3,1,-2,5,-4]))
     # ent = "1 2 -4 3 -5 -6"
     # rst = ctx2.call("calc",ent)
     # print(rst["left"]["dominoList"])
     # data = json.dumps(rst, indent=4,ensure_ascii=False, sort_keys=False,separators=(',', ':'))
     # print(data)
-    
+
 
 
@@ -0,0 +1,114 @@
+"""This file stores the H-algorithm (hollow box algorithm), which makes the
+shape of a Robinson-Schensted tableau into a partition of the right type.
+It is a portable replacement of the HAlgorithm extension with the same API.
+
+Mode codes:
+    1: A, 2: B, 3: C, 4: D, 5: metaplectic
+
+For a partition p (rows indexed from 0), the last box of row i is hollow when
+p[i] + i has the parity of the mode. Two neighbouring rows of equal length
+whose last boxes are paired by this parity are exempt, the remaining rows are
+labelled 1, 2, 3, ... from top to bottom. The algorithm removes the hollow
+boxes, adds back one box in each row of odd (resp. even) label, repairs the
+shape and finally fixes the parity of the total size.
+"""
+
+# mode: (hollow parity, parity of labels to refill, parity of size to fix)
+MODES = {2: (1, 1, 0),
+         3: (1, 0, None),
+         4: (0, 0, 1),
+         5: (0, 1, 1)}
+
+
+def _label(p: list, hollow: int) -> list:
+    label = []
+    n = len(p)
+    k = 1
+    for i in range(n):
+        pi = p[i]
+        if pi > 0 and (pi + i) % 2 == hollow:
+            exempt = i < n - 1 and p[i + 1] == pi
+        else:
+            exempt = pi > 0 and i > 0 and p[i - 1] == pi
+        if exempt:
+            label.append(0)
+        else:
+            label.append(k)
+            k += 1
+    return label
+
+
+def _hollowBox(p: list, hollow: int, refill: int, fix) -> list:
+    label = _label(p, hollow)
+    q = list(p)
+    q.append(0)
+    for i in range(len(p)):
+        if q[i] > 0 and (q[i] + i) % 2 == hollow:
+            q[i] -= 1
+    for i in range(len(p)):
+        if label[i] > 0 and label[i] % 2 == refill:
+            q[i] += 1
+    for i in range(len(q) - 2):
+        if q[i] > q[i + 1] and q[i + 2] > q[i + 1]:
+            q[i + 1] = q[i + 2]
+    if q[1] > q[0]:
+        q[0] += 1
+    while q and q[-1] == 0:
+        q.pop()
+    if fix is not None and sum(q) % 2 == fix:
+        q.append(1)
+    return q
+
+
+def getLabel(p: list, mode: int) -> list:
+    """This function returns the label of each row in the H-algorithm, 0 for
+    rows exempt from refilling.
+
+    Args:
+        p (list): partition
+        mode (int): mode code
+
+    Returns:
+        list: labels
+    """
+    if mode not in MODES:
+        return [0] * len(p)
+    return _label(p, MODES[mode][0])
+
+
+def H_algorithm(p: list, mode: int) -> list:
+    """This function uses hollow box algorithm to make a partition special.
+
+    Args:
+        p (list): partition
+        mode (int): mode code
+
+    Returns:
+        list: new partition
+    """
+    if mode not in MODES or len(p) == 0:
+        return list(p)
+    return _hollowBox(p, *MODES[mode])
+
+
+def batchH_algorithm(partitionList: list, mode: int) -> list:
+    """This function applies the H-algorithm to many partitions of one type in
+    a single call.
+
+    Args:
+        partitionList (list): list of partitions
+        mode (int): mode code
+
+    Returns:
+        list: list of new partitions
+    """
+    if mode not in MODES:
+        return [list(p) for p in partitionList]
+    hollow, refill, fix = MODES[mode]
+    return [_hollowBox(p, hollow, refill, fix) if p else [] for p in partitionList]
+
+
+if __name__ == '__main__':
+    for mode in range(1, 6):
+        print(mode, H_algorithm([4, 3, 3], mode), getLabel([4, 3, 3], mode))
+    print(batchH_algorithm([[3, 2, 1], [2, 2, 1, 1], []], 2))
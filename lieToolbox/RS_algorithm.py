@@ -0,0 +1,100 @@
+"""This file stores the Robinson-Schensted algorithm. It is a portable
+replacement of the RSAlgorithm extension with the same API, plus
+constructShape for callers that only need the row lengths of the tableau.
+
+Row insertion bumps the leftmost entry strictly greater than the inserted
+one, so equal entries stay in the same row.
+"""
+
+from bisect import bisect_right
+from fractions import Fraction
+from random import shuffle
+
+
+def convert2Index(sequence: list) -> list:
+    """This function converts any sequence to an integral sequence with the
+    same relative order, entries closer than 1e-7 get the same index. For
+    exact sequences (int and Fraction) only equal entries do.
+
+    Args:
+        sequence (list): a list of real numbers
+
+    Returns:
+        list: a list of non-negative integers
+    """
+    order = sorted(range(len(sequence)), key=sequence.__getitem__)
+    index = [0] * len(sequence)
+    exact = all(isinstance(x, (int, Fraction)) for x in sequence)
+    k = -1
+    prev = None
+    for i in order:
+        x = sequence[i]
+        if prev is None or (x != prev if exact else x - prev >= 1e-7):
+            k += 1
+            prev = x
+        index[i] = k
+    return index
+
+
+def rowInsertion(tableau: list, x: int) -> list:
+    """This function inserts a number into the tableau by row bumping.
+
+    Args:
+        tableau (list): rows of a Young tableau, modified in place
+        x (int): the number to insert
+
+    Returns:
+        list: the tableau
+    """
+    for row in tableau:
+        k = bisect_right(row, x)
+        if k == len(row):
+            row.append(x)
+            return tableau
+        row[k], x = x, row[k]
+    tableau.append([x])
+    return tableau
+
+
+def constructYoungTableau(sequence: list) -> list:
+    """This function constructs a Young tableau from a sequence.
+
+    Args:
+        sequence (list): a list of integers (usually from convert2Index)
+
+    Returns:
+        list: rows of the tableau
+    """
+    tableau = []
+    for x in sequence:
+        rowInsertion(tableau, x)
+    return tableau
+
+
+def constructYoungTableauRandom(n: int) -> list:
+    """This function constructs a Young tableau from a random permutation of
+    1, ..., n.
+    """
+    sequence = list(range(1, n + 1))
+    shuffle(sequence)
+    return constructYoungTableau(sequence)
+
+
+def constructShape(sequence: list) -> list:
+    """This function returns the shape of the Young tableau of any real
+    sequence, i.e. [len(_) for _ in tableau]. The bumping needs the entries of
+    the rows, so the tableau is built by constructYoungTableau.
+
+    Args:
+        sequence (list): a list of real numbers
+
+    Returns:
+        list: row lengths of the tableau
+    """
+    return [len(row) for row in constructYoungTableau(convert2Index(sequence))]
+
+
+if __name__ == '__main__':
+    print(constructYoungTableau(convert2Index([1.1, 2, 0.1, 1.5, 4, 2.5])))
+    print(constructShape([1.1, 2, 0.1, 1.5, 4, 2.5]))
+    print(constructYoungTableauRandom(6))
@@ -1,12 +1,30 @@
-import os
+"""The web app of lieToolbox. Flask is imported by create_app, so that the
+math core (lieToolbox.weight and the algorithms) can be imported without it.
+"""
 
-from flask import Flask
+import os
 
 
 def create_app(test_config=None):
+    from flask import Flask
+
     # create and configure the app
     app = Flask(__name__, instance_relative_config=True)
     app.secret_key = "super secret key"
+    # path of the SQLite result store, see lieToolbox.store
+    # ORBIT_TABLES_RANK: load the orbit tables up to this rank at start, see
+    # lieToolbox.tables
+    app.config.from_mapping(RESULT_STORE=os.environ.get('LIETOOLBOX_STORE'),
+                            METRICS=bool(os.environ.get('LIETOOLBOX_METRICS')),
+                            ORBIT_TABLES_RANK=int(os.environ.get('LIETOOLBOX_TABLES_RANK', 0)))
+    if test_config is not None:
+        app.config.from_mapping(test_config)
+    if app.config['ORBIT_TABLES_RANK']:
+        from . import tables
+        tables.warmTables(app.config['ORBIT_TABLES_RANK'])
+    if app.config['METRICS']:  # stage timers, see lieToolbox.metrics
+        from . import metrics
+        metrics.initApp(app)
     # a simple page that says hello
     @app.route('/hello')
     def hello():
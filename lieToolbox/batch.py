@@ -0,0 +1,452 @@
+"""This file stores the batch classification of highest weight modules. The
+weights are given as the rows of a 2-D NumPy array. Entry typing (integer,
+half integer, other), decomposition and grouping into congruence classes are
+carried out on the whole array at once, only the Robinson-Schensted,
+H-algorithm and collapse steps run per row. The results are returned as
+columns.
+
+Two entries are congruent when their difference (resp. sum or difference for
+type B, C and D) is an integer up to Tol, which is decided by comparing the
+fractional parts on a grid of width Tol.
+"""
+
+import numpy as np
+
+from lieToolbox import RS_algorithm as rsa
+from lieToolbox.weight import (Weight, WeightStruct, HighestWeightModule,
+                               Partition)
+
+Tol = 1e-7
+Scale = 10**7  # number of congruence keys in [0, 1), i.e. 1/Tol
+
+# H-algorithm types for the integral and half integral part
+HTypes = {'B': ('B', 'D'), 'C': ('C', 'metaplectic'), 'D': ('D', 'metaplectic')}
+# a-function types for the integral and half integral part
+ATypes = {'B': ('b', 'b'), 'C': ('b', 'd'), 'D': ('d', 'd')}
+
+
+def splitComplex(weights, type: str = 'R'):
+    """This function splits a batch of weights into real and imaginary parts.
+    Complex weights can be given either as a complex array or, as in Weight,
+    as real arrays whose first half of columns is the real part.
+
+    Args:
+        weights (array_like): 2-D array, one weight per row
+        type (str): 'R' or 'C'
+
+    Returns:
+        tuple: real part, imaginary part (None for real weights)
+    """
+    weights = np.asarray(weights)
+    if weights.ndim != 2:
+        raise ValueError('weights must be a 2-D array')
+    if np.iscomplexobj(weights):
+        return weights.real.astype(float), weights.imag.astype(float)
+    weights = weights.astype(float)
+    if type == 'C':
+        n = weights.shape[1] // 2
+        return weights[:, :n], weights[:, n:2 * n]
+    return weights, None
+
+
+def packWeights(weights):
+    """This function packs weights of one length into one array, one row per
+    weight: a complex128 array (see Weight.complexEntry) if one weight is
+    complex, a float array otherwise. classifyMany reads both.
+
+    Args:
+        weights (iterable): Weight objects
+
+    Returns:
+        ndarray: 2-D array
+    """
+    weights = list(weights)
+    if any(lbd.type == 'C' for lbd in weights):
+        return np.array([lbd.complexEntry() for lbd in weights], dtype=complex)
+    return np.array([lbd.entry for lbd in weights], dtype=float)
+
+
+def entryTypes(realPart):
+    """This function decides the type of every entry, as getEntryType does.
+
+    Args:
+        realPart (ndarray): real entries
+
+    Returns:
+        tuple: boolean arrays isInteger, isHalfInteger
+    """
+    isInteger = np.abs(realPart - np.rint(realPart)) < Tol
+    frac = realPart - np.trunc(realPart)
+    isHalfInteger = ~isInteger & ((np.abs(frac - 0.5) < Tol)
+                                  | (np.abs(frac + 0.5) < Tol))
+    return isInteger, isHalfInteger
+
+
+def congruenceKeys(realPart, imagPart=None, fold: bool = False):
+    """This function labels every entry by its congruence class, i.e. the
+    fractional part on a grid of width Tol. With fold, x and -x get the same
+    key. Complex entries are also separated by their imaginary part.
+
+    Args:
+        realPart (ndarray): real entries
+        imagPart (ndarray): imaginary entries or None
+        fold (bool): identify x and -x
+
+    Returns:
+        ndarray: int64 keys of the same shape
+    """
+    key = np.rint((realPart - np.floor(realPart)) * Scale).astype(np.int64) % Scale
+    if fold:
+        key = np.minimum(key, Scale - key)
+    if imagPart is not None:
+        imagKey = np.unique(np.rint(imagPart / Tol).astype(np.int64),
+                            return_inverse=True)[1].reshape(key.shape)
+        key = imagKey * Scale + key
+    return key
+
+
+def congruenceGroups(key, mask):
+    """This function sorts the masked entries of every row into congruence
+    classes, ordered by first appearance, keeping the original order within
+    a class. This is the order in which decomposition pops the classes.
+
+    Args:
+        key (ndarray): congruence keys, see congruenceKeys
+        mask (ndarray): entries to be grouped
+
+    Returns:
+        tuple: (order, first), order lists the positions of each row class by
+            class and first the position of the first entry of the class,
+            equal to the row length after the last class
+    """
+    n = key.shape[1]
+    key = np.where(mask, key, -1)
+    order = np.argsort(key, axis=1, kind='stable')
+    sortedKey = np.take_along_axis(key, order, axis=1)
+    start = np.ones(key.shape, dtype=bool)
+    start[:, 1:] = sortedKey[:, 1:] != sortedKey[:, :-1]
+    runStart = np.maximum.accumulate(np.where(start, np.arange(n), 0), axis=1)
+    first = np.empty_like(order)
+    np.put_along_axis(first, order, np.take_along_axis(order, runStart, axis=1), axis=1)
+    first = np.where(mask, first, n)
+    order = np.argsort(first, axis=1, kind='stable')
+    return order, np.take_along_axis(first, order, axis=1)
+
+
+def splitGroups(order: list, first: list, n: int) -> list:
+    """This function cuts one row of congruenceGroups into a list of classes.
+    """
+    groups = []
+    prev = -1
+    for j, f in zip(order, first):
+        if f == n:
+            break
+        if f != prev:
+            groups.append([])
+            prev = f
+        groups[-1].append(j)
+    return groups
+
+
+def union(p1: list, p2: list) -> list:
+    """The union of two partitions, see Partition.__add__
+    """
+    if len(p1) < len(p2):
+        p1, p2 = p2, p1
+    return [x + y for x, y in zip(p1, p2)] + p1[len(p2):]
+
+
+def tildeEntry(entry: list, keys: list) -> list:
+    """This function returns the entry of Weight.tilde for a class of a real
+    weight, keys are the unfolded congruence keys of the entries.
+    """
+    subset = [x for x, k in zip(entry, keys) if k == keys[0]]
+    rest = [x for x, k in zip(entry, keys) if k != keys[0]]
+    if len(subset) < len(rest):
+        subset, rest = rest, subset
+    return subset + [-x for x in rest[::-1]]
+
+
+def classifyRowA(realEntry: list, groups: list):
+    """This function classifies one weight of type A from its classes.
+
+    Returns:
+        tuple: orbit entry, a-function value
+    """
+    p = []
+    afun = 0
+    for group in groups:
+        pk = Partition(rsa.constructShape([realEntry[j] for j in group]), 'A')
+        afun += HighestWeightModule.a_fun(pk, 'a')
+        p = union(p, pk.entry)
+    return sorted(p, reverse=True), afun
+
+
+def classifyRowBCD(realEntry: list, imagEntry, lieType: str, entry1: list,
+                   entry2: list, groups: list, keys: list):
+    """This function classifies one weight of type B, C or D from its
+    integral part, half integral part and the classes of the rest part.
+
+    Returns:
+        tuple: orbit entry, very even type (None if not very even), a-function
+            value
+    """
+    p1 = Partition([], lieType)
+    if entry1:
+        p1.entry = rsa.constructShape(entry1 + [-x for x in entry1[::-1]])
+        p1.hollowBoxAlgorithm(HTypes[lieType][0])
+    p2 = Partition([], lieType)
+    if entry2:
+        p2.entry = rsa.constructShape(entry2 + [-x for x in entry2[::-1]])
+        p2.hollowBoxAlgorithm(HTypes[lieType][1])
+    afun = (HighestWeightModule.a_fun(p1, ATypes[lieType][0]) +
+            HighestWeightModule.a_fun(p2, ATypes[lieType][1]))
+    p3 = []
+    for group in groups:
+        entry3 = [realEntry[j] for j in group]
+        if imagEntry is None:
+            entry3 = tildeEntry(entry3, [keys[j] for j in group])
+        p3k = Partition(rsa.constructShape(entry3), 'A')
+        afun += HighestWeightModule.a_fun(p3k, 'a')
+        p3 = union(p3, p3k.entry)
+    p = Partition(union(union(p1.entry, p2.entry), union(p3, p3)), lieType)
+    p.collapse()
+    veryEvenType = None
+    if lieType == 'D' and p.isVeryEven():
+        lbdList3 = []
+        for group in groups:
+            if imagEntry is None:
+                lbdList3.append(Weight([realEntry[j] for j in group], 'A', 'R'))
+            else:
+                lbdList3.append(Weight([realEntry[j] for j in group] +
+                                       [imagEntry[j] for j in group], 'A', 'C'))
+        lbdStruct = WeightStruct(Weight(entry1, lieType), Weight(entry2, lieType),
+                                 lbdList3)
+        veryEvenType = lbdStruct.veryEvenOrbitType()
+    return sorted(p.entry, reverse=True), veryEvenType, afun
+
+
+def readWeightArray(lines):
+    """This function reads one weight per line, as in Weight.parseStrWeight,
+    into one array in a single pass. Empty lines and lines starting with #
+    are skipped. Tokens are converted once each, since the lines of a sweep
+    share most tokens.
+
+    Args:
+        lines (iterable): text lines, e.g. an open file
+
+    Returns:
+        ndarray: 2-D float array, or complex array if an entry is complex
+    """
+    tokens = {}
+    realRows = []
+    imagRows = []
+    isComplex = False
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        realRow = []
+        imagRow = []
+        for token in Weight.splitEntries(line):
+            value = tokens.get(token)
+            if value is None:
+                value = tokens[token] = Weight.parseEntry(token)
+            realRow.append(value[0])
+            imagRow.append(value[1])
+            isComplex = isComplex or value[2]
+        if realRows and len(realRow) != len(realRows[0]):
+            raise ValueError('line %d: expected %d entries, got %d'
+                             % (number, len(realRows[0]), len(realRow)))
+        realRows.append(realRow)
+        imagRows.append(imagRow)
+    realPart = np.array(realRows, dtype=float)
+    if isComplex:
+        return realPart + 1j * np.array(imagRows, dtype=float)
+    return realPart
+
+
+def positiveRootNum(n: int, lieType: str) -> int:
+    """The number of positive roots of sl(n), so(2n+1), sp(2n) or so(2n).
+    """
+    if lieType == 'A':
+        return n * (n - 1) // 2
+    elif lieType == 'D':
+        return n * n - n
+    else:
+        return n * n
+
+
+def sortedPartitions(partitions):
+    """This function returns a batch of partitions as a 2-D int array with
+    decreasing rows, the zeros padded at the end.
+    """
+    partitions = np.asarray(partitions, dtype=np.int64)
+    if partitions.ndim == 1:
+        partitions = partitions.reshape(1, -1)
+    return -np.sort(-partitions, axis=1)
+
+
+def dualSquareSums(partitions):
+    """This function computes the sum of squares of the dual partition of
+    every row, which is sum_i (2i - 1) p_i for a decreasing partition p.
+    """
+    partitions = sortedPartitions(partitions)
+    return partitions @ (2 * np.arange(partitions.shape[1], dtype=np.int64) + 1)
+
+
+def rankOf(partitions, lieType: str):
+    """This function reads the rank off the size of every row, i.e. the size
+    is n, 2n + 1, 2n, 2n for type A, B, C, D.
+    """
+    size = np.asarray(partitions, dtype=np.int64).sum(axis=1)
+    return size if lieType == 'A' else size // 2
+
+
+def orbitDimensions(partitions, lieType: str, n=None):
+    """This function computes the dimensions of many nilpotent orbits from
+    their partitions (CM93, Corollary 6.1.4), where s is the sum of squares of
+    the dual partition and r the number of odd parts:
+        A: n^2 - s, B: 2n^2 + n - (s - r)/2, C: 2n^2 + n - (s + r)/2,
+        D: 2n^2 - n - (s - r)/2.
+
+    Args:
+        partitions (array_like): 2-D int array, one partition per row padded
+            with zeros
+        lieType (str): Lie type
+        n (int or array_like): rank, read off the sizes by default
+
+    Returns:
+        ndarray: int array of dimensions
+    """
+    partitions = sortedPartitions(partitions)
+    if n is None:
+        n = rankOf(partitions, lieType)
+    n = np.asarray(n, dtype=np.int64)
+    squares = dualSquareSums(partitions)
+    odd = np.count_nonzero(partitions % 2 == 1, axis=1)
+    if lieType == 'A':
+        return n * n - squares
+    elif lieType == 'B':
+        return 2 * n * n + n - (squares - odd) // 2
+    elif lieType == 'C':
+        return 2 * n * n + n - (squares + odd) // 2
+    elif lieType == 'D':
+        return 2 * n * n - n - (squares - odd) // 2
+    raise ValueError('unknown Lie type %s' % lieType)
+
+
+def aValues(partitions, aType: str):
+    """This function computes HighestWeightModule.a_fun for many partitions.
+    For type a it is sum_i (i - 1) p_i = (s - |p|)/2 with s as in
+    orbitDimensions, for type b (resp. d) the same sum over oddEntry (resp.
+    evenEntry), i.e. over the halves of the parts rounded down at odd
+    (resp. even) positions and up at the others.
+
+    Args:
+        partitions (array_like): 2-D int array, one partition per row padded
+            with zeros
+        aType (str): 'a', 'b' or 'd'
+
+    Returns:
+        ndarray: int array of a-values
+    """
+    partitions = sortedPartitions(partitions)
+    if aType == 'a':
+        return (dualSquareSums(partitions) - partitions.sum(axis=1)) // 2
+    index = np.arange(partitions.shape[1], dtype=np.int64)
+    roundUp = index % 2 == (1 if aType == 'b' else 0)
+    halves = np.where(roundUp, (partitions + 1) // 2, partitions // 2)
+    return halves @ index
+
+
+def gkDimensions(partitions, lieType: str, n=None):
+    """This function computes the GK dimensions of the highest weight modules
+    with the given associated orbits, i.e. half of the orbit dimensions.
+    Equivalently this is the number of positive roots minus the a-value of
+    the orbit, cf. classifyMany.
+
+    Returns:
+        ndarray: int array of GK dimensions
+    """
+    return orbitDimensions(partitions, lieType, n) // 2
+
+
+def classifyMany(weights, lieType: str, type: str = 'R') -> dict:
+    """This function classifies the nilpotent orbits and GK dimensions of a
+    batch of highest weight modules, with the same results as
+    HighestWeightModule row by row.
+
+    Args:
+        weights (array_like): 2-D array, one weight per row, complex weights
+            as a complex array or as in Weight with type 'C'
+        lieType (str): Lie type
+        type (str): 'R' or 'C'
+
+    Returns:
+        dict: columnar results
+            orbit: int array, orbit partitions padded with zeros
+            veryEven: bool array
+            veryEvenType: str array, 'I', 'II' or '' if not very even
+            gkdim: int array
+    """
+    realPart, imagPart = splitComplex(weights, type)
+    N, n = realPart.shape
+    if lieType == 'A':
+        key = congruenceKeys(realPart, imagPart)
+        order, first = congruenceGroups(key, np.ones(key.shape, dtype=bool))
+    else:
+        isInteger, isHalfInteger = entryTypes(realPart)
+        if imagPart is not None:
+            isInteger &= imagPart == 0
+            isHalfInteger &= imagPart == 0
+        key = congruenceKeys(realPart, imagPart, fold=True)
+        order, first = congruenceGroups(key, ~(isInteger | isHalfInteger))
+        key = congruenceKeys(realPart).tolist()
+        isInteger = isInteger.tolist()
+        isHalfInteger = isHalfInteger.tolist()
+
+    realRows = realPart.tolist()
+    imagRows = imagPart.tolist() if imagPart is not None else [None] * N
+    order = order.tolist()
+    first = first.tolist()
+    orbits = []
+    veryEvenType = np.full(N, '', dtype='<U2')
+    afun = np.zeros(N, dtype=np.int64)
+    for i in range(N):
+        groups = splitGroups(order[i], first[i], n)
+        if lieType == 'A':
+            orbit, afun[i] = classifyRowA(realRows[i], groups)
+        else:
+            realEntry = realRows[i]
+            entry1 = [x for x, t in zip(realEntry, isInteger[i]) if t]
+            entry2 = [x for x, t in zip(realEntry, isHalfInteger[i]) if t]
+            orbit, vet, afun[i] = classifyRowBCD(realEntry, imagRows[i], lieType,
+                                                 entry1, entry2, groups, key[i])
+            if vet is not None:
+                veryEvenType[i] = vet
+        orbits.append(orbit)
+
+    width = max((len(orbit) for orbit in orbits), default=0)
+    orbit = np.zeros((N, width), dtype=np.int64)
+    for i, p in enumerate(orbits):
+        orbit[i, :len(p)] = p
+    gkdim = positiveRootNum(n, lieType) - afun
+    return {'orbit': orbit,
+            'veryEven': veryEvenType != '',
+            'veryEvenType': veryEvenType,
+            'gkdim': gkdim}
+
+
+if __name__ == '__main__':
+    line = np.linspace(-2, 2, 41)
+    s, t = np.meshgrid(line, line, indexing='ij')
+    base = np.array([1.1, 2, 0.1, 1.5, 4, 2.5, -1, 7, -3, 6, -8, 5])
+    weights = np.hstack([np.tile(base, (s.size, 1)),
+                         s.reshape(-1, 1), t.reshape(-1, 1)])
+    result = classifyMany(weights, 'D')
+    print(result['orbit'].shape, np.unique(result['gkdim']))
+    print('GK dimension = dim(orbit) / 2:',
+          np.array_equal(gkDimensions(result['orbit'], 'D'), result['gkdim']))
+    for i in np.flatnonzero(result['veryEvenType'] == 'II'):
+        print(weights[i, -2:], result['orbit'][i])
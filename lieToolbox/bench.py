@@ -0,0 +1,340 @@
+"""This file stores a reproducible benchmark suite. The workloads are generated
+from a seed, so two runs of the same suite time exactly the same weights:
+types A, B, C and D, ranks from 2 up to several thousand, with a controlled
+mix of integral, half integral and congruent (non half integral) entries,
+very even weights of type D, and complex weights.
+
+Timed operations:
+    nilpotentOrbit, nilpotentOrbitInfo, GKdim: a new HighestWeightModule per
+        weight, so every call classifies
+    classifyMany: the batch path, real and complex weights packed separately
+    generateOrbitList: all orbits of one rank
+    route/classification, route/api, route/tableau: the Flask routes through
+        the test client, with the result caches cleared before every repeat
+    import: a fresh interpreter importing a module (import/python is the
+        interpreter alone)
+
+Command line:
+    python -m lieToolbox.bench --suite quick --save baseline.json
+    python -m lieToolbox.bench --suite quick --compare baseline.json
+
+Each case is run --repeat times and the fastest run is compared. With
+--compare the exit status is 1 if a case is slower than the baseline by more
+than --threshold (relative).
+
+The baseline of the quick suite (seed 0, --repeat 5) is kept in
+bench/baseline-quick.json, with the machine and Python version in its meta:
+    python -m lieToolbox.bench --suite quick --compare bench/baseline-quick.json
+Timings depend on the machine, so on another machine save a local baseline
+first and compare with it. Save the committed baseline again when a change
+makes the suite faster or slower on purpose.
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from lieToolbox.batch import classifyMany, packWeights
+from lieToolbox.weight import Weight, HighestWeightModule, NilpotentOrbit
+
+# mix -> fraction of each kind of entry
+mixes = {
+    'integral': {'integral': 1.0},
+    'halfIntegral': {'halfIntegral': 1.0},
+    'congruent': {'congruent': 1.0},
+    'mixed': {'integral': 0.4, 'halfIntegral': 0.3, 'congruent': 0.3},
+    'complex': {'integral': 0.3, 'congruent': 0.2, 'complex': 0.5},
+}
+# fractional parts of the congruent entries, i.e. a few congruence classes
+congruentParts = (0.1, 0.3, 0.7)
+# imaginary parts of the complex entries
+imaginaryParts = (0, 1, -1, 0.5)
+
+# modules timed in a fresh interpreter: the core, the numpy batch path and the
+# web app
+importModules = ('lieToolbox.weight', 'lieToolbox.batch', 'lieToolbox.lie')
+
+# suite -> parameters
+suites = {
+    'quick': {'ranks': (2, 8, 32, 128),
+              'veryEvenRanks': (4, 32, 128),
+              'orbitListRanks': (4, 8, 12),
+              'routeRanks': (8, 64),
+              'items': 400},
+    'full': {'ranks': (2, 8, 32, 128, 512, 2048, 4096),
+             'veryEvenRanks': (4, 32, 128, 512, 2048, 4096),
+             'orbitListRanks': (4, 8, 12, 16, 20),
+             'routeRanks': (8, 64, 512),
+             'items': 4000},
+}
+
+
+def caseRandom(seed: int, *key) -> random.Random:
+    """Returns a random generator depending only on the seed and the case, so
+    that the weights of a case do not change if other cases are added.
+    """
+    return random.Random('%d:%s' % (seed, ':'.join(str(k) for k in key)))
+
+
+def randomEntry(rng: random.Random, kind: str, spread: int) -> float:
+    x = rng.randint(-spread, spread)
+    if kind == 'halfIntegral':
+        return x + 0.5
+    elif kind == 'congruent':
+        return x + rng.choice(congruentParts)
+    elif kind == 'complex':
+        return complex(x + rng.choice((0, 0.5) + congruentParts),
+                       rng.choice(imaginaryParts))
+    return x
+
+
+def randomWeight(rng: random.Random, n: int, mix: str) -> list:
+    """This function generates a weight of n entries, the number of entries
+    of each kind is given by the fractions of the mix.
+    """
+    kinds = []
+    for kind, fraction in mixes[mix].items():
+        kinds += [kind] * round(fraction * n)
+    kinds = (kinds + ['integral'] * n)[:n]
+    rng.shuffle(kinds)
+    spread = max(3, n // 2)  # some entries coincide
+    return [randomEntry(rng, kind, spread) for kind in kinds]
+
+
+def veryEvenWeight(rng: random.Random, n: int) -> list:
+    """This function generates a weight of type D whose orbit is very even:
+    integral or half integral values, each repeated an even number of times,
+    and the sign of the last entry flipped half of the time (type I or II).
+    """
+    if n % 2:
+        raise ValueError('very even orbits need an even rank, got %d' % n)
+    entry = []
+    while len(entry) < n:
+        value = rng.randint(1, n) + rng.choice((0, 0.5))
+        entry += [value] * (2 * rng.randint(1, 3))
+    entry = sorted(entry[:n], reverse=True)
+    if rng.random() < 0.5:
+        entry[-1] = -entry[-1]
+    return entry
+
+
+def generateWeights(lieType: str, n: int, mix: str, count: int, seed: int = 0) -> list:
+    """This function generates the weights of one case.
+
+    Args:
+        lieType (str): Lie type
+        n (int): number of entries
+        mix (str): a key of mixes, or 'veryEven' (type D only)
+        count (int): number of weights
+        seed (int): seed of the suite
+
+    Returns:
+        list: list of weights (lists of numbers)
+    """
+    rng = caseRandom(seed, lieType, n, mix)
+    if mix == 'veryEven':
+        return [veryEvenWeight(rng, n) for _ in range(count)]
+    return [randomWeight(rng, n, mix) for _ in range(count)]
+
+
+def runModule(method: str):
+    def run(weights, lieType):
+        for entry in weights:
+            getattr(HighestWeightModule(Weight.fromComplex(entry, lieType)), method)()
+    return run
+
+
+def runBatch(weights, lieType):
+    byType = {}
+    for entry in weights:
+        lbd = Weight.fromComplex(entry, lieType)
+        byType.setdefault(lbd.type, []).append(lbd)
+    for lbdList in byType.values():
+        classifyMany(packWeights(lbdList), lieType)
+
+
+def runImport(module: str):
+    code = 'import %s' % module if module else 'pass'
+
+    def run():
+        subprocess.run([sys.executable, '-c', code], check=True)
+    return run
+
+
+class RouteClient:
+    """This class runs the Flask routes through the test client of an app
+    without result store and metrics.
+    """
+
+    def __init__(self):
+        from lieToolbox import create_app
+        self.client = create_app({'RESULT_STORE': None, 'METRICS': False}).test_client()
+
+    def classification(self, weights, lieType):
+        for entry in weights:
+            self.client.post('/lie/classification', data={
+                'weight': ', '.join(str(w) for w in entry), 'lieType': lieType}).get_data()
+
+    def api(self, weights, lieType):
+        self.client.post('/lie/api/classify',
+                         json={'weights': weights, 'lieType': lieType}).get_data()
+
+    def tableau(self, weights, lieType):
+        for entry in weights:
+            self.client.post('/lie/tableau', data={
+                'weight': ', '.join(str(w) for w in entry)}).get_data()
+
+
+def suiteCases(suite: str, seed: int = 0) -> list:
+    """This function lists the cases of a suite.
+
+    Returns:
+        list: (name, function, argument tuple, number of items) tuples
+    """
+    params = suites[suite]
+    cases = []
+
+    def count(n):  # about the same number of entries for every rank
+        return max(2, params['items'] // n)
+
+    for lieType in 'ABCD':
+        for n in params['ranks']:
+            for mix in mixes:
+                weights = generateWeights(lieType, n, mix, count(n), seed)
+                for method in ('nilpotentOrbit', 'nilpotentOrbitInfo', 'GKdim'):
+                    cases.append(('%s/%s/%d/%s' % (method, lieType, n, mix),
+                                  runModule(method), (weights, lieType), len(weights)))
+                if mix in ('mixed', 'complex'):
+                    cases.append(('classifyMany/%s/%d/%s' % (lieType, n, mix),
+                                  runBatch, (weights, lieType), len(weights)))
+    for n in params['veryEvenRanks']:
+        weights = generateWeights('D', n, 'veryEven', count(n), seed)
+        for method in ('nilpotentOrbit', 'nilpotentOrbitInfo', 'GKdim'):
+            cases.append(('%s/D/%d/veryEven' % (method, n), runModule(method),
+                          (weights, 'D'), len(weights)))
+    for lieType in 'ABCD':
+        for n in params['orbitListRanks']:
+            cases.append(('generateOrbitList/%s/%d' % (lieType, n),
+                          NilpotentOrbit.generateOrbitList, (n, lieType), 1))
+
+    cases.append(('import/python', runImport(None), (), 1))
+    for module in importModules:
+        cases.append(('import/' + module, runImport(module), (), 1))
+
+    routes = None
+    for n in params['routeRanks']:
+        if routes is None:
+            routes = RouteClient()
+        for lieType in 'ABCD':
+            weights = generateWeights(lieType, n, 'mixed', count(n), seed)
+            cases.append(('route/classification/%s/%d/mixed' % (lieType, n),
+                          routes.classification, (weights, lieType), len(weights)))
+            cases.append(('route/api/%s/%d/mixed' % (lieType, n),
+                          routes.api, (weights, lieType), len(weights)))
+        weights = generateWeights('A', n, 'integral', count(n), seed)
+        cases.append(('route/tableau/A/%d/integral' % n,
+                      routes.tableau, (weights, 'A'), len(weights)))
+    return cases
+
+
+def timeCase(function, args: tuple, repeat: int, clearCaches: bool = False) -> list:
+    """Returns the wall times of repeat runs of function(*args)."""
+    from lieToolbox.cache import clearCaches as clear
+    times = []
+    for _ in range(repeat):
+        if clearCaches:
+            clear()
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def runSuite(suite: str = 'quick', seed: int = 0, repeat: int = 3,
+             select: str = None, log=None) -> dict:
+    """This function runs the cases of a suite whose name contains select.
+
+    Returns:
+        dict: meta data and, for each case, the fastest and the median time,
+            the number of items and the fastest time per item
+    """
+    results = {}
+    for name, function, args, items in suiteCases(suite, seed):
+        if select and select not in name:
+            continue
+        times = timeCase(function, args, repeat, name.startswith('route/'))
+        results[name] = {'min': min(times),
+                         'median': statistics.median(times),
+                         'items': items,
+                         'perItem': min(times) / items}
+        if log is not None:
+            print('%-45s %10.3f ms %10.1f us/item' % (
+                name, 1000 * min(times), 1e6 * min(times) / items), file=log)
+    return {'meta': {'suite': suite, 'seed': seed, 'repeat': repeat,
+                     'python': platform.python_version(),
+                     'machine': platform.machine(),
+                     'platform': platform.platform(),
+                     'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+            'cases': results}
+
+
+def compareResults(baseline: dict, current: dict, threshold: float = 0.25) -> list:
+    """This function compares the fastest times of the cases in both runs.
+
+    Returns:
+        list: (name, baseline seconds, current seconds, ratio, regressed)
+            tuples, regressed if the ratio is above 1 + threshold
+    """
+    rows = []
+    for name, stats in current['cases'].items():
+        old = baseline['cases'].get(name)
+        if old is None:
+            continue
+        ratio = stats['min'] / old['min'] if old['min'] else float('inf')
+        rows.append((name, old['min'], stats['min'], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m lieToolbox.bench',
+                                     description='Run the benchmark suite.')
+    parser.add_argument('--suite', default='quick', choices=sorted(suites))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('-k', '--select', default=None,
+                        help='only run cases whose name contains this text')
+    parser.add_argument('--save', default=None, help='write the results as JSON')
+    parser.add_argument('--compare', default=None, help='JSON baseline to compare with')
+    parser.add_argument('--threshold', type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+        if (baseline['meta']['suite'], baseline['meta']['seed']) != (args.suite, args.seed):
+            print('warning: the baseline was run with suite %s and seed %d' % (
+                baseline['meta']['suite'], baseline['meta']['seed']), file=sys.stderr)
+    results = runSuite(args.suite, args.seed, args.repeat, args.select, sys.stdout)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=1, sort_keys=True)
+    if baseline is None:
+        return 0
+    rows = compareResults(baseline, results, args.threshold)
+    print()
+    for name, old, new, ratio, regressed in rows:
+        print('%-45s %10.3f ms %10.3f ms %6.2fx%s' % (
+            name, 1000 * old, 1000 * new, ratio, '  REGRESSION' if regressed else ''))
+    regressions = sum(1 for row in rows if row[4])
+    print('%d cases compared, %d regressions' % (len(rows), regressions))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""This file stores an in-process result cache for highest weight modules.
+
+The nilpotent orbit and the GK dimension only depend on a combinatorial
+signature of the weight: the decomposition into integral, half integral and
+congruence classes, and the relative order of the entries inside each part
+(see canonicalSignature). Weights which differ numerically but have the same
+signature share one cache entry. The detailed information contains the
+entries of the weight, so it is cached by the exact key of the weight.
+
+Both caches are LRU caches with hit and miss counters and can be used from
+several threads.
+"""
+
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+
+from lieToolbox import RS_algorithm as rsa
+from lieToolbox.weight import Weight, HighestWeightModule, NilpotentOrbit
+
+
+def exactRank(sequence: list) -> tuple:
+    """This function returns the dense rank of every entry, equal entries get
+    the same rank.
+    """
+    rank = {x: i for i, x in enumerate(sorted(set(sequence)))}
+    return tuple(rank[x] for x in sequence)
+
+
+def orderSignature(sequence: list) -> tuple:
+    """This function returns the relative order of a sequence as used by the
+    Robinson-Schensted algorithm (entries closer than Tol are equal) and by
+    the Weyl group element (exact equality).
+    """
+    return tuple(rsa.convert2Index(sequence)), exactRank(sequence)
+
+
+def canonicalSignature(lbd: Weight) -> tuple:
+    """This function maps a weight to the combinatorial data that determine
+    its nilpotent orbit, very even type and GK dimension:
+        A: the relative order inside every congruence class
+        B, C, D: the relative order of the integral and the half integral
+            part together with their negatives, and for every other class
+            the relative order of its tilde sequence and its q-negative index
+    The classes are sorted, since the orbit is the union of their partitions.
+
+    Args:
+        lbd (Weight): weight object
+
+    Returns:
+        tuple: hashable signature
+    """
+    if lbd.lieType == 'A':
+        classes = sorted(tuple(rsa.convert2Index(lbdk.realEntry))
+                         for lbdk in lbd.basicDecomposition())
+        return ('A', lbd.n, tuple(classes))
+    lbdStruct = lbd.decomposition()
+    parts = []
+    for part in (lbdStruct.Integral, lbdStruct.HIntegral):
+        entry = list(part.entry)
+        parts.append(orderSignature(entry + [-w for w in entry[::-1]]))
+    classes = []
+    for lbdk in lbdStruct.NHIntegral:
+        q = lbdk.qNegtive()
+        lbdk.tilde()  # as in Classification.classifyBCD
+        entry = lbdk.entry if lbdk.type == 'R' else lbdk.realEntry
+        classes.append((tuple(rsa.convert2Index(entry)), q))
+    return (lbd.lieType, lbd.n, parts[0], parts[1], tuple(sorted(classes)))
+
+
+class ResultCache:
+    """This class is a thread-safe LRU cache with hit and miss counters.
+    """
+
+    def __init__(rc, maxSize: int = 100000):
+        rc.maxSize = maxSize
+        rc.data = OrderedDict()
+        rc.hits = 0
+        rc.misses = 0
+        rc.lock = threading.Lock()
+
+    def __len__(rc):
+        return len(rc.data)
+
+    def get(rc, key, compute):
+        """This function returns the cached value of key, or computes it by
+        compute() and stores it, evicting the least recently used entry if
+        the cache is full. compute runs outside the lock.
+        """
+        with rc.lock:
+            if key in rc.data:
+                rc.hits += 1
+                rc.data.move_to_end(key)
+                return rc.data[key]
+            rc.misses += 1
+        value = compute()
+        with rc.lock:
+            rc.data[key] = value
+            rc.data.move_to_end(key)
+            while len(rc.data) > rc.maxSize:
+                rc.data.popitem(last=False)
+        return value
+
+    def clear(rc):
+        with rc.lock:
+            rc.data.clear()
+            rc.hits = 0
+            rc.misses = 0
+
+    def stats(rc) -> dict:
+        with rc.lock:
+            total = rc.hits + rc.misses
+            return {'hits': rc.hits,
+                    'misses': rc.misses,
+                    'hitRate': rc.hits / total if total else 0.0,
+                    'size': len(rc.data),
+                    'maxSize': rc.maxSize}
+
+
+# signature -> (orbit entry, very even type, GK dimension)
+orbitCache = ResultCache(100000)
+# Weight.key() -> Classification
+infoCache = ResultCache(10000)
+
+
+class CachedHighestWeightModule(HighestWeightModule):
+    """This class answers the same questions as HighestWeightModule from the
+    caches: orbit and GK dimension by the signature of the weight, the
+    detailed information by the weight itself.
+    """
+
+    def __init__(self, lbd: Weight):
+        super().__init__(lbd)
+        self.result = None
+
+    def classify(self):
+        if self.classification is None:
+            lbd = self.highestWeight
+            self.classification = infoCache.get(
+                lbd.key(), lambda: HighestWeightModule(lbd).classify())
+        return self.classification
+
+    def orbitResult(self) -> tuple:
+        """Returns (orbit entry, very even type, GK dimension)."""
+        def compute():
+            clf = self.classify()
+            return tuple(clf.orbit.entry), clf.orbit.veryEvenType, clf.gkdim
+        if self.result is None:
+            self.result = orbitCache.get(canonicalSignature(self.highestWeight),
+                                         compute)
+        return self.result
+
+    def nilpotentOrbit(self):
+        entry, veryEvenType, _ = self.orbitResult()
+        obt = NilpotentOrbit(list(entry), self.highestWeight.lieType)
+        if veryEvenType is not None:
+            obt.veryEven = True
+            obt.veryEvenType = veryEvenType
+        return obt
+
+    def nilpotentOrbitInfo(self):
+        return deepcopy(self.classify().orbitInfo)
+
+    def GKdim(self):
+        return self.orbitResult()[2]
+
+    def GKdimInfo(self):
+        return deepcopy(self.classify().gkdimInfo)
+
+
+def cacheStats() -> dict:
+    return {'orbit': orbitCache.stats(), 'info': infoCache.stats()}
+
+
+def clearCaches():
+    orbitCache.clear()
+    infoCache.clear()
+
+
+if __name__ == '__main__':
+    # a scan of a plane: most points are combinatorially identical
+    base = [1.1, 2, 0.1, 1.5, 4, 2.5, -1, 7, -3, 6]
+    for s in range(-20, 21):
+        for t in range(-20, 21):
+            lbd = Weight(base + [s / 10, t / 10], 'D')
+            CachedHighestWeightModule(lbd).GKdim()
+    print(cacheStats())
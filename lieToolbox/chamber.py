@@ -0,0 +1,382 @@
+"""This file stores the chamber decomposition of an affine family of weights
+lambda(s, t) = lambda0 + s*v + t*w over a box of parameters.
+
+The orbit and GK dimension only depend on which entries are integral or half
+integral, which entries are congruent (x_i - x_j or x_i + x_j integral) and
+the relative order of the entries and their negatives. All of them are
+constant off the walls
+    x_i in 1/2 Z (type B, C, D),
+    x_i - x_j in Z,
+    x_i + x_j in Z (type B, C, D),
+so the box is cut by these lines into convex chambers, which are computed
+exactly with fractions and classified once each, at an exact point (with the
+float tolerance of 1e-7 a point of a thin chamber may count as on a wall). The walls themselves are cut
+into edges and vertices by the other walls, these are classified once each as
+well, since special orbits usually live there.
+"""
+
+from bisect import bisect_left, bisect_right
+from fractions import Fraction
+from math import ceil, floor
+
+from lieToolbox.weight import Weight, HighestWeightModule
+
+
+def toFraction(x) -> Fraction:
+    """This function converts a number to a fraction, decimals are read as
+    written, e.g. 1.1 -> 11/10.
+    """
+    if isinstance(x, (int, Fraction)):
+        return Fraction(x)
+    return Fraction(str(x))
+
+
+def splitPolygon(polygon: list, a, b, c):
+    """This function cuts a convex polygon by the line a*s + b*t = c.
+
+    Args:
+        polygon (list): vertices (s, t) in order
+        a, b, c (Fraction): coefficients of the line
+
+    Returns:
+        tuple: the part with a*s + b*t <= c and the part with a*s + b*t >= c
+    """
+    value = [a * s + b * t - c for s, t in polygon]
+    lower = []
+    upper = []
+    m = len(polygon)
+    for k in range(m):
+        p, fp = polygon[k], value[k]
+        q, fq = polygon[(k + 1) % m], value[(k + 1) % m]
+        if fp <= 0:
+            lower.append(p)
+        if fp >= 0:
+            upper.append(p)
+        if fp * fq < 0:
+            r = fp / (fp - fq)
+            x = (p[0] + r * (q[0] - p[0]), p[1] + r * (q[1] - p[1]))
+            lower.append(x)
+            upper.append(x)
+    return lower, upper
+
+
+class Chamber:
+    """This class stores a chamber of an affine family, i.e. a convex polygon
+    in the parameter box together with the classification of its weights.
+    Edges and vertices of the wall arrangement are stored as chambers with two
+    resp. one vertex.
+    """
+
+    def __init__(ch, polygon: list):
+        ch.polygon = polygon
+        m = len(polygon)
+        ch.point = (sum(p[0] for p in polygon) / m, sum(p[1] for p in polygon) / m)
+        ch.orbit = []
+        ch.veryEvenType = None
+        ch.gkdim = None
+
+    def contains(ch, s, t) -> bool:
+        """This function checks whether a point lies in the closed chamber.
+        """
+        m = len(ch.polygon)
+        sign = 0
+        for k in range(m):
+            p, q = ch.polygon[k], ch.polygon[(k + 1) % m]
+            cross = (q[0] - p[0]) * (t - p[1]) - (q[1] - p[1]) * (s - p[0])
+            if cross != 0:
+                if sign == 0:
+                    sign = 1 if cross > 0 else -1
+                elif (cross > 0) != (sign > 0):
+                    return False
+        return True
+
+    def onSegment(ch, s, t) -> bool:
+        """This function checks whether a point on the line of an edge lies in
+        the closed segment.
+        """
+        (s0, t0), (s1, t1) = ch.polygon
+        return min(s0, s1) <= s <= max(s0, s1) and min(t0, t1) <= t <= max(t0, t1)
+
+    def area(ch) -> Fraction:
+        m = len(ch.polygon)
+        twice = 0
+        for k in range(m):
+            p, q = ch.polygon[k], ch.polygon[(k + 1) % m]
+            twice += p[0] * q[1] - q[0] * p[1]
+        return abs(twice) / 2
+
+    def key(ch) -> tuple:
+        return (tuple(ch.orbit), ch.veryEvenType, ch.gkdim)
+
+    def serialize(ch):
+        return {'polygon': [[float(s), float(t)] for s, t in ch.polygon],
+                'point': [float(ch.point[0]), float(ch.point[1])],
+                'orbit': ch.orbit,
+                'veryEvenType': ch.veryEvenType,
+                'gkdim': ch.gkdim}
+
+
+class AffineFamily:
+    """This class handles a family of real weights
+    lambda(s, t) = lambda0 + s*v + t*w with (s, t) in a box.
+    """
+
+    def __init__(fam, lbd0: list, v: list, w: list, lieType: str = 'B',
+                 sRange: tuple = (-2, 2), tRange: tuple = (-2, 2)):
+        if not len(lbd0) == len(v) == len(w):
+            raise ValueError('lambda0, v and w must have the same length')
+        fam.lbd0 = [toFraction(x) for x in lbd0]
+        fam.v = [toFraction(x) for x in v]
+        fam.w = [toFraction(x) for x in w]
+        fam.lieType = lieType
+        fam.sRange = (toFraction(sRange[0]), toFraction(sRange[1]))
+        fam.tRange = (toFraction(tRange[0]), toFraction(tRange[1]))
+        fam.wallDict = None
+        fam.chamberList = None
+        fam.edgeList = None
+        fam.vertexList = None
+        fam.edgeIndex = None
+        fam.vertexIndex = None
+        fam.chamberIndex = None
+
+    def weight(fam, s, t) -> list:
+        """This function returns the exact entry of lambda(s, t).
+        """
+        s = toFraction(s)
+        t = toFraction(t)
+        return [x + s * y + t * z for x, y, z in zip(fam.lbd0, fam.v, fam.w)]
+
+    def affineFunctions(fam) -> list:
+        """This function lists the affine functions c + a*s + b*t whose values
+        in (1/2)Z or Z are walls, together with the modulus.
+
+        Returns:
+            list: tuples (c, a, b, modulus)
+        """
+        entries = list(zip(fam.lbd0, fam.v, fam.w))
+        functions = []
+        if fam.lieType != 'A':
+            for x in entries:
+                functions.append(x + (Fraction(1, 2),))
+        for i in range(len(entries)):
+            for j in range(i + 1, len(entries)):
+                xi, xj = entries[i], entries[j]
+                functions.append(tuple(p - q for p, q in zip(xi, xj)) + (1,))
+                if fam.lieType != 'A':
+                    functions.append(tuple(p + q for p, q in zip(xi, xj)) + (1,))
+        return functions
+
+    def walls(fam) -> dict:
+        """This function computes the walls crossing the box, grouped by
+        direction. The result is cached.
+
+        Returns:
+            dict: (a, b) -> sorted list of c, normalized such that the first
+                nonzero of (a, b) is 1, each c gives the line a*s + b*t = c
+        """
+        if fam.wallDict is not None:
+            return fam.wallDict
+        s0, s1 = fam.sRange
+        t0, t1 = fam.tRange
+        lines = {}
+        for c, a, b, modulus in fam.affineFunctions():
+            if a == 0 and b == 0:
+                continue  # constant, no wall
+            corners = [c + a * s + b * t for s in (s0, s1) for t in (t0, t1)]
+            lo = ceil(min(corners) / modulus)
+            hi = floor(max(corners) / modulus)
+            scale = a if a != 0 else b
+            direction = (a / scale, b / scale)
+            for k in range(lo, hi + 1):
+                lines.setdefault(direction, set()).add((k * modulus - c) / scale)
+        fam.wallDict = {direction: sorted(cs) for direction, cs in lines.items()}
+        return fam.wallDict
+
+    def wallThrough(fam, s, t):
+        """This function returns a wall (a, b, c) through the point, or None
+        if the point lies inside a chamber.
+        """
+        s = toFraction(s)
+        t = toFraction(t)
+        for (a, b), cs in fam.walls().items():
+            value = a * s + b * t
+            k = bisect_left(cs, value)
+            if k < len(cs) and cs[k] == value:
+                return (a, b, value)
+        return None
+
+    def chambers(fam) -> list:
+        """This function cuts the box by all walls and classifies each chamber
+        once. The result is cached.
+
+        Returns:
+            list: list of Chamber
+        """
+        if fam.chamberList is not None:
+            return fam.chamberList
+        s0, s1 = fam.sRange
+        t0, t1 = fam.tRange
+        polygons = [[(s0, t0), (s1, t0), (s1, t1), (s0, t1)]]
+        for (a, b), cs in fam.walls().items():
+            newPolygons = []
+            for polygon in polygons:
+                value = [a * s + b * t for s, t in polygon]
+                cuts = cs[bisect_right(cs, min(value)):bisect_left(cs, max(value))]
+                for c in cuts:
+                    lower, polygon = splitPolygon(polygon, a, b, c)
+                    newPolygons.append(lower)
+                newPolygons.append(polygon)
+            polygons = newPolygons
+
+        fam.chamberList = [Chamber(polygon) for polygon in polygons]
+        fam.chamberIndex = {fam.signature(*ch.point): ch for ch in fam.chamberList}
+        fam.classify(fam.chamberList)
+        return fam.chamberList
+
+    def signature(fam, s, t) -> tuple:
+        """This function returns the position of a point relative to every
+        family of parallel walls, which determines the chamber of a point off
+        the walls.
+        """
+        return tuple(bisect_right(cs, a * s + b * t)
+                     for (a, b), cs in fam.walls().items())
+
+    def faces(fam) -> tuple:
+        """This function cuts every wall by the other walls into edges and
+        vertices and classifies each of them once. The result is cached.
+        Only the walls of other directions which meet the segment of a wall in
+        the box are visited (found by bisection), but L walls can have up to
+        O(L^2) vertices, so time and memory grow quadratically with the
+        number of walls in the worst case.
+
+        Returns:
+            tuple: list of edges, list of vertices (both Chamber)
+        """
+        if fam.edgeList is not None:
+            return fam.edgeList, fam.vertexList
+        s0, s1 = fam.sRange
+        t0, t1 = fam.tRange
+        walls = fam.walls()
+        lines = [(a, b, c) for (a, b), cs in walls.items() for c in cs]
+        edgeList = []
+        edgeIndex = {}
+        vertices = set()
+        for a, b, c in lines:
+            # points (s, t) = p + u*(-b, a) of the line
+            p = (c, Fraction(0)) if a != 0 else (Fraction(0), c)
+            uMin, uMax = None, None
+            for k, d, lo, hi in ((0, -b, s0, s1), (1, a, t0, t1)):
+                if d == 0:
+                    continue
+                u0, u1 = sorted(((lo - p[k]) / d, (hi - p[k]) / d))
+                uMin = u0 if uMin is None else max(uMin, u0)
+                uMax = u1 if uMax is None else min(uMax, u1)
+            cross = set()
+            for (a2, b2), cs in walls.items():
+                det = a * b2 - b * a2
+                if det == 0:
+                    continue  # parallel
+                # the line c2 meets this one at u = (c2 - base) / det
+                base = a2 * p[0] + b2 * p[1]
+                lo, hi = sorted((base + det * uMin, base + det * uMax))
+                for c2 in cs[bisect_left(cs, lo):bisect_right(cs, hi)]:
+                    cross.add((c2 - base) / det)
+            cuts = sorted(cross | {uMin, uMax})
+            point = lambda u: (p[0] - u * b, p[1] + u * a)
+            if uMin == uMax:
+                cross.add(uMin)  # the wall only touches a corner of the box
+            for u in cross:
+                vertices.add(point(u))
+            edgeIndex[(a, b, c)] = [Chamber([point(u), point(v)])
+                                    for u, v in zip(cuts, cuts[1:])]
+            edgeList += edgeIndex[(a, b, c)]
+        fam.edgeList = edgeList
+        fam.edgeIndex = edgeIndex
+        fam.vertexList = [Chamber([x]) for x in sorted(vertices)]
+        fam.vertexIndex = {ch.polygon[0]: ch for ch in fam.vertexList}
+        fam.classify(fam.edgeList + fam.vertexList)
+        return fam.edgeList, fam.vertexList
+
+    def classify(fam, chamberList: list):
+        """This function classifies the weights at the points of the chambers
+        with their exact Fraction entries.
+        """
+        for ch in chamberList:
+            L_lbd = HighestWeightModule(Weight(fam.weight(*ch.point), fam.lieType))
+            obt = L_lbd.nilpotentOrbit()
+            ch.orbit = [p_k for p_k in obt.entry if p_k]
+            ch.veryEvenType = obt.veryEvenType or None
+            ch.gkdim = L_lbd.GKdim()
+
+    def regionMap(fam) -> dict:
+        """This function returns the chambers, edges, vertices and walls in a
+        serializable form, and groups them by orbit and GK dimension into
+        regions.
+
+        Returns:
+            dict: walls, chambers, edges, vertices and regions (lists of
+                indices of each kind)
+        """
+        chamberList = fam.chambers()
+        edgeList, vertexList = fam.faces()
+        regions = {}
+        for kind, faceList in (('chambers', chamberList), ('edges', edgeList),
+                               ('vertices', vertexList)):
+            for i, ch in enumerate(faceList):
+                region = regions.setdefault(ch.key(), {'chambers': [],
+                                                       'edges': [],
+                                                       'vertices': []})
+                region[kind].append(i)
+        return {'lieType': fam.lieType,
+                'sRange': [float(x) for x in fam.sRange],
+                'tRange': [float(x) for x in fam.tRange],
+                'walls': [{'direction': [float(a), float(b)],
+                           'c': [float(c) for c in cs]}
+                          for (a, b), cs in fam.walls().items()],
+                'chambers': [ch.serialize() for ch in chamberList],
+                'edges': [ch.serialize() for ch in edgeList],
+                'vertices': [ch.serialize() for ch in vertexList],
+                'regions': [dict(orbit=list(key[0]), veryEvenType=key[1],
+                                 gkdim=key[2], **region)
+                            for key, region in regions.items()]}
+
+    def locate(fam, s, t) -> dict:
+        """This function returns the classification at a point of the box from
+        the chamber, edge or vertex containing it.
+
+        Returns:
+            dict: orbit, veryEvenType, gkdim
+        """
+        s = toFraction(s)
+        t = toFraction(t)
+        line = fam.wallThrough(s, t)
+        if line is not None:
+            fam.faces()
+            faceList = [fam.vertexIndex[(s, t)]] if (s, t) in fam.vertexIndex else []
+            faceList += [ch for ch in fam.edgeIndex[line] if ch.onSegment(s, t)]
+        else:
+            fam.chambers()
+            faceList = [fam.chamberIndex.get(fam.signature(s, t))]
+            faceList = [ch for ch in faceList if ch is not None]
+        for ch in faceList:
+            if ch.contains(s, t):
+                return {'orbit': ch.orbit,
+                        'veryEvenType': ch.veryEvenType,
+                        'gkdim': ch.gkdim}
+        raise ValueError('point is outside of the box')
+
+
+if __name__ == '__main__':
+    lbd0 = [1.1, 2, 0.1, 1.5, 4, 2.5, -1, 7, -3, 6, -8, 5, 0, 0]
+    v = [0] * 13 + [0]
+    w = [0] * 14
+    v[12] = 1
+    w[13] = 1
+    fam = AffineFamily(lbd0, v, w, 'D')
+    chamberList = fam.chambers()
+    edgeList, vertexList = fam.faces()
+    print(len(chamberList), 'chambers,', len(edgeList), 'edges,',
+          len(vertexList), 'vertices,', len(fam.regionMap()['regions']), 'regions')
+    for ch in chamberList + edgeList + vertexList:
+        if ch.veryEvenType == 'II':
+            print([[float(x) for x in p] for p in ch.polygon], ch.orbit)
@@ -1,10 +1,14 @@
 from flask import (
-    Blueprint, flash, g, redirect, render_template, request, url_for
+    Blueprint, Response, current_app, flash, g, jsonify, redirect,
+    render_template, request, stream_with_context, url_for
 )
 from werkzeug.exceptions import abort
 
 from re import split
-from lieToolbox.weight import Weight, HighestWeightModule
+from lieToolbox.cache import CachedHighestWeightModule
+from lieToolbox.store import getStore
+from lieToolbox.tables import orbitData
+from lieToolbox.weight import NilpotentOrbit, Weight
 import json
 
 bp = Blueprint('lie', __name__, url_prefix='/')
@@ -24,11 +28,10 @@ def classification():
         else:
             lieType = request.form['lieType']
             lbd = Weight.parseStrWeight(entryStr, lieType)
-            L_lbd = HighestWeightModule(lbd)
-            obt = L_lbd.nilpotentOrbit()
+            L_lbd = CachedHighestWeightModule(lbd)
+            # copies, the classification is shared through the cache
             obtInfo = L_lbd.nilpotentOrbitInfo()
-            gkdim = L_lbd.GKdim()
-            obtInfo['GKdim'] = gkdim
+            obtInfo['GKdim'] = L_lbd.GKdim()
             obtInfo['GKdimInfo'] = L_lbd.GKdimInfo()
             
         if error is None:
@@ -42,9 +45,103 @@ def tableau():
         # Get the list of floats from the form input
         entryStr = request.form['weight']
         lbd = Weight.parseStrWeight(entryStr, 'A')
-        pt = lbd.constructTableau()
+        tableau = lbd.constructTableau()  # rows of the tableau
 
-        return render_template('lie/tableau.html', tableau_data=pt.entry)
+        return render_template('lie/tableau.html', tableau_data=tableau)
 
     return render_template('lie/tableau_input.html')
-    
\ No newline at end of file
+    
+# Maximal number of weights in one request of the JSON API
+apiMaxWeights = 100000
+
+
+def parseRequestWeight(item, lieType: str) -> Weight:
+    """This function reads one weight of a JSON request, either a string as in
+    the form, a list of real numbers, or an object with keys weight and
+    optionally lieType.
+
+    Returns:
+        Weight: weight object
+    """
+    if isinstance(item, dict):
+        lieType = item.get('lieType', lieType)
+        item = item.get('weight')
+    if lieType not in ('A', 'B', 'C', 'D'):
+        raise ValueError('unknown Lie type %r' % (lieType,))
+    if isinstance(item, str):
+        return Weight.parseStrWeight(item, lieType)
+    if isinstance(item, list) and all(isinstance(w, (int, float)) and
+                                      not isinstance(w, bool) for w in item):
+        return Weight(item, lieType)
+    raise ValueError('a weight is a string or a list of numbers')
+
+
+def resultStore():
+    """Returns the result store of the app, or None if not configured."""
+    path = current_app.config.get('RESULT_STORE')
+    return getStore(path) if path else None
+
+
+def classifyRecord(lbd: Weight, info: bool = False, store=None) -> dict:
+    """This function classifies a weight and returns the result as a
+    JSON-serializable dict. The orbit and GK dimension are looked up in (and
+    added to) the result store, if given.
+    """
+    L_lbd = CachedHighestWeightModule(lbd)
+    if store is not None:
+        result = store.classify(lbd)
+    else:
+        obt = L_lbd.nilpotentOrbit()
+        result = {'orbit': obt.entry, 'veryEvenType': obt.veryEvenType,
+                  'gkdim': L_lbd.GKdim()}
+    record = {'weight': lbd.toStr(),
+              'lieType': lbd.lieType,
+              'orbit': result['orbit'],
+              'veryEvenType': result['veryEvenType'],
+              'gkdim': result['gkdim']}
+    if info:
+        record['orbitInfo'] = L_lbd.nilpotentOrbitInfo()  # copies
+        record['gkdimInfo'] = L_lbd.GKdimInfo()
+        obt = NilpotentOrbit(list(result['orbit']), lbd.lieType)
+        obt.veryEven = result['veryEvenType'] is not None
+        obt.veryEvenType = result['veryEvenType']
+        record['orbitData'] = orbitData(obt)
+    return record
+
+
+@bp.route('/lie/api/classify', methods=('POST',))
+def classifyAPI():
+    """JSON API for many weights. The request is a JSON object
+        {"lieType": "D", "info": false,
+         "weights": ["1.1, 2, 0.1", [4, 3, -5, 6], {"weight": "1, 2", "lieType": "A"}]}
+    where lieType is the default Lie type of the weights and info adds the
+    detailed orbit and GK dimension information. The response is streamed as
+    newline-delimited JSON, one line per weight in the order of the request
+    as soon as it is classified, with the index of the weight and either the
+    result or an error. Identical weights are classified once per request.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('weights'), list):
+        return jsonify({'error': 'expected a JSON object with a list "weights"'}), 400
+    weights = data['weights']
+    if len(weights) > apiMaxWeights:
+        return jsonify({'error': 'at most %d weights per request' % apiMaxWeights}), 413
+    lieType = data.get('lieType', 'B')
+    info = bool(data.get('info', False))
+    store = resultStore()
+
+    def generate():
+        results = {}  # Weight.key() -> record
+        for i, item in enumerate(weights):
+            try:
+                lbd = parseRequestWeight(item, lieType)
+                key = lbd.key()
+                if key not in results:
+                    results[key] = classifyRecord(lbd, info, store)
+                record = dict(results[key])
+            except Exception as e:
+                record = {'error': type(e).__name__ + ': ' + str(e)}
+            record['index'] = i
+            yield json.dumps(record) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
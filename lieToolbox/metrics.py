@@ -0,0 +1,225 @@
+"""This file stores the instrumentation of the classification pipeline.
+
+instrument() replaces the functions of the pipeline stages (parse,
+decomposition, RS shape, H-algorithm, collapse, antidominant weight and Weyl
+group element, DRS, GK dimension) by timed wrappers which record call
+counts, wall time and input sizes, and uninstrument() puts the original
+functions back. When instrumentation is off nothing is wrapped, so there is
+no overhead at all. The times of a stage include the stages it calls.
+
+The web app turns instrumentation on if METRICS (or LIETOOLBOX_METRICS) is
+set, otherwise this module is not imported. It then also times every request
+and adds a Server-Timing header with the time spent in each stage during the
+request (for streamed responses only the part before the first line). The
+aggregates are served in the Prometheus text format at /metrics.
+"""
+
+import threading
+import time
+from functools import wraps
+
+from lieToolbox import RS_algorithm as rsa
+from lieToolbox import DRS_algorithm as drsa
+from lieToolbox.weight import Weight, Partition, Classification
+
+# stage -> [calls, seconds, max seconds, total size]
+stageStats = {}
+# endpoint -> [requests, seconds]
+requestStats = {}
+statsLock = threading.Lock()
+# guards instrument and uninstrument
+instrumentLock = threading.Lock()
+# stage -> seconds of the current request, per thread
+requestStages = threading.local()
+# (owner, name, original) of the wrapped functions
+originals = []
+
+
+def entrySize(lbd, *args, **kwargs) -> int:
+    return len(lbd.entry)
+
+
+def partitionSize(pt, *args, **kwargs) -> int:
+    return sum(pt.entry)
+
+
+def firstSize(sequence, *args, **kwargs) -> int:
+    return len(sequence)
+
+
+# (stage, owner, function name, size of the input)
+stageHooks = [
+    ('parse', Weight, 'parseStrWeight', firstSize),
+    ('decomposition', Weight, 'decomposition', entrySize),
+    ('decomposition', Weight, 'basicDecomposition', entrySize),
+    ('rs', rsa, 'constructShape', firstSize),
+    ('hollowBox', Partition, 'hollowBoxAlgorithm', partitionSize),
+    ('collapse', Partition, 'collapse', partitionSize),
+    ('weyl', Weight, 'getAntidominant', entrySize),
+    ('weyl', Weight, 'getWeylGroupElement', entrySize),
+    ('drs', drsa, 'w2VerticalDominoBoxes', firstSize),
+    ('drs', drsa, 'w2DominoTableau', firstSize),
+    ('gkdim', Classification, 'computeGKdim', lambda clf: clf.highestWeight.n),
+]
+
+
+def record(stage: str, seconds: float, size: int):
+    with statsLock:
+        stats = stageStats.get(stage)
+        if stats is None:
+            stats = stageStats[stage] = [0, 0.0, 0.0, 0]
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+        stats[3] += size
+    current = getattr(requestStages, 'seconds', None)
+    if current is not None:
+        current[stage] = current.get(stage, 0.0) + seconds
+
+
+def timed(stage: str, function, size):
+    """This function wraps a function of a stage with a timer."""
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        n = size(*args, **kwargs)  # before the call, which may change it
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record(stage, time.perf_counter() - start, n)
+    wrapper.stage = stage  # marks the function as instrumented
+    return wrapper
+
+
+def isInstrumented() -> bool:
+    return bool(originals)
+
+
+def instrument():
+    """This function wraps the functions of all stages. It is idempotent,
+    a function which is already wrapped is not wrapped again.
+    """
+    with instrumentLock:
+        for stage, owner, name, size in stageHooks:
+            original = owner.__dict__[name]
+            function = (original.__func__ if isinstance(original, staticmethod)
+                        else original)
+            if hasattr(function, 'stage'):
+                continue
+            wrapped = timed(stage, function, size)
+            if isinstance(original, staticmethod):
+                wrapped = staticmethod(wrapped)
+            setattr(owner, name, wrapped)
+            originals.append((owner, name, original))
+
+
+def uninstrument():
+    """This function puts the original functions back."""
+    with instrumentLock:
+        while originals:
+            owner, name, original = originals.pop()
+            setattr(owner, name, original)
+
+
+def resetStats():
+    with statsLock:
+        stageStats.clear()
+        requestStats.clear()
+
+
+def snapshot() -> dict:
+    """Returns a copy of the aggregates of all stages and endpoints."""
+    with statsLock:
+        return {'stages': {stage: {'calls': s[0], 'seconds': s[1],
+                                   'maxSeconds': s[2], 'size': s[3]}
+                           for stage, s in stageStats.items()},
+                'requests': {endpoint: {'requests': r[0], 'seconds': r[1]}
+                             for endpoint, r in requestStats.items()}}
+
+
+def renderText(cacheStats: dict = None) -> str:
+    """This function renders the aggregates in the Prometheus text format.
+
+    Args:
+        cacheStats (dict): name -> stats of a ResultCache, see
+            lieToolbox.cache.cacheStats
+
+    Returns:
+        str: metrics text
+    """
+    data = snapshot()
+    lines = ['# TYPE lietoolbox_instrumented gauge',
+             'lietoolbox_instrumented %d' % isInstrumented()]
+    stageMetrics = [('calls', 'counter', 'lietoolbox_stage_calls_total'),
+                    ('seconds', 'counter', 'lietoolbox_stage_seconds_total'),
+                    ('maxSeconds', 'gauge', 'lietoolbox_stage_seconds_max'),
+                    ('size', 'counter', 'lietoolbox_stage_input_size_total')]
+    for field, kind, name in stageMetrics:
+        lines.append('# TYPE %s %s' % (name, kind))
+        for stage, stats in sorted(data['stages'].items()):
+            lines.append('%s{stage="%s"} %s' % (name, stage, stats[field]))
+    for field, name in (('requests', 'lietoolbox_requests_total'),
+                        ('seconds', 'lietoolbox_request_seconds_total')):
+        lines.append('# TYPE %s counter' % name)
+        for endpoint, stats in sorted(data['requests'].items()):
+            lines.append('%s{endpoint="%s"} %s' % (name, endpoint, stats[field]))
+    if cacheStats:
+        for field, name in (('hits', 'lietoolbox_cache_hits_total'),
+                            ('misses', 'lietoolbox_cache_misses_total'),
+                            ('size', 'lietoolbox_cache_size')):
+            lines.append('# TYPE %s %s' % (name, 'gauge' if field == 'size' else 'counter'))
+            for cache, stats in sorted(cacheStats.items()):
+                lines.append('%s{cache="%s"} %s' % (name, cache, stats[field]))
+    return '\n'.join(lines) + '\n'
+
+
+def initApp(app):
+    """This function instruments the pipeline, times the requests of a
+    Flask app and serves the aggregates at /metrics. Calling it again for the
+    same app does nothing.
+    """
+    from flask import Response, g, request
+    from lieToolbox.cache import cacheStats
+
+    if 'lieToolbox.metrics' in app.extensions:
+        return
+    app.extensions['lieToolbox.metrics'] = True
+    instrument()
+
+    @app.route('/metrics')
+    def metricsText():
+        """Stage timers, request timers and cache counters in the Prometheus
+        text format.
+        """
+        return Response(renderText(cacheStats()),
+                        mimetype='text/plain; version=0.0.4')
+
+    @app.before_request
+    def startTimer():
+        g.metricsStart = time.perf_counter()
+        requestStages.seconds = {}
+
+    @app.after_request
+    def stopTimer(response):
+        start = g.pop('metricsStart', None)
+        stages = getattr(requestStages, 'seconds', None) or {}
+        requestStages.seconds = None
+        if start is not None:
+            seconds = time.perf_counter() - start
+            with statsLock:
+                stats = requestStats.setdefault(request.endpoint or 'none', [0, 0.0])
+                stats[0] += 1
+                stats[1] += seconds
+            timing = ['%s;dur=%.3f' % (stage, 1000 * s) for stage, s in sorted(stages.items())]
+            timing.append('total;dur=%.3f' % (1000 * seconds))
+            response.headers['Server-Timing'] = ', '.join(timing)
+        return response
+
+
+if __name__ == '__main__':
+    from lieToolbox.weight import HighestWeightModule
+    instrument()
+    for s in range(20):
+        lbd = Weight.parseStrWeight('1.1, 2, 0.1, 1.5, 4, 2.5, -1, 7, -3, 6, -8, %d' % s, 'D')
+        HighestWeightModule(lbd).GKdim()
+    print(renderText())
@@ -0,0 +1,204 @@
+"""This file stores the closure order of nilpotent orbits of a classical Lie
+algebra of given rank. For classical types the closure order is the dominance
+order of partitions, i.e. p <= q iff every partial sum of p is at most the
+one of q, except that the two very even orbits of type D with the same
+partition are not comparable.
+
+The partial sums of all orbits are stored as a NumPy matrix, so that many
+pairs can be compared at once. The cover relations (Hasse diagram) are
+computed once per poset, and posets are cached by (rank, lieType).
+"""
+
+import json
+
+import numpy as np
+
+from lieToolbox.tables import orbitList
+from lieToolbox.weight import NilpotentOrbit
+
+# (n, lieType) -> OrbitPoset
+posetCache = {}
+
+
+def getPoset(n: int, lieType: str) -> 'OrbitPoset':
+    """This function returns the cached poset of orbits of rank n.
+    """
+    if (n, lieType) not in posetCache:
+        posetCache[(n, lieType)] = OrbitPoset(n, lieType)
+    return posetCache[(n, lieType)]
+
+
+def partialSums(partitions) -> np.ndarray:
+    """This function returns the partial sums of partitions given as rows of
+    a zero padded int array, e.g. the orbit column of classifyMany.
+    """
+    return np.cumsum(np.asarray(partitions, dtype=np.int64), axis=1)
+
+
+def leqPartitions(p, q, pType=None, qType=None) -> np.ndarray:
+    """This function compares the rows of two arrays of partitions in the
+    closure order, without building a poset.
+
+    Args:
+        p, q (array_like): zero padded partitions, one per row
+        pType, qType (array_like): very even types ('I', 'II' or ''), if any
+
+    Returns:
+        ndarray: bool array, row i of p <= row i of q
+    """
+    p = np.asarray(p)
+    q = np.asarray(q)
+    width = max(p.shape[1], q.shape[1])
+    p = np.pad(p, ((0, 0), (0, width - p.shape[1])))
+    q = np.pad(q, ((0, 0), (0, width - q.shape[1])))
+    result = np.all(partialSums(p) <= partialSums(q), axis=1)
+    if pType is not None and qType is not None:
+        pType = np.asarray(pType)
+        qType = np.asarray(qType)
+        incomparable = ((pType != '') & (qType != '') & (pType != qType)
+                        & np.all(p == q, axis=1))
+        result &= ~incomparable
+    return result
+
+
+class OrbitPoset:
+    """This class stores the orbits of rank n and type lieType together with
+    their closure order.
+    """
+
+    def __init__(ps, n: int, lieType: str):
+        ps.n = n
+        ps.lieType = lieType
+        ps.orbitList = orbitList(n, lieType)  # from the orbit table if built
+        l = NilpotentOrbit.orbitSize(n, lieType)
+        partitions = np.zeros((len(ps.orbitList), l), dtype=np.int64)
+        for i, obt in enumerate(ps.orbitList):
+            partitions[i, :len(obt.entry)] = obt.entry
+        ps.partitions = partitions
+        ps.partialSums = partialSums(partitions)
+        ps.veryEvenType = np.array([obt.veryEvenType or '' for obt in ps.orbitList])
+        ps.indexDict = {(tuple(obt.entry), obt.veryEvenType): i
+                        for i, obt in enumerate(ps.orbitList)}
+        ps.matrix = None
+        ps.coverList = None
+
+    def __len__(ps):
+        return len(ps.orbitList)
+
+    def index(ps, orbit, veryEvenType=None) -> int:
+        """This function returns the index of an orbit, given as NilpotentOrbit
+        or as a partition with its very even type.
+        """
+        if isinstance(orbit, NilpotentOrbit):
+            veryEvenType = orbit.veryEvenType
+            orbit = orbit.entry
+        entry = tuple(sorted((p_k for p_k in orbit if p_k), reverse=True))
+        return ps.indexDict[(entry, veryEvenType or None)]
+
+    def leq(ps, a, b, chunkSize: int = 100000) -> np.ndarray:
+        """This function compares many pairs of orbits at once.
+
+        Args:
+            a, b (array_like): indices of orbits
+            chunkSize (int): number of pairs compared in one step
+
+        Returns:
+            ndarray: bool array, orbit a[k] lies in the closure of orbit b[k]
+        """
+        a = np.asarray(a, dtype=np.int64)
+        b = np.asarray(b, dtype=np.int64)
+        if ps.matrix is not None:
+            return ps.matrix[a, b]
+        result = np.empty(len(a), dtype=bool)
+        for k in range(0, len(a), chunkSize):
+            i = a[k:k + chunkSize]
+            j = b[k:k + chunkSize]
+            result[k:k + chunkSize] = np.all(ps.partialSums[i] <= ps.partialSums[j],
+                                             axis=1)
+        incomparable = ((ps.veryEvenType[a] != '') & (ps.veryEvenType[a] != ps.veryEvenType[b])
+                        & np.all(ps.partitions[a] == ps.partitions[b], axis=1))
+        return result & ~incomparable
+
+    def closureMatrix(ps) -> np.ndarray:
+        """This function computes the closure order of all pairs once, which
+        takes m^2 bytes for m orbits.
+
+        Returns:
+            ndarray: bool matrix, [i, j] is True iff orbit i <= orbit j
+        """
+        if ps.matrix is None:
+            m = len(ps)
+            matrix = np.empty((m, m), dtype=bool)
+            step = max(1, 2**22 // max(1, m * ps.partialSums.shape[1]))
+            for k in range(0, m, step):
+                matrix[k:k + step] = np.all(ps.partialSums[k:k + step, None, :]
+                                            <= ps.partialSums[None, :, :], axis=2)
+            # very even orbits I and II are next to each other in orbitList
+            for i in np.flatnonzero(ps.veryEvenType == 'I'):
+                matrix[i, i + 1] = matrix[i + 1, i] = False
+            ps.matrix = matrix
+        return ps.matrix
+
+    def covers(ps) -> list:
+        """This function computes the cover relations once, i.e. pairs (i, j)
+        with orbit i < orbit j and no orbit strictly between. It uses the
+        closure matrix and one matrix product, so it is meant for posets up to
+        some thousands of orbits.
+
+        Returns:
+            list: list of pairs (i, j)
+        """
+        if ps.coverList is None:
+            strict = ps.closureMatrix() & ~np.eye(len(ps), dtype=bool)
+            strictFloat = strict.astype(np.float32)
+            between = (strictFloat @ strictFloat) > 0
+            i, j = np.nonzero(strict & ~between)
+            ps.coverList = list(zip(i.tolist(), j.tolist()))
+        return ps.coverList
+
+    def hasseDiagram(ps) -> dict:
+        """This function returns the Hasse diagram in a serializable form.
+
+        Returns:
+            dict: lieType, n, nodes (orbit, veryEvenType, label) and edges
+                (lower, upper)
+        """
+        nodes = [{'id': i,
+                  'orbit': obt.entry,
+                  'veryEvenType': obt.veryEvenType,
+                  'label': ps.label(i)} for i, obt in enumerate(ps.orbitList)]
+        return {'lieType': ps.lieType,
+                'n': ps.n,
+                'nodes': nodes,
+                'edges': [list(edge) for edge in ps.covers()]}
+
+    def label(ps, i: int) -> str:
+        obt = ps.orbitList[i]
+        label = '[' + ', '.join(str(p_k) for p_k in obt.entry) + ']'
+        if obt.veryEven:
+            label += ' ' + obt.veryEvenType
+        return label
+
+    def toJSON(ps) -> str:
+        return json.dumps(ps.hasseDiagram())
+
+    def toDOT(ps) -> str:
+        """This function exports the Hasse diagram in the DOT language, larger
+        orbits on top.
+        """
+        lines = ['digraph "%s%d" {' % (ps.lieType, ps.n), '    rankdir=BT;']
+        for i in range(len(ps)):
+            lines.append('    %d [label="%s"];' % (i, ps.label(i)))
+        for i, j in ps.covers():
+            lines.append('    %d -> %d;' % (i, j))
+        lines.append('}')
+        return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    ps = getPoset(4, 'D')
+    print(len(ps), 'orbits,', len(ps.covers()), 'covers')
+    print(ps.toDOT())
+    a = ps.index([3, 3, 1, 1])
+    b = ps.index([4, 4], 'I')
+    print(ps.leq([a, b], [b, a]))
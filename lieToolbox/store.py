@@ -0,0 +1,266 @@
+"""This file stores a persistent result store for classifications in a local
+SQLite file, keyed by Lie type and normalized weight. It can be shared by the
+web server workers and the sweep processes: the database runs in WAL mode,
+so readers do not block the writer, and every thread and process opens its
+own connection.
+
+Command line:
+    python -m lieToolbox.store import result.jsonl --db results.sqlite -t D
+    python -m lieToolbox.store export --db results.sqlite -o all.jsonl
+    python -m lieToolbox.store stats --db results.sqlite
+
+Import reads the JSON lines of lieToolbox.sweep or of the JSON API, export
+writes JSON lines with weight, lieType, orbit, veryEvenType and gkdim, and the
+normalized weight (see normalizeWeight), which import uses if present, so that
+export and import are lossless.
+The web app uses the store if RESULT_STORE (or LIETOOLBOX_STORE) is set.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+from fractions import Fraction
+
+from lieToolbox.cache import CachedHighestWeightModule
+from lieToolbox.weight import Weight
+
+schema = """
+CREATE TABLE IF NOT EXISTS results (
+    lieType TEXT NOT NULL,
+    weight TEXT NOT NULL,
+    orbit TEXT NOT NULL,
+    veryEvenType TEXT,
+    gkdim INTEGER NOT NULL,
+    PRIMARY KEY (lieType, weight)
+) WITHOUT ROWID
+"""
+
+# path -> ResultStore, one per process
+storeCache = {}
+storeLock = threading.Lock()
+
+
+def normalizeWeight(lbd: Weight) -> str:
+    """This function returns the normalized text of a weight: the entries
+    as exact fractions (decimals read as written, see Weight.toExact),
+    prefixed by the type, e.g. 'R:1/10,2,-3/2'. Complex weights list the
+    real and then the imaginary parts.
+    """
+    return lbd.type + ':' + ','.join(str(Fraction(w)) for w in lbd.toExact().entry)
+
+
+def recordWeight(record: dict, lieType: str) -> Weight:
+    """This function reads the weight of a JSON record of the sweep or of
+    the JSON API.
+    """
+    weight = record['weight']
+    if isinstance(weight, str):
+        return Weight.parseStrWeight(weight, lieType)
+    return Weight(list(weight), lieType)
+
+
+class ResultStore:
+    """This class stores orbits and GK dimensions in an SQLite file.
+    """
+
+    def __init__(st, path: str, timeout: float = 30.0):
+        st.path = path
+        st.timeout = timeout
+        st.local = threading.local()
+        with st.connection() as conn:
+            conn.execute(schema)
+
+    def connection(st) -> sqlite3.Connection:
+        """This function returns the connection of the current thread, a new
+        one after a fork.
+        """
+        conn = getattr(st.local, 'conn', None)
+        if conn is None or st.local.pid != os.getpid():
+            conn = sqlite3.connect(st.path, timeout=st.timeout)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            st.local.conn = conn
+            st.local.pid = os.getpid()
+        return conn
+
+    def close(st):
+        conn = getattr(st.local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            st.local.conn = None
+
+    def __len__(st):
+        return st.connection().execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def get(st, lbd: Weight) -> dict:
+        """This function returns the stored result of a weight.
+
+        Returns:
+            dict: orbit, veryEvenType and gkdim, or None if not stored
+        """
+        row = st.connection().execute(
+            'SELECT orbit, veryEvenType, gkdim FROM results '
+            'WHERE lieType = ? AND weight = ?',
+            (lbd.lieType, normalizeWeight(lbd))).fetchone()
+        if row is None:
+            return None
+        return {'orbit': json.loads(row[0]), 'veryEvenType': row[1], 'gkdim': row[2]}
+
+    def putMany(st, items) -> int:
+        """This function stores many results in one transaction, existing
+        results of the same weights are replaced.
+
+        Args:
+            items (iterable): pairs (Weight, dict with orbit, veryEvenType
+                and gkdim)
+
+        Returns:
+            int: the number of results stored
+        """
+        return st.putRows([(lbd.lieType, normalizeWeight(lbd), result)
+                           for lbd, result in items])
+
+    def putRows(st, items) -> int:
+        """This function stores results by normalized weight, see putMany.
+
+        Args:
+            items (iterable): triples (lieType, normalized weight, dict with
+                orbit, veryEvenType and gkdim)
+        """
+        rows = [(lieType, weight, json.dumps(list(result['orbit'])),
+                 result['veryEvenType'], int(result['gkdim']))
+                for lieType, weight, result in items]
+        conn = st.connection()
+        with conn:
+            conn.executemany('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                             rows)
+        return len(rows)
+
+    def put(st, lbd: Weight, result: dict):
+        st.putMany([(lbd, result)])
+
+    def classify(st, lbd: Weight) -> dict:
+        """This function returns the stored result of a weight, or classifies
+        it and stores the result.
+        """
+        result = st.get(lbd)
+        if result is None:
+            L_lbd = CachedHighestWeightModule(lbd)
+            obt = L_lbd.nilpotentOrbit()
+            result = {'orbit': obt.entry, 'veryEvenType': obt.veryEvenType,
+                      'gkdim': L_lbd.GKdim()}
+            st.put(lbd, result)
+        return result
+
+    def importJSONLines(st, file, lieType: str = None, batchSize: int = 10000) -> int:
+        """This function imports JSON lines of the sweep or of the JSON API,
+        in transactions of batchSize lines. Lines with an error are skipped.
+
+        Args:
+            file (file): text file
+            lieType (str): Lie type of records without lieType
+
+        Returns:
+            int: the number of results imported
+        """
+        count = 0
+        batch = []
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if 'error' in record:
+                continue
+            lt = record.get('lieType', lieType)
+            if lt is None:
+                raise ValueError('the Lie type of %s is not given' % line)
+            weight = record.get('normalizedWeight')  # written by export
+            if weight is None:
+                weight = normalizeWeight(recordWeight(record, lt))
+            batch.append((lt, weight, record))
+            if len(batch) >= batchSize:
+                count += st.putRows(batch)
+                batch = []
+        return count + st.putRows(batch)
+
+    def exportJSONLines(st, file, lieType: str = None) -> int:
+        """This function writes all results (of one Lie type) as JSON lines.
+
+        Returns:
+            int: the number of results written
+        """
+        query = 'SELECT lieType, weight, orbit, veryEvenType, gkdim FROM results'
+        args = ()
+        if lieType is not None:
+            query += ' WHERE lieType = ?'
+            args = (lieType,)
+        count = 0
+        for lt, weight, orbit, veryEvenType, gkdim in st.connection().execute(query, args):
+            type, entry = weight.split(':', 1)
+            entry = [Fraction(w) for w in entry.split(',')] if entry else []
+            file.write(json.dumps({'weight': Weight(entry, lt, type).entryStr(),
+                                   'normalizedWeight': weight,
+                                   'lieType': lt,
+                                   'orbit': json.loads(orbit),
+                                   'veryEvenType': veryEvenType,
+                                   'gkdim': gkdim}) + '\n')
+            count += 1
+        return count
+
+    def stats(st) -> dict:
+        rows = st.connection().execute(
+            'SELECT lieType, COUNT(*) FROM results GROUP BY lieType').fetchall()
+        return {'path': st.path, 'count': dict(rows)}
+
+
+def getStore(path: str) -> ResultStore:
+    """This function returns the store of a path, opened once per process.
+    """
+    with storeLock:
+        if path not in storeCache:
+            storeCache[path] = ResultStore(path)
+        return storeCache[path]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m lieToolbox.store',
+                                     description='Manage the result store.')
+    parser.add_argument('command', choices=('import', 'export', 'stats'))
+    parser.add_argument('input', nargs='?', default='-',
+                        help='JSON lines to import, - for stdin')
+    parser.add_argument('--db', default=os.environ.get('LIETOOLBOX_STORE', 'results.sqlite'))
+    parser.add_argument('-t', '--lie-type', default=None, choices='ABCD',
+                        help='Lie type of records without lieType, '
+                             'resp. the Lie type to export')
+    parser.add_argument('-o', '--output', default='-', help='- for stdout')
+    args = parser.parse_args(argv)
+
+    st = ResultStore(args.db)
+    if args.command == 'import':
+        infile = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+        try:
+            count = st.importJSONLines(infile, args.lie_type)
+        finally:
+            if infile is not sys.stdin:
+                infile.close()
+        print('%d results imported' % count, file=sys.stderr)
+    elif args.command == 'export':
+        outfile = sys.stdout if args.output == '-' else open(args.output, 'w',
+                                                             encoding='utf-8')
+        try:
+            count = st.exportJSONLines(outfile, args.lie_type)
+        finally:
+            if outfile is not sys.stdout:
+                outfile.close()
+        print('%d results exported' % count, file=sys.stderr)
+    else:
+        print(json.dumps(st.stats()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
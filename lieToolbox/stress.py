@@ -0,0 +1,135 @@
+"""This file stores a stress check for concurrent classifications. The same
+random weights are classified once sequentially and then many times at once,
+first by threads calling HighestWeightModule directly and then through the
+Flask app served by a threaded server, and the results are compared.
+
+Command line:
+    python -m lieToolbox.stress --count 200 --threads 16
+
+The check exits with status 1 if any concurrent result differs from the
+sequential one.
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+from lieToolbox.weight import Weight, HighestWeightModule
+
+
+def randomCases(count: int, seed: int = 0) -> list:
+    """This function generates random real weights of all four types, mixing
+    integral, half integral and non-integral entries, so that every branch of
+    the classification is used.
+
+    Returns:
+        list: (weight string, lieType) pairs
+    """
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        lieType = rng.choice('ABCD')
+        n = rng.randint(2, 10)
+        entry = [rng.randint(-6, 6) + rng.choice((0, 0, 0.5, 0.1, 0.9, 0.3))
+                 for _ in range(n)]
+        cases.append((', '.join(str(w) for w in entry), lieType))
+    return cases
+
+
+def classifyCase(case: tuple) -> str:
+    """This function classifies one case and returns the orbit information
+    and GK dimension as JSON, as shown by the web page.
+    """
+    entryStr, lieType = case
+    clf = HighestWeightModule(Weight.parseStrWeight(entryStr, lieType)).classify()
+    obtInfo = dict(clf.orbitInfo)
+    obtInfo['GKdim'] = clf.gkdim
+    obtInfo['GKdimInfo'] = clf.gkdimInfo
+    return json.dumps(obtInfo, sort_keys=True, default=str)
+
+
+def compareResults(expected: list, results: list) -> int:
+    """Returns the number of results which differ from the expected ones."""
+    return sum(1 for x, y in zip(expected, results) if x != y)
+
+
+def stressCore(cases: list, threads: int = 16, rounds: int = 4) -> int:
+    """This function classifies the cases sequentially once and then rounds
+    times on a thread pool.
+
+    Returns:
+        int: the number of differing results
+    """
+    expected = [classifyCase(case) for case in cases]
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(classifyCase, cases * rounds))
+    return compareResults(expected * rounds, results)
+
+
+def postCase(url: str, case: tuple) -> str:
+    entryStr, lieType = case
+    data = urlencode({'weight': entryStr, 'lieType': lieType}).encode()
+    with urlopen(url + '/lie/classification', data, timeout=60) as response:
+        return response.read().decode('utf-8')
+
+
+def stressServer(cases: list, threads: int = 16, rounds: int = 2) -> int:
+    """This function serves the app with a threaded development server on a
+    free local port, posts the cases once sequentially and then rounds times
+    concurrently, and compares the pages.
+
+    Returns:
+        int: the number of differing pages
+    """
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from lieToolbox import create_app
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args):
+            pass
+
+    server = make_server('127.0.0.1', 0, create_app(), threaded=True,
+                         request_handler=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = 'http://127.0.0.1:%d' % server.server_port
+    try:
+        expected = [postCase(url, case) for case in cases]
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(lambda case: postCase(url, case),
+                                        cases * rounds))
+    finally:
+        server.shutdown()
+        thread.join()
+    return compareResults(expected * rounds, results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m lieToolbox.stress',
+        description='Compare concurrent and sequential classifications.')
+    parser.add_argument('--count', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-server', action='store_true',
+                        help='only run the check without the web server')
+    args = parser.parse_args(argv)
+
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible
+    cases = randomCases(args.count, args.seed)
+    failed = stressCore(cases, args.threads)
+    print('core: %d classifications, %d differ' % (4 * len(cases), failed))
+    if not args.no_server:
+        serverFailed = stressServer(cases, args.threads)
+        print('server: %d requests, %d differ' % (2 * len(cases), serverFailed))
+        failed += serverFailed
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
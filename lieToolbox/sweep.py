@@ -0,0 +1,302 @@
+"""This file stores a runner for large scans of highest weight modules. The
+weights are read from a stream in chunks, classified on a process pool and
+written to disk as JSON lines in the order of the input, so that the memory
+stays bounded by the number of chunks in flight.
+
+Command line:
+    python -m lieToolbox.sweep weights.txt -t D -o result.jsonl -j 64
+
+Each line of the input is a weight, e.g. "1.1, 2, 0.1, -3" or "1+2i, 0.5, -i".
+Each line of the output is a JSON object with weight, orbit, veryEvenType and
+gkdim. Complex weights are classified in batches of complex128 arrays and
+written as strings, e.g. "1+2i, 0.5, -1i".
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from lieToolbox.batch import classifyMany
+from lieToolbox.weight import Weight, HighestWeightModule
+
+# State of a worker process, set once by initWorker
+workerConfig = {}
+workerCache = OrderedDict()
+
+
+def initWorker(lieType: str, type: str = 'R', cacheSize: int = 10000):
+    """This function initializes a worker process with the Lie type and an
+    empty result cache.
+    """
+    workerConfig['lieType'] = lieType
+    workerConfig['type'] = type
+    workerConfig['cacheSize'] = cacheSize
+    workerCache.clear()
+
+
+def classifyOne(weight: tuple) -> tuple:
+    """This function classifies one weight with HighestWeightModule.
+
+    Returns:
+        tuple: orbit, very even type, GK dimension
+    """
+    if isPacked(weight):
+        lbd = Weight.fromComplex(list(weight), workerConfig['lieType'])
+    else:
+        lbd = Weight(list(weight), workerConfig['lieType'], workerConfig['type'])
+    L_lbd = HighestWeightModule(lbd)
+    obt = L_lbd.nilpotentOrbit()
+    return obt.entry, obt.veryEvenType, L_lbd.GKdim()
+
+
+def packWeight(weight) -> tuple:
+    """This function returns a weight as a tuple of floats, or of complex
+    numbers if an entry is complex, as Weight.fromComplex decides.
+    """
+    if any(isinstance(x, complex) for x in weight):
+        return tuple(complex(x) for x in weight)
+    return tuple(float(x) for x in weight)
+
+
+def isPacked(weight: tuple) -> bool:
+    """Complex weights are tuples of complex numbers, see packWeight."""
+    return bool(weight) and isinstance(weight[0], complex)
+
+
+def cacheKey(weight: tuple) -> tuple:
+    """A complex weight with imaginary parts 0 equals the real weight as a
+    tuple, but is classified as complex, so the key contains the kind.
+    """
+    return isPacked(weight), weight
+
+
+def classifyChunk(chunk: list) -> list:
+    """This function classifies a chunk of weights in a worker process. The
+    weights missing in the cache are classified in batches of equal length,
+    real and complex weights separately.
+
+    Args:
+        chunk (list): list of weights (tuples of floats, or of complex
+            numbers for complex weights)
+
+    Returns:
+        list: (orbit, very even type, GK dimension) for each weight, or the
+            error message if the weight could not be classified
+    """
+    results = {}  # weight -> value, for this chunk
+    missing = {}
+    for weight in chunk:
+        key = cacheKey(weight)
+        if key in workerCache:
+            results[key] = workerCache[key]
+            workerCache.move_to_end(key)
+        else:
+            missing.setdefault((len(weight), isPacked(weight)), {})[weight] = None
+    for rows in missing.values():
+        rows = list(rows)
+        try:
+            result = classifyMany(np.array(rows), workerConfig['lieType'],
+                                  workerConfig['type'])
+            values = [([int(x) for x in result['orbit'][i] if x],
+                       result['veryEvenType'][i] or None,
+                       int(result['gkdim'][i])) for i in range(len(rows))]
+        except Exception:
+            values = []
+            for weight in rows:
+                try:
+                    values.append(classifyOne(weight))
+                except Exception as e:
+                    values.append(type(e).__name__ + ': ' + str(e))
+        results.update(zip(map(cacheKey, rows), values))
+    output = [results[cacheKey(weight)] for weight in chunk]
+    # evict only after the output is assembled, the cache may be smaller
+    # than the chunk
+    for key, value in results.items():
+        workerCache[key] = value
+        workerCache.move_to_end(key)
+    while workerCache and len(workerCache) > workerConfig['cacheSize']:
+        workerCache.popitem(last=False)
+    return output
+
+
+def chunked(weights, chunkSize: int):
+    """This function cuts a stream of weights into lists of tuples.
+    """
+    iterator = iter(weights)
+    while True:
+        chunk = [packWeight(weight) for weight in islice(iterator, chunkSize)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def isCancelled(cancel) -> bool:
+    if cancel is None:
+        return False
+    if hasattr(cancel, 'is_set'):
+        return cancel.is_set()
+    return bool(cancel())
+
+
+def writeChunk(file, chunk: list, values: list, select=None) -> int:
+    """This function writes the results of a chunk as JSON lines.
+
+    Returns:
+        int: the number of lines written
+    """
+    count = 0
+    for weight, value in zip(chunk, values):
+        if isPacked(weight):
+            weight = Weight.fromComplex(list(weight)).entryStr()
+        else:
+            weight = list(weight)
+        if isinstance(value, str):
+            record = {'weight': weight, 'error': value}
+        else:
+            record = {'weight': weight, 'orbit': value[0],
+                      'veryEvenType': value[1], 'gkdim': value[2]}
+            if select is not None and not select(record):
+                continue
+        file.write(json.dumps(record) + '\n')
+        count += 1
+    return count
+
+
+def runSweep(weights, lieType: str, output, type: str = 'R',
+             processes: int = None, chunkSize: int = 1000,
+             cacheSize: int = 10000, progress=None, cancel=None,
+             select=None) -> dict:
+    """This function classifies a stream of weights on a process pool and
+    streams the results to disk in the input order. At most two chunks per
+    process are in flight, so the input is read lazily.
+
+    Args:
+        weights (iterable): weights, e.g. lists, tuples or rows of an array
+        lieType (str): Lie type
+        output (str or file): path or text file for the JSON lines
+        type (str): 'R' or 'C', see Weight
+        processes (int): number of processes, default os.cpu_count()
+        chunkSize (int): number of weights per task
+        cacheSize (int): number of results cached in each process
+        progress (callable): called as progress(done, written) after each chunk
+        cancel (Event or callable): checked before each chunk is submitted,
+            the sweep stops when it is set (resp. returns True)
+        select (callable): only records with select(record) true are written
+
+    Returns:
+        dict: count, written, cancelled, seconds
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if isinstance(output, str):
+        with open(output, 'w', encoding='utf-8') as file:
+            return runSweep(weights, lieType, file, type, processes, chunkSize,
+                            cacheSize, progress, cancel, select)
+
+    start = time.perf_counter()
+    count = 0
+    written = 0
+    cancelled = False
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=processes, initializer=initWorker,
+                             initargs=(lieType, type, cacheSize)) as executor:
+        try:
+            for chunk in chunked(weights, chunkSize):
+                if isCancelled(cancel):
+                    cancelled = True
+                    break
+                pending.append((chunk, executor.submit(classifyChunk, chunk)))
+                while len(pending) >= 2 * processes:
+                    chunk, future = pending.popleft()
+                    written += writeChunk(output, chunk, future.result(), select)
+                    count += len(chunk)
+                    if progress is not None:
+                        progress(count, written)
+            while pending:
+                if isCancelled(cancel):
+                    cancelled = True
+                    break
+                chunk, future = pending.popleft()
+                written += writeChunk(output, chunk, future.result(), select)
+                count += len(chunk)
+                if progress is not None:
+                    progress(count, written)
+        finally:
+            for chunk, future in pending:
+                future.cancel()
+            output.flush()
+    return {'count': count, 'written': written, 'cancelled': cancelled,
+            'seconds': time.perf_counter() - start}
+
+
+def readWeights(file):
+    """This function reads one weight per line, separated as in
+    Weight.parseStrWeight, e.g. "1.1, 2, 3/2". A line with a complex entry,
+    e.g. "1+2i, 3" or "1+0i, 3", is a complex weight as in parseStrWeight
+    and given as a list of complex numbers. Empty lines and lines starting
+    with # are skipped.
+    """
+    for line in file:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            entry = [Weight.parseEntry(x) for x in Weight.splitEntries(line)]
+            if any(isComplex for _, _, isComplex in entry):
+                yield [complex(real, imag) for real, imag, _ in entry]
+            else:
+                yield [float(real) for real, _, _ in entry]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m lieToolbox.sweep',
+        description='Classify the highest weight modules of a stream of weights.')
+    parser.add_argument('input', help='file with one weight per line, - for stdin')
+    parser.add_argument('-t', '--lie-type', default='B', choices='ABCD')
+    parser.add_argument('-o', '--output', default='-', help='JSON lines, - for stdout')
+    parser.add_argument('-j', '--processes', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--cache-size', type=int, default=10000)
+    parser.add_argument('--very-even-type', choices=('I', 'II'), default=None,
+                        help='only write very even orbits of this type')
+    parser.add_argument('-q', '--quiet', action='store_true')
+    args = parser.parse_args(argv)
+
+    select = None
+    if args.very_even_type is not None:
+        select = lambda record: record['veryEvenType'] == args.very_even_type
+
+    def progress(done, written):
+        if not args.quiet:
+            print('\r%d classified, %d written' % (done, written),
+                  end='', file=sys.stderr, flush=True)
+
+    infile = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    outfile = sys.stdout if args.output == '-' else open(args.output, 'w',
+                                                         encoding='utf-8')
+    try:
+        summary = runSweep(readWeights(infile), args.lie_type, outfile,
+                           processes=args.processes, chunkSize=args.chunk_size,
+                           cacheSize=args.cache_size, progress=progress,
+                           select=select)
+    except KeyboardInterrupt:
+        print('\ncancelled', file=sys.stderr)
+        return 130
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+    if not args.quiet:
+        print('\n%(count)d weights in %(seconds).1f s' % summary, file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""This file stores the build step and the loader of precomputed orbit tables.
+A table covers every nilpotent orbit of one Lie type and rank and stores for
+each orbit its partition, very even type, special flag, dimension, a-value and
+Lusztig symbol. Variable length data (partitions and symbol rows) are stored
+as one flat int array together with an offset index, so that each table is a
+directory of .npy files which can be memory-mapped and shared across
+processes without parsing.
+
+Build:
+    python -m lieToolbox.tables --max-rank 12 [--out DIRECTORY]
+
+The rows are in the order of NilpotentOrbit.generateOrbitList. A loaded
+table keeps a dict from partitions to rows, so an orbit is found in O(1).
+
+orbitList and orbitData answer from a table if one is built for the rank and
+compute the result otherwise; the orbit poset and the JSON API use them, and
+the web app loads the tables at start if ORBIT_TABLES_RANK is set. The
+special flag is the speciality of the orbit (isSpecialOrbit), not the parity
+check of Partition.isSpecialType, e.g. [2, 2, 1] of type B is a valid but not
+a special orbit.
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from lieToolbox.batch import orbitDimensions, positiveRootNum, rankOf
+from lieToolbox.weight import NilpotentOrbit, Partition
+
+tableDirectory = os.environ.get(
+    'LIETOOLBOX_TABLES', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tables'))
+
+# very even type <-> code
+veryEvenCode = {None: 0, 'I': 1, 'II': 2}
+veryEvenName = {0: None, 1: 'I', 2: 'II'}
+
+# (n, lieType, directory) -> OrbitTable
+tableCache = {}
+
+
+def transpose(p: list) -> list:
+    """This function returns the transpose (dual) partition.
+    """
+    return [sum(1 for p_k in p if p_k > i) for i in range(p[0])] if p else []
+
+
+def isSpecialOrbit(p: list, lieType: str) -> bool:
+    """This function checks whether an orbit is special (CM93, Proposition
+    6.3.7): for type B the transpose partition is of type B, for type C and D
+    it is of type C. All orbits of type A are special.
+    """
+    if lieType == 'A':
+        return True
+    q = transpose(p)
+    restricted = 0 if lieType == 'B' else 1  # parts with even multiplicity
+    return all(q.count(q_k) % 2 == 0 for q_k in set(q) if q_k % 2 == restricted)
+
+
+def flatten(rows: list) -> tuple:
+    """This function stores a list of int lists as a flat array and offsets.
+    """
+    offset = np.zeros(len(rows) + 1, dtype=np.int64)
+    offset[1:] = np.cumsum([len(row) for row in rows])
+    flat = np.fromiter((x for row in rows for x in row), dtype=np.int32,
+                       count=int(offset[-1]))
+    return flat, offset
+
+
+def tablePath(n: int, lieType: str, directory: str = None) -> str:
+    return os.path.join(directory or tableDirectory, '%s%d' % (lieType, n))
+
+
+def buildTable(n: int, lieType: str, directory: str = None) -> str:
+    """This function computes the table of all orbits of rank n and writes it
+    to directory/<lieType><n>.
+
+    Returns:
+        str: path of the table
+    """
+    path = tablePath(n, lieType, directory)
+    os.makedirs(path, exist_ok=True)
+    partitions = []
+    veryEven = []
+    special = []
+    symbolTop = []
+    symbolBottom = []
+    for obt in NilpotentOrbit.iterOrbits(n, lieType):
+        p = obt.entry
+        partitions.append(p)
+        veryEven.append(veryEvenCode[obt.veryEvenType])
+        special.append(isSpecialOrbit(p, lieType))
+        if lieType == 'A':
+            symbolTop.append([])
+            symbolBottom.append([])
+        else:
+            ls = obt.convert2Symbol()
+            symbolTop.append(list(ls.topEntry))
+            symbolBottom.append(list(ls.bottomEntry))
+
+    padded = np.zeros((len(partitions), NilpotentOrbit.orbitSize(n, lieType)),
+                      dtype=np.int64)
+    for i, p in enumerate(partitions):
+        padded[i, :len(p)] = p
+    dim = orbitDimensions(padded, lieType, n)
+    arrays = {'veryEven': np.array(veryEven, dtype=np.int8),
+              'special': np.array(special, dtype=bool),
+              'dim': dim,
+              'a': positiveRootNum(n, lieType) - dim // 2}
+    for name, rows in (('partition', partitions), ('symbolTop', symbolTop),
+                       ('symbolBottom', symbolBottom)):
+        arrays[name], arrays[name + 'Offset'] = flatten(rows)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, name + '.npy'), array)
+    with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as file:
+        json.dump({'lieType': lieType, 'n': n, 'size': len(partitions)}, file)
+    return path
+
+
+def buildTables(maxRank: int, directory: str = None, lieTypes: str = 'ABCD') -> list:
+    """This function builds the tables of all ranks 1, ..., maxRank.
+    """
+    return [buildTable(n, lieType, directory)
+            for lieType in lieTypes for n in range(1, maxRank + 1)]
+
+
+class OrbitTable:
+    """This class reads a table built by buildTable. The arrays are
+    memory-mapped, nothing is parsed on loading.
+    """
+
+    def __init__(tb, n: int, lieType: str, directory: str = None):
+        path = tablePath(n, lieType, directory)
+        if not os.path.isdir(path):
+            raise FileNotFoundError('no orbit table %s, run python -m lieToolbox.tables' % path)
+        tb.n = n
+        tb.lieType = lieType
+        for name in ('partition', 'partitionOffset', 'veryEven', 'special', 'dim',
+                     'a', 'symbolTop', 'symbolTopOffset', 'symbolBottom',
+                     'symbolBottomOffset'):
+            setattr(tb, name, np.load(os.path.join(path, name + '.npy'), mmap_mode='r'))
+
+        tb.index = None
+
+    def __len__(tb):
+        return len(tb.veryEven)
+
+    def buildIndex(tb) -> dict:
+        """This function builds the dict partition -> first row once, in one
+        pass over the flat partition array.
+        """
+        if tb.index is None:
+            flat = tb.partition.tolist()
+            offset = tb.partitionOffset.tolist()
+            index = {}
+            for i in range(len(tb)):
+                index.setdefault(tuple(flat[offset[i]:offset[i + 1]]), i)
+            tb.index = index
+        return tb.index
+
+    def getPartition(tb, i: int) -> list:
+        return tb.partition[tb.partitionOffset[i]:tb.partitionOffset[i + 1]].tolist()
+
+    def getVeryEvenType(tb, i: int):
+        return veryEvenName[int(tb.veryEven[i])]
+
+    def getSymbol(tb, i: int) -> tuple:
+        """Returns the top and bottom row of the Lusztig symbol."""
+        return (tb.symbolTop[tb.symbolTopOffset[i]:tb.symbolTopOffset[i + 1]].tolist(),
+                tb.symbolBottom[tb.symbolBottomOffset[i]:tb.symbolBottomOffset[i + 1]].tolist())
+
+    def getOrbit(tb, i: int) -> NilpotentOrbit:
+        obt = NilpotentOrbit(tb.getPartition(i), tb.lieType)
+        if tb.veryEven[i]:
+            obt.veryEven = True
+            obt.veryEvenType = tb.getVeryEvenType(i)
+        return obt
+
+    def getInfo(tb, i: int) -> dict:
+        top, bottom = tb.getSymbol(i)
+        return {'orbit': tb.getPartition(i),
+                'veryEvenType': tb.getVeryEvenType(i),
+                'special': bool(tb.special[i]),
+                'dim': int(tb.dim[i]),
+                'a': int(tb.a[i]),
+                'symbol': [top, bottom]}
+
+    def getOrbits(tb) -> list:
+        """Returns the orbits of all rows, as generateOrbitList."""
+        return [tb.getOrbit(i) for i in range(len(tb))]
+
+    def find(tb, p: list, veryEvenType: str = None) -> int:
+        """This function returns the row of an orbit, or -1 if the partition
+        is not an orbit of the table.
+        """
+        row = tb.buildIndex().get(tuple(sorted((p_k for p_k in p if p_k), reverse=True)), -1)
+        if row >= 0 and tb.veryEven[row] and veryEvenType == 'II':
+            row += 1  # type II follows type I
+        return row
+
+
+def loadTable(n: int, lieType: str, directory: str = None) -> OrbitTable:
+    """This function returns the cached table of rank n.
+    """
+    key = (n, lieType, directory)
+    if key not in tableCache:
+        tableCache[key] = OrbitTable(n, lieType, directory)
+    return tableCache[key]
+
+
+def findTable(n: int, lieType: str, directory: str = None) -> OrbitTable:
+    """This function returns the cached table of rank n, or None if it is
+    not built.
+    """
+    if (n, lieType, directory) not in tableCache and \
+            not os.path.isdir(tablePath(n, lieType, directory)):
+        return None
+    return loadTable(n, lieType, directory)
+
+
+def warmTables(maxRank: int, lieTypes: str = 'ABCD', directory: str = None) -> int:
+    """This function loads the built tables of ranks 1, ..., maxRank and
+    their indices, e.g. when a web worker starts.
+
+    Returns:
+        int: the number of tables loaded
+    """
+    count = 0
+    for lieType in lieTypes:
+        for n in range(1, maxRank + 1):
+            tb = findTable(n, lieType, directory)
+            if tb is not None:
+                tb.buildIndex()
+                count += 1
+    return count
+
+
+def orbitList(n: int, lieType: str, directory: str = None) -> list:
+    """This function returns NilpotentOrbit.generateOrbitList(n, lieType),
+    read from the table if it is built.
+    """
+    tb = findTable(n, lieType, directory)
+    if tb is None:
+        return NilpotentOrbit.generateOrbitList(n, lieType)
+    return tb.getOrbits()
+
+
+def computeOrbitData(p: list, lieType: str) -> dict:
+    """This function computes the row of an orbit as buildTable does."""
+    n = int(rankOf([p], lieType)[0])
+    dim = int(orbitDimensions([p], lieType, n)[0])
+    if lieType == 'A':
+        symbol = [[], []]
+    else:
+        ls = Partition(list(p), lieType).convert2Symbol()
+        symbol = [list(ls.topEntry), list(ls.bottomEntry)]
+    return {'special': isSpecialOrbit(p, lieType),
+            'dim': dim,
+            'a': positiveRootNum(n, lieType) - dim // 2,
+            'symbol': symbol}
+
+
+def orbitData(obt: NilpotentOrbit, directory: str = None) -> dict:
+    """This function returns special flag, dimension, a-value and Lusztig
+    symbol of an orbit, from the table of its rank if it is built.
+
+    Returns:
+        dict: special, dim, a, symbol
+    """
+    p = sorted((p_k for p_k in obt.entry if p_k), reverse=True)
+    if not p:
+        return computeOrbitData([0], obt.lieType)
+    tb = findTable(int(rankOf([p], obt.lieType)[0]), obt.lieType, directory)
+    if tb is not None:
+        row = tb.find(p, obt.veryEvenType)
+        if row >= 0:
+            info = tb.getInfo(row)
+            del info['orbit'], info['veryEvenType']
+            return info
+    return computeOrbitData(p, obt.lieType)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m lieToolbox.tables',
+                                     description='Build the orbit tables.')
+    parser.add_argument('--max-rank', type=int, default=10)
+    parser.add_argument('--types', default='ABCD')
+    parser.add_argument('--out', default=None, help='default: ' + tableDirectory)
+    args = parser.parse_args(argv)
+    for path in buildTables(args.max_rank, args.out, args.types):
+        print(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,32 +5,38 @@ TODO
 """
 
 from copy import deepcopy
-from re import split
-from math import ceil
+from fractions import Fraction
+import re
+from math import ceil, floor
 
-# For flask
-from lieToolbox import RSAlgorithm as rsa
-from lieToolbox import HAlgorithm as ha
-import lieToolbox.DRS_algorithm as drsa
-
-# # For test
-# import RSAlgorithm as rsa
-# import HAlgorithm as ha
-# import DRS_algorithm as drsa
+# Only the standard library is imported here. The DRS algorithm is only needed
+# for very even orbits of type D and is imported on first use.
+from lieToolbox import RS_algorithm as rsa
+from lieToolbox import H_algorithm as ha
 
 
 """
 Tol = 1e-7
 """
 
+# Tokens of a weight string, see Weight.parseStrWeight
+separatorPattern = re.compile(r'[\s,，]+')
+integerPattern = re.compile(r'[+-]?\d+')
+numberText = r'(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?'
+valueText = numberText + '(?:/' + numberText + ')?'
+realPattern = re.compile('[+-]?' + valueText)
+# a+bi, a-bi, a+i (real part, sign, imaginary part) or bi, -i
+complexPattern = re.compile('(?:([+-]?' + valueText + ')([+-])(' + valueText + ')?'
+                            '|()([+-]?)(' + valueText + ')?)i')
+
 class Weight:
     """This class combines a weight constructed by an entry along with its Lie type. 
     If no entry is given, it will initialize with an empty list with type B. 
     It also support 
     """
 
-    def __init__(lbd, entry: list = [], lieType: str = 'B', type: str = 'R'):
-        lbd.entry = entry
+    def __init__(lbd, entry: list = None, lieType: str = 'B', type: str = 'R'):
+        lbd.entry = list(entry) if entry is not None else []  # own copy
         lbd.lieType = lieType
         lbd.type = type
         lbd.weightType = lbd.getWeightType()
@@ -97,21 +103,86 @@ class Weight:
                 entry.append(complex(lbd.realEntry[i], lbd.imagEntry[i]))
             print(entry, 'Weight of type', lbd.lieType)
             
+    def key(lbd):
+        """This function returns a hashable key of the weight, which is exact
+        for weights with Fraction entries, e.g. for caching and deduplication.
+
+        Returns:
+            tuple: (lieType, type, entry)
+        """
+        return (lbd.lieType, lbd.type, tuple(lbd.entry))
+
+    def toExact(lbd):
+        """This function returns the weight with Fraction entries, decimals
+        are read as written, e.g. 0.1 -> 1/10.
+
+        Returns:
+            Weight: the exact weight
+        """
+        entry = [_ if isinstance(_, (int, Fraction)) else Fraction(str(_))
+                 for _ in lbd.entry]
+        return Weight(entry, lbd.lieType, lbd.type)
+
+    def complexEntry(lbd) -> list:
+        """This function returns the entries as complex numbers, i.e. the
+        packed form of the parallel lists realEntry and imagEntry.
+
+        Returns:
+            list: list of complex
+        """
+        if lbd.type == 'C':
+            return [complex(w, v) for w, v in zip(lbd.realEntry, lbd.imagEntry)]
+        return [complex(w) for w in lbd.entry]
+
+    @staticmethod
+    def fromComplex(entry: list, lieType: str = 'B'):
+        """This function builds a weight from packed entries. As in
+        parseStrWeight, the weight is complex iff one entry is a complex
+        number, even if all imaginary parts are 0.
+
+        Args:
+            entry (list): real or complex numbers
+            lieType (str): Lie type
+
+        Returns:
+            Weight: weight object
+        """
+        if any(isinstance(w, complex) for w in entry):
+            return Weight([complex(w).real for w in entry] +
+                          [complex(w).imag for w in entry], lieType, 'C')
+        return Weight(list(entry), lieType, 'R')
+
+    @staticmethod
+    def complexStr(real, imag) -> str:
+        """This function writes one entry so that parseEntry reads it back,
+        e.g. 1.5, 2i, 1-2i.
+        """
+        if imag == 0:
+            return str(real)
+        elif real == 0:
+            return str(imag) + 'i'
+        elif imag < 0:
+            return str(real) + '-' + str(-imag) + 'i'
+        return str(real) + '+' + str(imag) + 'i'
+
+    def entryStr(lbd) -> str:
+        """This function writes the entries so that parseStrWeight reads the
+        same weight back, e.g. '1, 2.5' or '1-2i, 0.5'. If all imaginary
+        parts of a complex weight are 0, the entries are written as x+0i.
+        """
+        if lbd.type != 'C':
+            return ', '.join(str(w) for w in lbd.entry)
+        if not any(lbd.imagEntry):
+            return ', '.join(str(w) + '+0i' for w in lbd.realEntry)
+        return ', '.join(Weight.complexStr(w, v)
+                         for w, v in zip(lbd.realEntry, lbd.imagEntry))
+
     def toStr(lbd):
         if len(lbd.entry) == 0:
             entryStr = 'None'
         else:
             if lbd.type == 'C':
-                elet = []
-                for i in range(len(lbd.realEntry)):
-                    if lbd.imagEntry[i] == 0:
-                        ele = str(lbd.realEntry[i])
-                    elif lbd.realEntry[i] == 0:
-                        ele = str(lbd.imagEntry[i]) + 'i'
-                    else:
-                        ele = str(lbd.realEntry[i]) + '+' + str(lbd.imagEntry[i]) + 'i'
-                    elet.append(ele)
-                entryStr = '(' + ', '.join(elet) + ')'
+                entryStr = lbd.entryStr()  # parseStrWeight reads it back
             elif lbd.type == 'R':
                 entryStr = tuple(lbd.entry)
         return entryStr
@@ -141,19 +212,22 @@ class Weight:
         \\tilde{x}
         """
         subset = []
-        for i in range(len(lbd.entry) - 1, -1, -1):
-            if lbd.getEntryType(lbd.entry[i] - lbd.entry[0]) == 'Integer':
-                subset.append(lbd.entry[i])
-                lbd.entry.pop(i)
-        subset.reverse()
+        rest = []
+        if len(lbd.entry) > 0:
+            key0 = lbd.congruenceKey(lbd.entry[0])
+            for w in lbd.entry:
+                if lbd.congruenceKey(w) == key0:
+                    subset.append(w)
+                else:
+                    rest.append(w)
         # Justify maximum subset
-        if len(subset) >= len(lbd.entry):
+        if len(subset) >= len(rest):
             maxSubset = subset
         else:
-            maxSubset = lbd.entry
-            lbd.entry = subset
+            maxSubset = rest
+            rest = subset
 
-        for w in lbd.entry[::-1]:
+        for w in rest[::-1]:
             maxSubset.append(-w)
         lbd.entry = maxSubset
 
@@ -163,15 +237,14 @@ class Weight:
         Returns:
             int: q negative part
         """
-        subset = []
-        newlbdEntry = deepcopy(lbd.realEntry)
-        for i in range(len(lbd.realEntry) - 1, -1, -1):
-            if Weight.getEntryType(newlbdEntry[i] -
-                                   newlbdEntry[0]) == 'Integer':
-                subset.append(newlbdEntry[i])
-                newlbdEntry.pop(i)
-        subset.reverse()
-        return min(len(subset), len(newlbdEntry))
+        if len(lbd.realEntry) == 0:
+            return 0
+        key0 = Weight.congruenceKey(lbd.realEntry[0])
+        subsetNum = 0
+        for w in lbd.realEntry:
+            if Weight.congruenceKey(w) == key0:
+                subsetNum += 1
+        return min(subsetNum, len(lbd.realEntry) - subsetNum)
 
     def basicDecomposition(lbd):
         """This function decomposes a weight string for Lie type A, which
@@ -181,34 +254,19 @@ class Weight:
             list: a list of Weight object
         """
         if lbd.type == 'R':
-            newEntry = deepcopy(lbd.entry)
-            entryList = []
-            while len(newEntry) > 0:
-                t = []
-                for i in range(len(newEntry) - 1, -1, -1):
-                    if lbd.getEntryType(newEntry[i] - newEntry[0]) == 'Integer':
-                        t.append(newEntry[i])
-                        newEntry.pop(i)
-                t.reverse()
-                entryList.append(t)
-            return [Weight(entry, 'A') for entry in entryList]
+            entryDict = {}
+            for w in lbd.entry:
+                entryDict.setdefault(lbd.congruenceKey(w), []).append(w)
+            return [Weight(entry, 'A') for entry in entryDict.values()]
         else:
-            realEntry = deepcopy(lbd.realEntry)
-            imagEntry = deepcopy(lbd.imagEntry)
-            weightList = []
-            while len(realEntry) > 0:
-                realt = []
-                imagt = []
-                for i in range(len(realEntry) - 1, -1, -1):
-                    if lbd.getEntryType(realEntry[i] - realEntry[0]) == 'Integer' and abs(imagEntry[i] - imagEntry[0]) < 1e-7:
-                        realt.append(realEntry[i])
-                        imagt.append(imagEntry[i])
-                        realEntry.pop(i)
-                        imagEntry.pop(i)
-                realt.reverse()
-                imagt.reverse()
-                weightList.append(Weight(realt + imagt, 'A', 'C'))
-            return weightList
+            entryDict = {}
+            for w, v in zip(lbd.realEntry, lbd.imagEntry):
+                realt, imagt = entryDict.setdefault(lbd.congruenceKey(w, imag=v),
+                                                    ([], []))
+                realt.append(w)
+                imagt.append(v)
+            return [Weight(realt + imagt, 'A', 'C')
+                    for realt, imagt in entryDict.values()]
         
         
 
@@ -222,70 +280,42 @@ class Weight:
         lieType = lbd.lieType
         # Real case
         if lbd.type == 'R':
-            newEntry = deepcopy(lbd.entry)
             entry1 = []
             entry2 = []
-            
-            for i in range(len(newEntry) - 1, -1, -1):  # pop from the end
-                if lbd.getEntryType(newEntry[i]) == 'Integer':
-                    entry1.append(newEntry[i])
-                    newEntry.pop(i)
-                elif lbd.getEntryType(newEntry[i]) == 'Half integer':
-                    entry2.append(newEntry[i])
-                    newEntry.pop(i)
-            entry1.reverse()  # reverse the list due to previous order
-            entry2.reverse()
+            entryDict = {}
+            for w in lbd.entry:
+                entryType = lbd.getEntryType(w)
+                if entryType == 'Integer':
+                    entry1.append(w)
+                elif entryType == 'Half integer':
+                    entry2.append(w)
+                else:
+                    entryDict.setdefault(lbd.congruenceKey(w, fold=True), []).append(w)
             lbd1 = Weight(entry1, lieType)
             lbd2 = Weight(entry2, lieType)
-            
-            lbdList3 = []
-            while len(newEntry) > 0:
-                entry3 = []
-                for i in range(len(newEntry) - 1, -1, -1):  # pop from the end
-                    if lbd.getEntryType(
-                            newEntry[i] - newEntry[0]) == 'Integer' or lbd.getEntryType(
-                                newEntry[i] + newEntry[0]) == 'Integer':
-                        entry3.append(newEntry[i])
-                        newEntry.pop(i)
-                entry3.reverse()
-                lbdList3.append(Weight(entry3, 'A', 'R'))
+            lbdList3 = [Weight(entry3, 'A', 'R') for entry3 in entryDict.values()]
             return WeightStruct(lbd1, lbd2, lbdList3)
         
         # Complex case
         else:
-            realEntry = deepcopy(lbd.realEntry)
-            imagEntry = deepcopy(lbd.imagEntry)
             entry1 = []
             entry2 = []
-            for i in range(len(realEntry) - 1, -1, -1):
-                if lbd.getEntryType(realEntry[i]) == 'Integer' and imagEntry[i] == 0:
-                    entry1.append(realEntry[i])
-                    realEntry.pop(i)
-                    imagEntry.pop(i)
-                elif lbd.getEntryType(realEntry[i]) == 'Half integer' and imagEntry[i] == 0:
-                    entry2.append(realEntry[i])
-                    realEntry.pop(i)
-                    imagEntry.pop(i)
-            entry1.reverse()
-            entry2.reverse()
+            entryDict = {}
+            for w, v in zip(lbd.realEntry, lbd.imagEntry):
+                entryType = lbd.getEntryType(w)
+                if entryType == 'Integer' and v == 0:
+                    entry1.append(w)
+                elif entryType == 'Half integer' and v == 0:
+                    entry2.append(w)
+                else:
+                    realEntry3, imagEntry3 = entryDict.setdefault(
+                        lbd.congruenceKey(w, fold=True, imag=v), ([], []))
+                    realEntry3.append(w)
+                    imagEntry3.append(v)
             lbd1 = Weight(entry1, lieType, 'R')
             lbd2 = Weight(entry2, lieType, 'R')
-            
-            lbdList3 = []
-            while len(realEntry) > 0:
-                realEntry3 = []
-                imagEntry3 = []
-                for i in range(len(realEntry) - 1, -1, -1):
-                    if (lbd.getEntryType(realEntry[i] - realEntry[0]) == 'Integer' or lbd.getEntryType(
-                        realEntry[i] + realEntry[0]) == 'Integer') and abs(imagEntry[i] - imagEntry[0]) < 1e-7:
-                        realEntry3.append(realEntry[i])
-                        imagEntry3.append(imagEntry[i])
-                        realEntry.pop(i)
-                        imagEntry.pop(i)
-                realEntry3.reverse()
-                imagEntry3.reverse()
-                lbdList3.append(Weight(realEntry3+imagEntry3, 'A', 'C'))
-            
+            lbdList3 = [Weight(realEntry3 + imagEntry3, 'A', 'C')
+                        for realEntry3, imagEntry3 in entryDict.values()]
             return WeightStruct(lbd1, lbd2, lbdList3)
                 
 
@@ -313,8 +343,10 @@ class Weight:
         ) == 'Empty':  # return empty, if an empty weight was given
             return Partition([], lbd.lieType)
         else:
-            tableau = lbd.constructTableau()
-            ptEntry = [len(_) for _ in tableau]
+            if lbd.type == 'R':
+                ptEntry = rsa.constructShape(lbd.entry)
+            else:
+                ptEntry = rsa.constructShape(lbd.realEntry)
             return Partition(ptEntry, lbd.lieType)
 
     @staticmethod
@@ -340,10 +372,9 @@ class Weight:
             Weight: the antidominant weight
         """
         newlbd = deepcopy(lbd)
-        n = len(newlbd.entry)
-        while newlbd.positiveEntry(newlbd.entry) > 0:
-            max_idx = newlbd.entry.index(max(newlbd.entry))
-            newlbd[max_idx] = -abs(newlbd[max_idx])
+        for i, w in enumerate(newlbd.entry):  # flip every positive entry
+            if w > 0:
+                newlbd[i] = -w
         newlbd.entry.sort()
         return newlbd
 
@@ -360,12 +391,13 @@ class Weight:
             elif q % 2 == 1:
                 return 'II'
         else:
+            from lieToolbox import DRS_algorithm as drsa
             mu = lbd.getAntidominant()
             wg = Weight.getWeylGroupElement(lbd, mu)
-            domino = drsa.w2DominoTableau(wg.entry)
-            if drsa.vertical_domino_boxes(domino) % 4 == 0:  # DRS algorithm
+            verboxNum = drsa.w2VerticalDominoBoxes(wg.entry)
+            if verboxNum % 4 == 0:  # DRS algorithm
                 return 'I'
-            elif drsa.vertical_domino_boxes(domino) % 4 == 2:
+            elif verboxNum % 4 == 2:
                 return 'II'
             else:
                 return 'None'
@@ -381,6 +413,7 @@ class Weight:
                                 'qNegtive': q,
                                 'VeryEvenType': veryEvenType}
         else:
+            from lieToolbox import DRS_algorithm as drsa
             mu = lbd.getAntidominant()
             wg = Weight.getWeylGroupElement(lbd, mu)
             domino = drsa.w2DominoTableau(wg.entry)
@@ -420,20 +453,53 @@ class Weight:
         newmuo = deepcopy(other)
         newmuo.rightMinus()
         newmu = newmuo.entry
+        # positions of each value, the last unused one is matched first
+        position = {}
+        for j, w in enumerate(newlbd):
+            position.setdefault(w, []).append(j)
         we = []
         for i in range(2 * n - 1, n - 1, -1):
-            for j in range(2 * n - 1, -1, -1):
-                if newmu[i] == newlbd[j]:
-                    if j < n:
-                        entry = j - n
-                    elif j >= n:
-                        entry = j - n + 1
-                    we.append(entry)
-                    newlbd[j] = ''
-                    break
+            stack = position.get(newmu[i])
+            if stack:
+                j = stack.pop()
+                if j < n:
+                    entry = j - n
+                elif j >= n:
+                    entry = j - n + 1
+                we.append(entry)
         we.reverse()
         return WeylGroupElement(we, lbd.lieType)
 
+    @staticmethod
+    def congruenceKey(x: float, fold: bool = False, imag: float = None):
+        """This function returns a canonical key of the congruence class of an
+        element, i.e. its fractional part on a grid of width 1e-7 (exact for
+        int and Fraction), so that x - y is an integer iff x and y have the
+        same key. With fold, x and -x
+        get the same key (x + y is an integer). For complex elements the
+        imaginary part is part of the key.
+
+        Args:
+            x (float): real part of an element
+            fold (bool): identify x and -x
+            imag (float): imaginary part of an element
+
+        Returns:
+            int or tuple: the key
+        """
+        if isinstance(x, (int, Fraction)):  # exact
+            key = (x - floor(x)) * 10**7
+        else:
+            key = round((x - floor(x)) * 10**7) % 10**7
+        if fold:
+            key = min(key, 10**7 - key)
+        if imag is not None:
+            if isinstance(imag, (int, Fraction)):
+                key = (key, imag * 10**7)
+            else:
+                key = (key, round(imag * 10**7))
+        return key
+
     @staticmethod
     def getEntryType(x: float):
         """This function decide the element type in an entry
@@ -446,6 +512,15 @@ class Weight:
         """
         if isinstance(x, complex):
             return 'complex'
+        if isinstance(x, int):
+            return 'Integer'
+        if isinstance(x, Fraction):  # exact
+            if x.denominator == 1:
+                return 'Integer'
+            elif x.denominator == 2:
+                return 'Half integer'
+            else:
+                return 'Not Half integer'
         if abs(x - round(x)) < 1e-7:
             return 'Integer'
         elif abs(x - int(x) - 0.5) < 1e-7 or abs(x - int(x) + 0.5) < 1e-7:
@@ -453,47 +528,115 @@ class Weight:
         else:
             return 'Not Half integer'
         
+    @staticmethod
+    def parseNumber(text: str, exact: bool = False):
+        """This function converts a real token without eval: integers give
+        int, decimals and fractions give float (as Python evaluates them) or,
+        with exact, Fraction.
+
+        Args:
+            text (str): e.g. '3', '-1.5', '3/2', '1e-3', '' (zero)
+
+        Returns:
+            int, float or Fraction
+        """
+        if not text:
+            return 0
+        if '/' in text:
+            numerator, denominator = text.split('/')
+            numerator = Weight.parseNumber(numerator, exact)
+            denominator = Weight.parseNumber(denominator, exact)
+            if exact:
+                return Fraction(numerator) / Fraction(denominator)
+            return numerator / denominator
+        if exact:
+            return Fraction(text)
+        if integerPattern.fullmatch(text):
+            return int(text)
+        return float(text)
+
+    @staticmethod
+    def parseEntry(token: str, exact: bool = False) -> tuple:
+        """This function parses one entry of a weight: a real number (integer,
+        decimal or fraction such as 3/2) or a complex number a+bi, a-bi, bi,
+        i or -i.
+
+        Returns:
+            tuple: (real part, imaginary part, whether the token is complex)
+
+        Raises:
+            ValueError: if the token is not a number, e.g. '1/0'
+        """
+        try:
+            match = realPattern.fullmatch(token)
+            if match is not None:
+                return Weight.parseNumber(token, exact), 0, False
+            match = complexPattern.fullmatch(token)
+            if match is None:
+                raise ValueError('invalid entry %r' % token)
+            real, sign, imag = (match.groups()[:3] if match.group(2) is not None
+                                else match.groups()[3:])
+            if imag is None:
+                imag = 1 if not exact else Fraction(1)
+            else:
+                imag = Weight.parseNumber(imag, exact)
+            return (Weight.parseNumber(real or '', exact),
+                    -imag if sign == '-' else imag, True)
+        except ZeroDivisionError:  # e.g. 1/0
+            raise ValueError('invalid entry %r' % token) from None
+
+    @staticmethod
+    def splitEntries(input_str: str) -> list:
+        """This function splits a weight string at commas and spaces."""
+        return [_ for _ in separatorPattern.split(input_str.strip()) if _]
+
     @staticmethod
     def parseStrWeight(input_str: str, lieType: str):
-        # Complex
-        if 'i' in input_str:
-            ntype = 'C'
-            parts = split(', |,|，| ', input_str)
-            real_parts = []
-            imag_parts = []
-            
-            for part in parts:
-                print('s', part)
-                if 'i' in part:
-                    # Ordinary complex number
-                    if '+' in part:
-                        real, imag = part.split('+')
-                        print(real, imag)
-                        real_parts.append(eval(real) if real else 0)
-                        if imag == 'i':
-                            imag_parts.append(1)
-                        else:
-                            imag_parts.append(eval(imag.replace('i', '').strip()))
-                    # Pure imaginary number
-                    else:
-                        real_parts.append(0)
-                        if part == 'i':
-                            imag_parts.append(1)
-                        else:
-                            imag_parts.append(eval(part.replace('i', '').strip()))
-                # Real number
-                else:
-                    real_parts.append(eval(part))
-                    imag_parts.append(0)
+        """This function parses a weight, e.g. '1, 2.5, 3/2' or
+        '1+2i, 1-2i, 3i, 0.5'. If one entry is complex, the weight is
+        complex. Nothing is evaluated.
 
-            entry = real_parts + imag_parts
-        
-        # Real  
-        else:
-            ntype = 'R'
-            entry = list(map(eval, split(', |,|，| ', input_str)))
-        
-        return Weight(entry=entry, lieType=lieType, type=ntype)
+        Args:
+            input_str (str): entries separated by commas or spaces
+            lieType (str): Lie type
+
+        Returns:
+            Weight: weight object
+        """
+        real_parts = []
+        imag_parts = []
+        isComplex = False
+        for part in Weight.splitEntries(input_str):
+            real, imag, complexEntry = Weight.parseEntry(part)
+            real_parts.append(real)
+            imag_parts.append(imag)
+            isComplex = isComplex or complexEntry
+        if isComplex:
+            return Weight(entry=real_parts + imag_parts, lieType=lieType, type='C')
+        return Weight(entry=real_parts, lieType=lieType, type='R')
+
+    @staticmethod
+    def parseExactWeight(input_str: str, lieType: str):
+        """This function parses a weight with exact Fraction entries, e.g.
+        '1/2, 0.1, -3' or '1+2i, 1/2-i, 3i'. Integrality tests on such a
+        weight are exact, e.g. 0.1 and 0.2 sum to exactly 3/10.
+
+        Args:
+            input_str (str): entries separated by commas or spaces
+            lieType (str): Lie type
+
+        Returns:
+            Weight: weight with Fraction entries
+        """
+        real_parts = []
+        imag_parts = []
+        for part in Weight.splitEntries(input_str):
+            real, imag, _ = Weight.parseEntry(part, exact=True)
+            real_parts.append(Fraction(real))
+            imag_parts.append(Fraction(imag))
+        if any(imag_parts):
+            return Weight(real_parts + imag_parts, lieType, 'C')
+        return Weight(real_parts, lieType, 'R')
 
 
 class WeightStruct:
@@ -503,25 +646,25 @@ class WeightStruct:
     def __init__(lbdStruct,
                  lbd1: Weight,
                  lbd2: Weight,
-                 lbdList3: list[Weight] = []):
-        WeightStruct.Integral = lbd1
-        WeightStruct.HIntegral = lbd2
-        WeightStruct.NHIntegral = lbdList3
-        WeightStruct.lieType = lbd1.lieType
-        if len(lbdList3):
-            WeightStruct.type = lbdList3[0].type
+                 lbdList3: list[Weight] = None):
+        lbdStruct.Integral = lbd1
+        lbdStruct.HIntegral = lbd2
+        lbdStruct.NHIntegral = list(lbdList3) if lbdList3 is not None else []
+        lbdStruct.lieType = lbd1.lieType
+        if len(lbdStruct.NHIntegral):
+            lbdStruct.type = lbdStruct.NHIntegral[0].type
         else:
-            WeightStruct.type = 'R'
+            lbdStruct.type = 'R'
 
     def show(lbdStruct):
         print('Weight struct of type', lbdStruct.lieType)
         print('\t Integral part:', lbdStruct.Integral.entry)
         print('\t Half integral part:', lbdStruct.HIntegral.entry)
         print('\t Rest part:')
-        if len(WeightStruct.NHIntegral) == 0:
+        if len(lbdStruct.NHIntegral) == 0:
             print('None')
         else:
-            for lbd in WeightStruct.NHIntegral:
+            for lbd in lbdStruct.NHIntegral:
                 print('\t\t ',lbd.entry)
 
     def serialize(lbdStruct):
@@ -661,7 +804,19 @@ class WeightStruct:
 class HighestWeightModule:
     def __init__(self, lbd: Weight):
         self.highestWeight = lbd
-    
+        self.classification = None
+
+    def classify(self) -> 'Classification':
+        """This function classifies the module once and caches the result, so
+        that orbit, orbit information and GK dimension share one computation.
+
+        Returns:
+            Classification: cached classification result
+        """
+        if self.classification is None:
+            self.classification = Classification(self.highestWeight)
+        return self.classification
+
     def nilpotentOrbit(self):
         """This is the main function to classify the nilpotent orbit of highest
         weight module of four types of classical Lie algebra. It also has a strategy
@@ -670,49 +825,7 @@ class HighestWeightModule:
         Returns:
             Partition: combined with very even orbit type of type D
         """
-        lbd = self.highestWeight
-        if lbd.lieType == 'A':
-            lbdList = lbd.basicDecomposition()
-            p = Partition([], lbd.lieType)
-            for lbdk in lbdList:
-                p += lbdk.constructPartition()
-            orbit = NilpotentOrbit(p.entry, p.lieType) # create an orbit
-
-        else:
-            # Integral part
-            lbdStruct = lbd.decomposition()
-            lbdStruct.Integral.rightMinus()
-            p1 = lbdStruct.Integral.constructPartition()
-            p1.hollowBoxAlgorithm(lbd.lieType)
-            
-            # Half integral part
-            lbdStruct.HIntegral.rightMinus()
-            p2 = lbdStruct.HIntegral.constructPartition()
-            if lbd.lieType == 'B':
-                p2.hollowBoxAlgorithm('D')
-            elif lbd.lieType == 'C' or 'D':
-                p2.hollowBoxAlgorithm('metaplectic')
-            # Rest part
-            p3 = Partition([], lbd.lieType)
-            for lbdk in lbdStruct.NHIntegral:
-                lbdk.tilde()
-                p3 += lbdk.constructPartition()
-            # p1.show()
-            # p2.show()
-            # lbdStruct.Integral.show()
-            # Partition union
-            p = p1 + p2 + p3 + p3
-            # Collapse to get the orbit
-            p.collapse()
-            
-            orbit = NilpotentOrbit(p.entry, p.lieType)  # create an orbit
-            
-            # Justify and handle very even orbit
-            if lbd.lieType == 'D' and p.isVeryEven() == True:
-                orbit.veryEven = True
-                orbit.veryEvenType = WeightStruct.veryEvenOrbitType(
-                    lbd.decomposition())
-        return orbit
+        return self.classify().orbit
 
     def nilpotentOrbitInfo(self):
         """Calculate the orbit and return detailed information in the calculation process
@@ -724,95 +837,7 @@ class HighestWeightModule:
             Type D: lieType, WeightStruct, PartitionList, Orbit, veryEven, veryEvenTypeInfo
                 veryEvenType
         """
-        lbd = self.highestWeight
-        if lbd.lieType == 'A':
-            lbdList = lbd.basicDecomposition()
-            pList = []
-            p = Partition([], lbd.lieType)
-            for lbdk in lbdList:
-                pk = lbdk.constructPartition()
-                pList.append(pk)
-                p += pk
-            orbit = NilpotentOrbit(p.entry, p.lieType) # create an orbit
-            
-            # Orbit Info to Dict
-            orbitInfo = {}
-            orbitInfo['lieType'] = 'A'
-            orbitInfo['highestWeight'] = lbd.toStr()
-            orbitInfo['n'] = lbd.n
-            orbitInfo['UnitList'] = []
-            for i in range(len(pList)):
-                orbitInfo['UnitList'].append({'Num': i+1,
-                                              'Weight': lbdList[i].toStr(), 
-                                              'Partition': pList[i].entry})
-            orbitInfo['Orbit'] = orbit.entry
-            
-            return orbitInfo
-
-        else:
-            # Integral part
-            lbdStruct = lbd.decomposition()
-            lbdStruct.Integral.rightMinus()
-            p1 = lbdStruct.Integral.constructPartition()
-            p1oEntry = deepcopy(p1.entry) # before H
-            p1.hollowBoxAlgorithm(lbd.lieType)
-            # Half integral part
-            lbdStruct.HIntegral.rightMinus()
-            p2 = lbdStruct.HIntegral.constructPartition()
-            p2oEntry = deepcopy(p2.entry)
-            if lbd.lieType == 'B':
-                p2.hollowBoxAlgorithm('D')
-            elif lbd.lieType == 'C' or 'D':
-                p2.hollowBoxAlgorithm('metaplectic')
-            # Rest part
-            p3 = Partition([], lbd.lieType)
-            p3List = []
-            for lbdk in lbdStruct.NHIntegral:
-                lbdk.tilde()
-                p3k = lbdk.constructPartition()
-                p3List.append(p3k)
-                p3 += p3k
-            # Partition union
-            p = p1 + p2 + p3 + p3
-            
-            # Collapse to get the orbit
-            p.collapse()
-            orbit = NilpotentOrbit(p.entry, p.lieType)  # create an orbit
-            
-            orbitInfo = {}
-            orbitInfo['lieType'] = lbd.lieType
-            orbitInfo['highestWeight'] = lbd.toStr()
-            orbitInfo['n'] = lbd.n
-            orbitInfo['Integral'] = {'Weight': lbdStruct.Integral.toStr(),
-                                     'Partition1': p1oEntry,
-                                     'Partition2': p1.entry}
-            orbitInfo['HIntegral'] = {'Weight': lbdStruct.HIntegral.toStr(),
-                                     'Partition1': p2oEntry,
-                                     'Partition2': p2.entry}
-            orbitInfo['NHIntegral'] = []
-            for i in range(len(p3List)):
-                orbitInfo['NHIntegral'].append({'Num': i+1,
-                                              'Weight': lbdStruct.NHIntegral[i].toStr(), 
-                                              'Partition': p3List[i].entry})
-            orbitInfo['Orbit'] = orbit.entry
-            # print(orbitInfo)
-            
-            # Justify and handle very even orbit
-            if lbd.lieType == 'D' and p.isVeryEven() == True:
-                orbit.veryEven = True
-                lbdStructD = lbd.decomposition()
-                
-                    
-                orbit.veryEvenType = WeightStruct.veryEvenOrbitType(
-                    lbd.decomposition())
-                lbd.show()
-                orbitInfo['isVeryEven'] = orbit.veryEven
-                orbitInfo['veryEvenTypeInfo'] = WeightStruct.veryEvenOrbitTypeInfo(lbd.decomposition())
-                orbitInfo['veryEvenType'] = orbit.veryEvenType
-                # print(orbitInfo)
-                
-                
-        return orbitInfo
+        return self.classify().orbitInfo
     
     @staticmethod
     def a_fun(obt: 'Partition', a_fun_type: str):
@@ -833,92 +858,158 @@ class HighestWeightModule:
         return a_fun_val
     
     def GKdim(self):
-        lbd = self.highestWeight
-        lieType = lbd.lieType
-        n = lbd.n 
-        L_lbd = HighestWeightModule(lbd)
-        obt = L_lbd.nilpotentOrbit()
-        print(L_lbd.nilpotentOrbitInfo())
-        obt_info = L_lbd.nilpotentOrbitInfo()
+        return self.classify().gkdim
         
-        if lieType == 'A':
-            partitions = [Partition(d['Partition']) for d in obt_info['UnitList']]
-            gk_dim = n*(n-1)/2
-            for partition in partitions:
-                gk_dim -= HighestWeightModule.a_fun(partition, 'a')
+    def GKdimInfo(self):
+        return self.classify().gkdimInfo
+
+
+class Classification:
+    """This class runs the classification of a highest weight module in a
+    single pass: decomposition, RS, H-algorithm, collapse and DRS are carried
+    out once, and the results are stored as fields.
+
+    Fields:
+        orbit (NilpotentOrbit): the nilpotent orbit
+        orbitInfo (dict): detailed information, see nilpotentOrbitInfo
+        gkdim (int): Gelfand-Kirillov dimension
+        gkdimInfo (dict): detailed information of the GK dimension
+    """
+
+    def __init__(self, lbd: Weight):
+        self.highestWeight = lbd
+        if lbd.lieType == 'A':
+            self.classifyA()
         else:
-            integral_partition = Partition(obt_info['Integral']['Partition2'])
-            half_integral_partition = Partition(obt_info['HIntegral']['Partition2'])
-            non_integral_partitions = [Partition(d['Partition']) for d in obt_info['NHIntegral']]
+            self.classifyBCD()
+        self.computeGKdim()
+
+    def classifyA(self):
+        lbd = self.highestWeight
+        lbdList = lbd.basicDecomposition()
+        pList = []
+        p = Partition([], lbd.lieType)
+        for lbdk in lbdList:
+            pk = lbdk.constructPartition()
+            pList.append(pk)
+            p += pk
+        orbit = NilpotentOrbit(p.entry, p.lieType) # create an orbit
         
-            if lieType == 'B':
-                gk_dim = n*n - (HighestWeightModule.a_fun(integral_partition, 'b')
-                                + HighestWeightModule.a_fun(half_integral_partition, 'b'))
-                for non_integral_partition in non_integral_partitions:
-                    gk_dim -= HighestWeightModule.a_fun(non_integral_partition, 'a')
-            elif lieType == 'C':
-                gk_dim = n*n - (HighestWeightModule.a_fun(integral_partition, 'b')
-                                + HighestWeightModule.a_fun(half_integral_partition, 'd'))
-                for non_integral_partition in non_integral_partitions:
-                    gk_dim -= HighestWeightModule.a_fun(non_integral_partition, 'a')
-            elif lieType == 'D':
-                gk_dim = n*n - n - (HighestWeightModule.a_fun(integral_partition, 'b')
-                                + HighestWeightModule.a_fun(half_integral_partition, 'd'))
-                for non_integral_partition in non_integral_partitions:
-                    gk_dim -= HighestWeightModule.a_fun(non_integral_partition, 'a')
-            # print(n, afun, obt.entry)
-        return int(gk_dim)
+        # Orbit Info to Dict
+        orbitInfo = {}
+        orbitInfo['lieType'] = 'A'
+        orbitInfo['highestWeight'] = lbd.toStr()
+        orbitInfo['n'] = lbd.n
+        orbitInfo['UnitList'] = []
+        for i in range(len(pList)):
+            orbitInfo['UnitList'].append({'Num': i+1,
+                                          'Weight': lbdList[i].toStr(), 
+                                          'Partition': pList[i].entry})
+        orbitInfo['Orbit'] = orbit.entry
+
+        self.partitions = pList
+        self.orbit = orbit
+        self.orbitInfo = orbitInfo
+
+    def classifyBCD(self):
+        lbd = self.highestWeight
+        lbdStruct = lbd.decomposition()
+        # The parts are kept intact for the very even orbit type
+        lbdInt = deepcopy(lbdStruct.Integral)
+        lbdHInt = deepcopy(lbdStruct.HIntegral)
+        lbdNHIntList = deepcopy(lbdStruct.NHIntegral)
+        # Integral part
+        lbdInt.rightMinus()
+        p1 = lbdInt.constructPartition()
+        p1oEntry = deepcopy(p1.entry) # before H
+        p1.hollowBoxAlgorithm(lbd.lieType)
+        # Half integral part
+        lbdHInt.rightMinus()
+        p2 = lbdHInt.constructPartition()
+        p2oEntry = deepcopy(p2.entry)
+        if lbd.lieType == 'B':
+            p2.hollowBoxAlgorithm('D')
+        elif lbd.lieType == 'C' or 'D':
+            p2.hollowBoxAlgorithm('metaplectic')
+        # Rest part
+        p3 = Partition([], lbd.lieType)
+        p3List = []
+        for lbdk in lbdNHIntList:
+            lbdk.tilde()
+            p3k = lbdk.constructPartition()
+            p3List.append(p3k)
+            p3 += p3k
+        # Partition union
+        p = p1 + p2 + p3 + p3
         
-    def GKdimInfo(self):
+        # Collapse to get the orbit
+        p.collapse()
+        orbit = NilpotentOrbit(p.entry, p.lieType)  # create an orbit
+        
+        orbitInfo = {}
+        orbitInfo['lieType'] = lbd.lieType
+        orbitInfo['highestWeight'] = lbd.toStr()
+        orbitInfo['n'] = lbd.n
+        orbitInfo['Integral'] = {'Weight': lbdInt.toStr(),
+                                 'Partition1': p1oEntry,
+                                 'Partition2': p1.entry}
+        orbitInfo['HIntegral'] = {'Weight': lbdHInt.toStr(),
+                                 'Partition1': p2oEntry,
+                                 'Partition2': p2.entry}
+        orbitInfo['NHIntegral'] = []
+        for i in range(len(p3List)):
+            orbitInfo['NHIntegral'].append({'Num': i+1,
+                                          'Weight': lbdNHIntList[i].toStr(), 
+                                          'Partition': p3List[i].entry})
+        orbitInfo['Orbit'] = orbit.entry
+        
+        # Justify and handle very even orbit
+        if lbd.lieType == 'D' and p.isVeryEven() == True:
+            veryEvenTypeInfo = WeightStruct.veryEvenOrbitTypeInfo(lbdStruct)
+            orbit.veryEven = True
+            orbit.veryEvenType = veryEvenTypeInfo['veryEvenType']
+            orbitInfo['isVeryEven'] = orbit.veryEven
+            orbitInfo['veryEvenTypeInfo'] = veryEvenTypeInfo
+            orbitInfo['veryEvenType'] = orbit.veryEvenType
+
+        self.partitions = [p1, p2] + p3List
+        self.orbit = orbit
+        self.orbitInfo = orbitInfo
+
+    def computeGKdim(self):
         lbd = self.highestWeight
         lieType = lbd.lieType
         n = lbd.n
-        L_lbd = HighestWeightModule(lbd)
-        obt = L_lbd.nilpotentOrbit()
-        obt_info = L_lbd.nilpotentOrbitInfo()
         afun = 0
-        gkDimInfo = {'Weight': lbd.toStr(), 
-                     'lieType': lieType, 
-                     'n': n, 
-                     'Orbit': obt.entry}
-        
         if lieType == 'A':
-            partitions = [Partition(d['Partition']) for d in obt_info['UnitList']]
-            gk_dim = n*(n-1)/2
-            for partition in partitions:
+            for partition in self.partitions:
                 afun += HighestWeightModule.a_fun(partition, 'a')
-            gk_dim -= afun 
-        
+            gk_dim = n*(n-1)/2 - afun
         else:
-            integral_partition = Partition(obt_info['Integral']['Partition2'])
-            half_integral_partition = Partition(obt_info['HIntegral']['Partition2'])
-            non_integral_partitions = [Partition(d['Partition']) for d in obt_info['NHIntegral']]
-        
+            integral_partition, half_integral_partition = self.partitions[:2]
             if lieType == 'B':
                 afun += (HighestWeightModule.a_fun(integral_partition, 'b') + 
                          HighestWeightModule.a_fun(half_integral_partition, 'b'))
-                for non_integral_partition in non_integral_partitions:
-                    afun += HighestWeightModule.a_fun(non_integral_partition, 'a')
-                gk_dim = n*n - afun
-                
             elif lieType == 'C':
                 afun += (HighestWeightModule.a_fun(integral_partition, 'b') + 
                          HighestWeightModule.a_fun(half_integral_partition, 'd'))
-                for non_integral_partition in non_integral_partitions:
-                    afun += HighestWeightModule.a_fun(non_integral_partition, 'a')
-                gk_dim = n*n - afun
-                
-            elif lieType == 'D':
-                afun += (HighestWeightModule.a_fun(integral_partition, 'b') + 
+            else:  # the integral part of type D is a D-partition
+                afun += (HighestWeightModule.a_fun(integral_partition, 'd') + 
                          HighestWeightModule.a_fun(half_integral_partition, 'd'))
-                for non_integral_partition in non_integral_partitions:
-                    afun += HighestWeightModule.a_fun(non_integral_partition, 'a')
+            for non_integral_partition in self.partitions[2:]:
+                afun += HighestWeightModule.a_fun(non_integral_partition, 'a')
+            if lieType == 'D':
                 gk_dim = n*n - n - afun
-        
-        gkDimInfo['a'] = afun
-        gkDimInfo['gkdim'] = gk_dim
-        return gkDimInfo
-        
+            else:
+                gk_dim = n*n - afun
+
+        self.gkdim = int(gk_dim)
+        self.gkdimInfo = {'Weight': lbd.toStr(), 
+                          'lieType': lieType, 
+                          'n': n, 
+                          'Orbit': self.orbit.entry,
+                          'a': afun,
+                          'gkdim': gk_dim}
         
 
 class WeylGroupElement:
@@ -926,8 +1017,8 @@ class WeylGroupElement:
     expressed as a signed permutation. It also support the multiple operation.
     """
 
-    def __init__(wg, entry: list = [], lieType: str = 'B'):
-        wg.entry = entry
+    def __init__(wg, entry: list = None, lieType: str = 'B'):
+        wg.entry = list(entry) if entry is not None else []
         wg.lieType = lieType
 
     def __getitem__(wg, key):
@@ -984,10 +1075,7 @@ class WeylGroupElement:
         if len(wg.entry) == 0:  # return empty, if an empty weight was given
             return Partition([], wg.lieType)
         else:
-            newEntry = deepcopy(wg.entry)
-            newEntryIndex = rsa.convert2Index(newEntry)
-            Tableau = rsa.constructYoungTableau(newEntryIndex)
-            ptEntry = [len(_) for _ in Tableau]
+            ptEntry = rsa.constructShape(wg.entry)
             return Partition(ptEntry, wg.lieType)
 
     def show(wg):
@@ -999,8 +1087,8 @@ class Partition:
     representation of nilpotent orbit.
     """
 
-    def __init__(pt, entry: list = [], lieType: str = 'B'):
-        pt.entry = entry
+    def __init__(pt, entry: list = None, lieType: str = 'B'):
+        pt.entry = list(entry) if entry is not None else []
         pt.lieType = lieType
 
     def __add__(pt, other):
@@ -1012,15 +1100,10 @@ class Partition:
         Returns:
             Partition: Partition object
         """
-        pu = []
-        p_1 = deepcopy(pt.entry)
-        p_2 = deepcopy(other.entry)
-        if len(p_1) <= len(p_2):  # fill zeros to achieve same length
-            p_1 += (len(p_2) - len(p_1)) * [0]
-        else:
-            p_2 += (len(p_1) - len(p_2)) * [0]
-        for i in range(len(p_1)):
-            pu.append(p_1[i] + p_2[i])
+        p_1, p_2 = pt.entry, other.entry
+        if len(p_1) < len(p_2):
+            p_1, p_2 = p_2, p_1
+        pu = [x + y for x, y in zip(p_1, p_2)] + list(p_1[len(p_2):])
         return Partition(pu, pt.lieType)
     
     def __eq__(pt, other):
@@ -1032,13 +1115,13 @@ class Partition:
         Returns:
             Bool
         """
-        p_1 = pt.entry
-        p_2 = other.entry
-        while p_1[-1] == 0:
-            p_1.pop()
-        while p_2[-1] == 0:
-            p_2.pop()
-        return p_1 == p_2
+        return ([p_k for p_k in pt.entry if p_k] ==
+                [p_k for p_k in other.entry if p_k])
+
+    def freeze(pt) -> 'FrozenPartition':
+        """This function returns an immutable copy, see FrozenPartition.
+        """
+        return FrozenPartition(pt.entry, pt.lieType)
 
     def show(pt):
         """This function shows partition itself, which also checks whether
@@ -1062,38 +1145,37 @@ class Partition:
         Returns:
             bool: True or False
         """
-        while pt.entry[-1] == 0:  # delete zeros
-            pt.entry.pop()
+        entry = [p_k for p_k in pt.entry if p_k]  # ignore zeros
         flag = True
 
         if pt.lieType == 'A':
             flag = True
 
         elif pt.lieType == 'B':
-            if sum(pt.entry) % 2 == 1:  # check sum
-                for p_k in pt.entry:
+            if sum(entry) % 2 == 1:  # check sum
+                for p_k in entry:
                     if p_k % 2 == 0:  # B rule
-                        if pt.entry.count(p_k) % 2 != 0:
+                        if entry.count(p_k) % 2 != 0:
                             flag = False
                             break
             else:
                 flag = False
 
         elif pt.lieType == 'C':
-            if sum(pt.entry) % 2 == 0:  # check sum
-                for p_k in pt.entry:
+            if sum(entry) % 2 == 0:  # check sum
+                for p_k in entry:
                     if p_k % 2 == 1:  # C rule
-                        if pt.entry.count(p_k) % 2 != 0:
+                        if entry.count(p_k) % 2 != 0:
                             flag = False
                             break
             else:
                 flag = False
 
         elif pt.lieType == 'D':
-            if sum(pt.entry) % 2 == 0:  # check sum
-                for p_k in pt.entry:
+            if sum(entry) % 2 == 0:  # check sum
+                for p_k in entry:
                     if p_k % 2 == 0:  # D rule
-                        if pt.entry.count(p_k) % 2 != 0:
+                        if entry.count(p_k) % 2 != 0:
                             flag = False
                             break
             else:
@@ -1101,6 +1183,13 @@ class Partition:
 
         return flag
 
+    def dropZeros(pt):
+        """This function deletes the trailing zeros of the entry in place.
+        """
+        while pt.entry and pt.entry[-1] == 0:
+            pt.entry.pop()
+        return pt
+
     def isVeryEven(pt):
         """This function checks whether a partition of type D is very
         even.
@@ -1123,103 +1212,99 @@ class Partition:
         else:
             return False
 
-    def collapse(pt):
-        """This function carries out standard collapse operation introduced in
-        CM93 to transfer the partition to correct type.
+    # parts which must occur with even multiplicity, by parity
+    badParity = {'B': 0, 'C': 1, 'D': 0}
+
+    def multiplicity(pt) -> dict:
+        """This function returns the multiplicity form of the partition.
+
+        Returns:
+            dict: part -> multiplicity, zeros are ignored
         """
-        if pt.lieType == 'A':
-            pass
-        elif pt.lieType == 'B':
-            if sum(pt.entry) % 2 == 0:  # convert to P(2n+1) for type B
-                pt.entry[0] += 1
-            # pt.show()
-            while pt.isSpecialType() == False:
-                pt.entry.append(0)
-                for i in range(len(pt.entry)):
-                    # even
-                    if pt.entry[i] % 2 == 0 and pt.entry.count(
-                            pt.entry[i]) % 2 == 1:
-                        pt.entry[i] -= 1
-                        for j in range(i, len(pt.entry)):
-                            if pt.entry[j] < pt.entry[i]:
-                                pt.entry[j] += 1
-                                break
-                        break
+        mult = {}
+        for p_k in pt.entry:
+            if p_k:
+                mult[p_k] = mult.get(p_k, 0) + 1
+        return mult
 
-        elif pt.lieType == 'C':
-            while pt.isSpecialType() == 0:
-                pt.entry.append(0)
-                for i in range(len(pt.entry)):
-                    # odd
-                    if pt.entry[i] % 2 == 1 and pt.entry.count(
-                            pt.entry[i]) % 2 == 1:
-                        pt.entry[i] -= 1
-                        for j in range(i, len(pt.entry)):
-                            if pt.entry[j] < pt.entry[i]:
-                                pt.entry[j] += 1
-                                break
-                        break
+    @staticmethod
+    def multiplicity2Entry(mult: dict) -> list:
+        """This function returns the decreasing entry of a multiplicity form.
+        """
+        entry = []
+        for p_k in sorted(mult, reverse=True):
+            entry += [p_k] * mult[p_k]
+        return entry
 
-        elif pt.lieType == 'D':
-            while pt.isSpecialType() == 0:
-                pt.entry.append(0)
-                for i in range(len(pt.entry)):
-                    # even
-                    if pt.entry[i] % 2 == 0 and pt.entry.count(
-                            pt.entry[i]) % 2 == 1:
-                        pt.entry[i] -= 1
-                        for j in range(i, len(pt.entry)):
-                            if pt.entry[j] < pt.entry[i]:
-                                pt.entry[j] += 1
-                                break
-                        break
-
-        while pt.entry[-1] == 0:  # delete zeros
-            pt.entry.pop()
+    def collapse(pt):
+        """This function carries out standard collapse operation introduced in
+        CM93 to transfer the partition to correct type: as long as a bad part
+        (even for B and D, odd for C) occurs with odd multiplicity, the last
+        occurrence of the largest such part q becomes q - 1 and the first part
+        r < q - 1 becomes r + 1 (CM93, Lemma 6.3.3). For type B a box is added
+        to the first part if the size is even.
+
+        The parts only move downwards, so one pass over the part sizes on the
+        multiplicity form suffices, i.e. the time is linear in the size.
+        """
+        if pt.lieType not in Partition.badParity:
+            pt.dropZeros()
+            return
+        mult = pt.multiplicity()
+        if not mult:
+            pt.entry = []
+            return
+        if pt.lieType == 'B' and sum(pt.entry) % 2 == 0:  # P(2n+1) for type B
+            top = max(mult)
+            mult[top] -= 1
+            mult[top + 1] = 1
+        bad = Partition.badParity[pt.lieType]
+        q = max(mult)
+        while q > 0:
+            if q % 2 == bad and mult.get(q, 0) % 2 == 1:
+                mult[q] -= 1
+                mult[q - 1] = mult.get(q - 1, 0) + 1
+                # the next bad part is at most r + 1, so the searches do not
+                # overlap
+                r = q - 2
+                while r > 0 and not mult.get(r, 0):
+                    r -= 1
+                if r > 0:
+                    mult[r] -= 1
+                mult[r + 1] = mult.get(r + 1, 0) + 1
+            q -= 1
+        pt.entry = Partition.multiplicity2Entry(
+            {p_k: m_k for p_k, m_k in mult.items() if m_k and p_k})
 
     def restrictedCollapse(pt):
         pass
 
     def expansion(pt):
         """This function carries out standard expansion operation introduced in
-        CM93 to transfer the partition to correct type.
+        CM93 to transfer the partition to correct type: for each bad part q
+        (even for B and D, odd for C) of multiplicity at least two whose first
+        occurrence is at an odd (B) resp. even (C, D) position, counted from
+        1, the first two occurrences q, q become q + 1, q - 1.
         """
-        if pt.lieType == 'A':
-            pass
-        
-        elif pt.lieType == 'B':
-            newp = deepcopy(pt.entry)
-            for i in range(0, len(pt.entry), 2):
-                if pt.entry[i]%2 == 0 and pt.entry[i+1] == pt.entry[i] and (i == 0 or pt.entry[i-1]!=pt.entry[i]):
-                    newp[i] += 1
-                    newp[i+1] -= 1
-            newp.sort(reverse=True)
-            pt.entry = newp
-            while pt.entry[-1] == 0:
-                pt.entry.pop()
-        
-        elif pt.lieType == 'C':
-            for i in range(1, len(pt.entry), 2):
-            # print(i)
-                if pt.entry[i]%2 == 1 and i+1 < len(pt.entry) and pt.entry[i+1] == pt.entry[i] and pt.entry[i-1] != pt.entry[i]:
-                    newp[i] += 1
-                    newp[i+1] -= 1
-            newp.sort(reverse=True)
-            pt.entry = newp
-            while pt.entry[-1] == 0:
-                pt.entry.pop()
-        
-        elif pt.lieType == 'D':
-            newp = deepcopy(pt.entry)
-            for i in range(1, len(pt.entry), 2):
-                if pt.entry[i]%2 == 0 and i+1 < len(pt.entry) and pt.entry[i+1] == pt.entry[i] and pt.entry[i-1]!=pt.entry[i]:
-                    newp[i] += 1
-                    newp[i+1] -= 1
-            newp.sort(reverse=True)
-            pt.entry = newp
-            while pt.entry[-1] == 0:
-                pt.entry.pop()
-                
+        if pt.lieType not in Partition.badParity:
+            return
+        bad = Partition.badParity[pt.lieType]
+        start = 0 if pt.lieType == 'B' else 1  # 0-based position of the block
+        mult = pt.multiplicity()
+        newMult = {}
+        position = 0
+        for p_k in sorted(mult, reverse=True):
+            m_k = mult[p_k]
+            if p_k % 2 == bad and m_k >= 2 and position % 2 == start:
+                newMult[p_k + 1] = newMult.get(p_k + 1, 0) + 1
+                newMult[p_k - 1] = newMult.get(p_k - 1, 0) + 1
+                m_k -= 2
+            if m_k:
+                newMult[p_k] = newMult.get(p_k, 0) + m_k
+            position += mult[p_k]
+        pt.entry = Partition.multiplicity2Entry(
+            {p_k: m_k for p_k, m_k in newMult.items() if p_k})
+
     def oddEntry(pt):
         p = pt.entry
         p_even = []
@@ -1328,18 +1413,145 @@ class Partition:
             return Symbol(ds_even, ds_odd, 'D')
 
 
+
+class FrozenPartition:
+    """This class stores an immutable partition, e.g. as a cache key or as a
+    row of an orbit table. The entry is a decreasing tuple without zeros, two
+    frozen partitions are equal iff they have the same entry and Lie type.
+    The multiplicity form ((part, multiplicity), ...) is computed once.
+
+    Operations return new objects, a mutable Partition is obtained by thaw.
+    """
+
+    __slots__ = ('entry', 'lieType', 'hashValue', 'multiplicityForm')
+
+    def __init__(pt, entry=(), lieType: str = 'B'):
+        entry = tuple(sorted((p_k for p_k in entry if p_k), reverse=True))
+        object.__setattr__(pt, 'entry', entry)
+        object.__setattr__(pt, 'lieType', lieType)
+        object.__setattr__(pt, 'hashValue', hash((entry, lieType)))
+        object.__setattr__(pt, 'multiplicityForm', None)
+
+    @staticmethod
+    def fromMultiplicity(multiplicity, lieType: str = 'B') -> 'FrozenPartition':
+        """This function constructs a partition from its multiplicity form.
+
+        Args:
+            multiplicity (dict or iterable): part -> multiplicity, or pairs
+                (part, multiplicity)
+            lieType (str): Lie type
+
+        Returns:
+            FrozenPartition: e.g. {3: 2, 1: 1} -> (3, 3, 1)
+        """
+        if isinstance(multiplicity, dict):
+            multiplicity = multiplicity.items()
+        entry = []
+        for p_k, m_k in sorted(multiplicity, reverse=True):
+            entry += [p_k] * m_k
+        return FrozenPartition(entry, lieType)
+
+    def __setattr__(pt, name, value):
+        raise AttributeError('FrozenPartition is immutable')
+
+    def __delattr__(pt, name):
+        raise AttributeError('FrozenPartition is immutable')
+
+    def __hash__(pt):
+        return pt.hashValue
+
+    def __eq__(pt, other):
+        if not isinstance(other, FrozenPartition):
+            return NotImplemented
+        return pt.entry == other.entry and pt.lieType == other.lieType
+
+    def __lt__(pt, other):
+        return (pt.entry, pt.lieType) < (other.entry, other.lieType)
+
+    def __len__(pt):
+        return len(pt.entry)
+
+    def __iter__(pt):
+        return iter(pt.entry)
+
+    def __getitem__(pt, i):
+        return pt.entry[i]
+
+    def __repr__(pt):
+        return 'FrozenPartition(%s, %r)' % (list(pt.entry), pt.lieType)
+
+    def __reduce__(pt):
+        return (FrozenPartition, (pt.entry, pt.lieType))
+
+    def __add__(pt, other):
+        """This function overloads '+' to obtain the union of two partitions,
+        i.e. the sum of the parts, see Partition.__add__.
+        """
+        p_1, p_2 = pt.entry, other.entry
+        if len(p_1) < len(p_2):
+            p_1, p_2 = p_2, p_1
+        return FrozenPartition([x + y for x, y in zip(p_1, p_2)] + list(p_1[len(p_2):]),
+                               pt.lieType)
+
+    def size(pt) -> int:
+        return sum(pt.entry)
+
+    def multiplicity(pt) -> tuple:
+        """This function returns the multiplicity form.
+
+        Returns:
+            tuple: pairs (part, multiplicity), parts decreasing
+        """
+        if pt.multiplicityForm is None:
+            form = []
+            for p_k in pt.entry:
+                if form and form[-1][0] == p_k:
+                    form[-1][1] += 1
+                else:
+                    form.append([p_k, 1])
+            object.__setattr__(pt, 'multiplicityForm',
+                               tuple((p_k, m_k) for p_k, m_k in form))
+        return pt.multiplicityForm
+
+    def thaw(pt) -> Partition:
+        """This function returns a mutable copy.
+        """
+        return Partition(list(pt.entry), pt.lieType)
+
+    def isSpecialType(pt) -> bool:
+        return Partition(pt.entry, pt.lieType).isSpecialType()
+
+    def isVeryEven(pt) -> bool:
+        return pt.lieType == 'D' and all(
+            p_k % 2 == 0 and m_k % 2 == 0 for p_k, m_k in pt.multiplicity())
+
+    def collapse(pt) -> 'FrozenPartition':
+        """This function returns the collapse, see Partition.collapse.
+        """
+        p = pt.thaw()
+        p.collapse()
+        return FrozenPartition(p.entry, pt.lieType)
+
+    def expansion(pt) -> 'FrozenPartition':
+        """This function returns the expansion, see Partition.expansion.
+        """
+        p = pt.thaw()
+        p.expansion()
+        return FrozenPartition(p.entry, pt.lieType)
+
+
 class Symbol:
     """This class handles structure and operation of Lusztig Symbol.
     """
 
     def __init__(ls,
-                 topEntry: list = [],
-                 bottomEntry: list = [],
+                 topEntry: list = None,
+                 bottomEntry: list = None,
                  lieType: str = 'B'):
-        Symbol.topEntry = topEntry
-        Symbol.bottomEntry = bottomEntry
-        Symbol.lieType = lieType
-        Symbol.special = False
+        ls.topEntry = list(topEntry) if topEntry is not None else []
+        ls.bottomEntry = list(bottomEntry) if bottomEntry is not None else []
+        ls.lieType = lieType
+        ls.special = False
 
     def show(ls):
         """This function shows the Symbol itself.
@@ -1392,11 +1604,10 @@ class Symbol:
 
 
 class NilpotentOrbit(Partition):
-    def __init__(self, entry: list = ..., lieType: str = 'B'):
-        super().__init__(entry, lieType)
+    def __init__(self, entry: list = None, lieType: str = 'B'):
+        super().__init__(sorted(entry or [], reverse=True), lieType)
         self.veryEven = False
         self.veryEvenType = None
-        self.entry.sort(reverse=True)
     
     def show(self) -> None:
         """show the orbit itself
@@ -1431,52 +1642,131 @@ class NilpotentOrbit(Partition):
         Returns:
             list: list of orbits
         """
+        return list(NilpotentOrbit.iterOrbits(n, lieType))
+
+    @staticmethod
+    def orbitSize(n: int, lieType: str) -> int:
+        """This function returns the size of the partitions of orbits of a Lie
+        algebra of rank n, i.e. n, 2n+1 or 2n.
+        """
         if lieType == 'A':
-            l = n
+            return n
         elif lieType == 'B':
-            l = 2 * n + 1
+            return 2 * n + 1
         else:
-            l = 2 * n
+            return 2 * n
+
+    @staticmethod
+    def isRestrictedPart(k: int, lieType: str) -> bool:
+        """Parts which must occur with even multiplicity: even parts for type
+        B and D, odd parts for type C.
+        """
+        if lieType == 'B' or lieType == 'D':
+            return k % 2 == 0
+        elif lieType == 'C':
+            return k % 2 == 1
+        return False
+
+    @staticmethod
+    def iterOrbits(n: int, lieType: str):
+        """This function lazily generates the orbits of generateOrbitList in
+        the same order. Only partitions satisfying the parity rule of the Lie
+        type are built, by choosing each part together with its multiplicity.
+
+        Args:
+            n (int): dimension
+            lieType (str): lieType
+
+        Yields:
+            NilpotentOrbit: orbit, very even orbits of type D twice (I and II)
+        """
+        l = NilpotentOrbit.orbitSize(n, lieType)
+
         def backtrack(start, target, path):
             if target == 0:
-                pt = NilpotentOrbit(list(path), lieType)
-                if pt.isSpecialType():
-                    # Very even type
-                    if pt.lieType == 'D' and pt.isVeryEven():
-                        pt.veryEven = True
-                        pt.veryEvenType = 'I'
-                        orbitList.append(pt)
-                        pt1 = deepcopy(pt)
-                        pt1.veryEvenType = 'II'
-                        orbitList.append(pt1)
-                    else:
-                        orbitList.append(pt)
-                return 
+                yield list(path)
+                return
             for i in range(min(start, target), 0, -1):
-                path.append(i)
-                backtrack(i, target - i, path)
-                path.pop()
+                mMax = target // i
+                if NilpotentOrbit.isRestrictedPart(i, lieType):
+                    mMax -= mMax % 2
+                    step = 2
+                else:
+                    step = 1
+                for m in range(mMax, 0, -step):  # more copies come first
+                    path.extend([i] * m)
+                    yield from backtrack(i - 1, target - i * m, path)
+                    del path[-m:]
+
+        for p in backtrack(l, l, []):
+            pt = NilpotentOrbit(p, lieType)
+            # Very even type
+            if lieType == 'D' and p and all(p_k % 2 == 0 for p_k in p):
+                pt.veryEven = True
+                pt.veryEvenType = 'I'
+                yield pt
+                pt1 = NilpotentOrbit(list(p), lieType)
+                pt1.veryEven = True
+                pt1.veryEvenType = 'II'
+                yield pt1
+            else:
+                yield pt
+
+    @staticmethod
+    def countOrbits(n: int, lieType: str) -> int:
+        """This function counts the orbits of generateOrbitList without
+        building any partition, using the generating function
+        prod 1/(1 - x^k) with x^k replaced by x^2k for restricted parts.
 
-        orbitList = []
-        backtrack(l, l, [])
-        return orbitList
+        Args:
+            n (int): dimension
+            lieType (str): lieType
+
+        Returns:
+            int: number of orbits
+        """
+        l = NilpotentOrbit.orbitSize(n, lieType)
+        count = [1] + [0] * l
+        for k in range(1, l + 1):
+            step = 2 * k if NilpotentOrbit.isRestrictedPart(k, lieType) else k
+            for m in range(step, l + 1):
+                count[m] += count[m - step]
+        total = count[l]
+        if lieType == 'D' and n > 0 and n % 2 == 0:
+            # very even partitions (2j)^(2m_j) are counted twice, they
+            # correspond to partitions of n/2
+            half = n // 2
+            count = [1] + [0] * half
+            for k in range(1, half + 1):
+                for m in range(k, half + 1):
+                    count[m] += count[m - k]
+            total += count[half]
+        return total
     
     def __gt__(self, other):
-        """Partial order of orbits
+        """Partial order of orbits, i.e. the closure order, which is the
+        dominance order of partitions: all partial sums of the orbit are not
+        less than those of the other. The two very even orbits with the same
+        partition are not comparable.
 
         Args:
             other (NilpotentOrbit): another orbit
 
         Returns:
-            bool: whether the orbit is higher than the other
+            bool: whether the orbit is higher than the other (or equal)
         """
         p_1 = self.entry
         p_2 = other.entry
-        if len(p_1) <= len(p_2):  # fill zeros to achieve same length
-            p_1 += (len(p_2) - len(p_1)) * [0]
-        else:
-            p_2 += (len(p_1) - len(p_2)) * [0]
-        return all([p_1[i] >= p_2[i] for i in range(len(p_1))])
+        s_1 = 0
+        s_2 = 0
+        for i in range(max(len(p_1), len(p_2))):
+            s_1 += p_1[i] if i < len(p_1) else 0
+            s_2 += p_2[i] if i < len(p_2) else 0
+            if s_1 < s_2:
+                return False
+        if self.veryEven and other.veryEven and self.veryEvenType != other.veryEvenType:
+            return p_1 != p_2
+        return True
 
 
 if __name__ == '__main__':
@@ -0,0 +1,73 @@
+import random
+
+import numpy as np
+import pytest
+
+from lieToolbox.batch import classifyMany
+from lieToolbox.weight import Weight, HighestWeightModule
+
+# offsets of the fractional part, some of them near the 1e-7 grid
+offsets = [0, 0, 0, 0.5, 0.5, 0.1, 0.3, 0.7, 0.25, 1e-8, -1e-8, 4e-8, 6e-8,
+           1.4e-7, 0.5 + 3e-8, 0.5 - 3e-8, 0.1 + 4.9e-8, 0.1 + 5.1e-8]
+
+
+def randomEntry(rng):
+    return rng.randint(-5, 5) + rng.choice(offsets)
+
+
+def randomWeights(count, seed, complexEntries=False):
+    rng = random.Random(seed)
+    weights = []
+    for _ in range(count):
+        n = rng.randint(2, 7)
+        real = [randomEntry(rng) for _ in range(n)]
+        if complexEntries:
+            imag = [rng.choice([0, 0, 1, -1, 0.5, 2e-8]) for _ in range(n)]
+            weights.append(real + imag)
+        else:
+            weights.append(real)
+    return weights
+
+
+def expected(entry, lieType, type='R'):
+    L_lbd = HighestWeightModule(Weight(list(entry), lieType, type))
+    obt = L_lbd.nilpotentOrbit()
+    return ([p_k for p_k in obt.entry if p_k], obt.veryEvenType or '',
+            L_lbd.GKdim())
+
+
+def rows(result):
+    return [([p_k for p_k in orbit if p_k], vet, gkdim) for orbit, vet, gkdim
+            in zip(result['orbit'].tolist(), result['veryEvenType'].tolist(),
+                   result['gkdim'].tolist())]
+
+
+def byRank(weights):
+    ranks = {}
+    for entry in weights:
+        ranks.setdefault(len(entry), []).append(entry)
+    return ranks.values()
+
+
+@pytest.mark.parametrize('lieType', ['A', 'B', 'C', 'D'])
+@pytest.mark.parametrize('seed', [0, 1])
+def test_classifyMany_as_HighestWeightModule(lieType, seed):
+    for weights in byRank(randomWeights(150, seed)):
+        assert rows(classifyMany(weights, lieType)) == \
+            [expected(entry, lieType) for entry in weights]
+
+
+@pytest.mark.parametrize('lieType', ['A', 'B', 'C', 'D'])
+def test_classifyMany_complex(lieType):
+    for weights in byRank(randomWeights(150, 2, complexEntries=True)):
+        result = rows(classifyMany(weights, lieType, 'C'))
+        assert result == [expected(entry, lieType, 'C') for entry in weights]
+        n = len(weights[0]) // 2
+        packed = np.array(weights)[:, :n] + 1j * np.array(weights)[:, n:]
+        assert rows(classifyMany(packed, lieType)) == result
+
+
+def test_very_even_type_D():
+    weights = [[1, 2, 3, 4], [0.5, 1.5, 2.5, 3.5], [-0.5, 1.5, 2.5, 3.5],
+               [1, 1, 2, 2], [4, 3, -5, 6]]
+    assert rows(classifyMany(weights, 'D')) == [expected(w, 'D') for w in weights]
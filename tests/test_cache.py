@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from lieToolbox.cache import (CachedHighestWeightModule, ResultCache,
+                              canonicalSignature, clearCaches)
+from lieToolbox.lie import classifyRecord
+from lieToolbox.weight import Weight, HighestWeightModule
+
+
+def randomWeights(count, seed=0):
+    rng = random.Random(seed)
+    return [[rng.randint(-4, 4) + rng.choice((0, 0, 0.5, 0.1, 0.6))
+             for _ in range(rng.randint(2, 6))] for _ in range(count)]
+
+
+@pytest.mark.parametrize('lieType', ['A', 'B', 'C', 'D'])
+def test_cached_equals_uncached(lieType):
+    clearCaches()
+    for _ in range(2):  # second round from the caches
+        for weight in randomWeights(100):
+            L_lbd = HighestWeightModule(Weight(list(weight), lieType))
+            L_cached = CachedHighestWeightModule(Weight(list(weight), lieType))
+            obt, cached = L_lbd.nilpotentOrbit(), L_cached.nilpotentOrbit()
+            assert (cached.entry, cached.veryEvenType) == \
+                (obt.entry, obt.veryEvenType), weight
+            assert L_cached.GKdim() == L_lbd.GKdim()
+            assert L_cached.nilpotentOrbitInfo() == L_lbd.nilpotentOrbitInfo()
+            assert L_cached.GKdimInfo() == L_lbd.GKdimInfo()
+
+
+@pytest.mark.parametrize('lieType, weight, other', [
+    ('B', [1.1, 2, 0.1], [1.2, 5, 0.2]),
+    ('B', [3, 2, 1], [4, 2, 1]),
+    ('A', [0.3, 1.3, 2.5], [0.4, 1.4, 3.5]),
+])
+def test_equivalent_weights_share_signature(lieType, weight, other):
+    assert canonicalSignature(Weight(weight, lieType)) == \
+        canonicalSignature(Weight(other, lieType))
+
+
+@pytest.mark.parametrize('lieType, weight, other', [
+    ('B', [1.1, 2, 0.1], [1.1, 2, 0.2]),
+    ('B', [3, 2, 1], [1, 2, 3]),
+    ('A', [0.3, 1.3], [1.3, 0.3]),
+    ('C', [1, 2], [1, 2.5]),
+])
+def test_different_weights_have_different_signatures(lieType, weight, other):
+    assert canonicalSignature(Weight(weight, lieType)) != \
+        canonicalSignature(Weight(other, lieType))
+
+
+def test_lru_eviction_and_stats():
+    rc = ResultCache(2)
+    calls = []
+
+    def compute(key):
+        return lambda: calls.append(key) or key.upper()
+
+    assert rc.get('a', compute('a')) == 'A'
+    assert rc.get('b', compute('b')) == 'B'
+    assert rc.get('a', compute('a')) == 'A'  # hit, a is now most recent
+    assert rc.get('c', compute('c')) == 'C'  # evicts b
+    assert list(rc.data) == ['a', 'c']
+    assert rc.get('b', compute('b')) == 'B'  # computed again, evicts a
+    assert calls == ['a', 'b', 'c', 'b']
+    assert rc.stats() == {'hits': 1, 'misses': 4, 'hitRate': 0.2, 'size': 2,
+                          'maxSize': 2}
+    rc.clear()
+    assert (len(rc), rc.stats()['hits'], rc.stats()['misses']) == (0, 0, 0)
+
+
+def test_mutating_record_keeps_cache_intact():
+    clearCaches()
+    lbd = Weight([1.1, 2, 0.1, 0.5], 'D')
+    record = classifyRecord(lbd, info=True)
+    expected = classifyRecord(lbd, info=True)
+    record['orbitInfo']['Orbit'].append(99)
+    record['orbitInfo'].clear()
+    record['gkdimInfo'].clear()
+    assert classifyRecord(lbd, info=True) == expected
+    assert expected['orbitInfo'] == HighestWeightModule(lbd).nilpotentOrbitInfo()
@@ -0,0 +1,51 @@
+import random
+from fractions import Fraction
+
+import pytest
+
+from lieToolbox.chamber import AffineFamily
+from lieToolbox.weight import Weight, HighestWeightModule
+
+eps = Fraction(1, 10**7)
+
+
+def direct(fam, s, t):
+    L_lbd = HighestWeightModule(Weight(fam.weight(s, t), fam.lieType))
+    obt = L_lbd.nilpotentOrbit()
+    return {'orbit': [p_k for p_k in obt.entry if p_k],
+            'veryEvenType': obt.veryEvenType or None,
+            'gkdim': L_lbd.GKdim()}
+
+
+def samplePoints(fam, count, seed=0):
+    """Random points, the points of all faces and midpoints of edges."""
+    rng = random.Random(seed)
+    (s0, s1), (t0, t1) = fam.sRange, fam.tRange
+    points = [(s0 + (s1 - s0) * Fraction(rng.randint(0, 60), 60),
+               t0 + (t1 - t0) * Fraction(rng.randint(0, 60), 60))
+              for _ in range(count)]
+    edgeList, vertexList = fam.faces()
+    points += [ch.point for ch in fam.chambers() + edgeList + vertexList]
+    return points
+
+
+@pytest.mark.parametrize('lieType', ['A', 'B', 'C', 'D'])
+def test_locate_matches_direct_classification(lieType):
+    fam = AffineFamily([Fraction(1, 3), 1, Fraction(1, 2), 2], [1, 0, 1, 0],
+                       [0, 1, 1, -1], lieType, (-1, 1), (-1, 1))
+    for s, t in samplePoints(fam, 200):
+        assert fam.locate(s, t) == direct(fam, s, t), (s, t)
+
+
+@pytest.mark.parametrize('lieType, lbd0, v, w', [
+    ('B', [0, 2, 3 + eps], [1, 0, 0], [0, 0, 1]),
+    ('C', [eps / 3, 1, Fraction(1, 2) + eps / 2], [1, 0, 0], [0, 1, 1]),
+    ('A', [eps / 3, 2, 0], [1, 1, 0], [0, 0, 1]),
+])
+def test_thin_chambers_are_classified_exactly(lieType, lbd0, v, w):
+    # walls closer than the float tolerance 1e-7
+    box = (Fraction(-1, 4), Fraction(1, 4))
+    fam = AffineFamily(lbd0, v, w, lieType, box, box)
+    edgeList, vertexList = fam.faces()
+    for ch in fam.chambers() + edgeList + vertexList:
+        assert fam.locate(*ch.point) == direct(fam, *ch.point)
@@ -0,0 +1,32 @@
+import json
+import os
+
+import pytest
+
+from lieToolbox import DRS_algorithm as drsa
+from lieToolbox.weight import Weight
+
+fixturePath = os.path.join(os.path.dirname(__file__), 'fixtures', 'domino.json')
+with open(fixturePath, encoding='utf-8') as file:
+    cases = json.load(file)['cases']
+
+
+def test_fixture_covers_types():
+    assert {case['lieType'] for case in cases} == {'B', 'C', 'D'}
+
+
+@pytest.mark.parametrize('case', cases, ids=lambda case: '%s%s' % (case['lieType'], case['weight']))
+def test_as_tableau_js(case):
+    lbd = Weight(case['weight'], case['lieType'])
+    wg = Weight.getWeylGroupElement(lbd, lbd.getAntidominant())
+    assert [int(k) for k in wg.entry] == case['w']
+    assert drsa.w2DominoTableau(case['w']) == case['tableau']
+    assert drsa.w2VerticalDominoBoxes(case['w']) == case['verticalDominoes']
+    assert drsa.vertical_domino_boxes(case['tableau']) == case['verticalDominoes']
+
+
+@pytest.mark.parametrize('count, number, expected', [
+    (0, 1, 0), (4, -1, 0), (4, 2, 2), (4, 3, 2), (4, 8, 4)])
+def test_firstGreater(count, number, expected):
+    values = [1, 2, 5, 7]
+    assert drsa.firstGreater(count, number, values.__getitem__) == expected
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from lieToolbox.batch import classifyMany, orbitDimensions
+from lieToolbox.weight import Weight, HighestWeightModule
+
+
+def test_D4_regular_integral_principal_orbit():
+    # The integral part of type D is a D-partition (a-value of type d);
+    # with the type-b a-value this gave GKdim 11.
+    L_lbd = HighestWeightModule(Weight([-3, -2, -1, 0], 'D'))
+    assert L_lbd.nilpotentOrbit().entry == [7, 1]
+    assert L_lbd.GKdim() == 12
+    assert classifyMany([[-3, -2, -1, 0]], 'D')['gkdim'].tolist() == [12]
+
+
+def randomWeights(count, seed=0):
+    rng = random.Random(seed)
+    weights = []
+    for _ in range(count):
+        n = rng.randint(2, 6)
+        weights.append([rng.choice([0, 1, 2, 3, 0.5, 1.5, 0.3]) *
+                        rng.choice([1, -1]) for _ in range(n)])
+    return weights
+
+
+@pytest.mark.parametrize('lieType', ['B', 'C', 'D'])
+def test_GKdim_is_half_the_orbit_dimension(lieType):
+    for weight in randomWeights(200):
+        L_lbd = HighestWeightModule(Weight(weight, lieType))
+        obt = L_lbd.nilpotentOrbit()
+        size = 2 * len(weight) + (1 if lieType == 'B' else 0)
+        dim = orbitDimensions([obt.entry], lieType, len(weight))[0]
+        assert sum(obt.entry) == size
+        assert 2 * L_lbd.GKdim() == dim, weight
+        assert classifyMany([weight], lieType)['gkdim'].tolist() == \
+            [L_lbd.GKdim()]
@@ -0,0 +1,24 @@
+import json
+import os
+
+import pytest
+
+from lieToolbox import H_algorithm as ha
+
+fixturePath = os.path.join(os.path.dirname(__file__), 'fixtures', 'h_algorithm.json')
+with open(fixturePath, encoding='utf-8') as file:
+    cases = json.load(file)['cases']
+
+
+def test_fixture_covers_all_modes():
+    assert {mode for _, mode, _, _ in cases} == {1, 2, 3, 4, 5}
+
+
+@pytest.mark.parametrize('mode', [1, 2, 3, 4, 5])
+def test_as_extension(mode):
+    modeCases = [case for case in cases if case[1] == mode]
+    for p, _, result, label in modeCases:
+        assert ha.H_algorithm(p, mode) == result, p
+        assert ha.getLabel(p, mode) == label, p
+    assert ha.batchH_algorithm([p for p, _, _, _ in modeCases], mode) == \
+        [result for _, _, result, _ in modeCases]
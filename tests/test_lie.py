@@ -0,0 +1,28 @@
+import io
+import json
+
+from lieToolbox import create_app
+from lieToolbox.store import ResultStore
+from lieToolbox.weight import Weight
+
+
+def postWeights(weights, lieType='B'):
+    client = create_app({'RESULT_STORE': None, 'METRICS': False}).test_client()
+    response = client.post('/lie/api/classify',
+                           json={'weights': weights, 'lieType': lieType})
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_api_complex_weight_round_trip(tmp_path):
+    weights = ['1+1i, 2', '0.3+0i, 0.7, 1.3', '0.5, -2i, 3-1.5i']
+    records = postWeights(weights)
+    for text, record in zip(weights, records):
+        lbd = Weight.parseStrWeight(text, 'B')
+        again = Weight.parseStrWeight(record['weight'], 'B')
+        assert (again.type, again.entry) == (lbd.type, lbd.entry)
+    # the output can be posted again and imported into the store
+    assert [r['orbit'] for r in postWeights([r['weight'] for r in records])] == \
+        [r['orbit'] for r in records]
+    lines = io.StringIO(''.join(json.dumps(r) + '\n' for r in records))
+    assert ResultStore(str(tmp_path / 'results.sqlite')).importJSONLines(lines) == 3
@@ -0,0 +1,65 @@
+import re
+
+import pytest
+
+from lieToolbox import create_app, metrics
+from lieToolbox.weight import Weight
+
+sampleLine = re.compile(r'^[a-z_]+(\{[a-z]+="[^"]*"\})? [0-9.e+-]+$')
+
+
+@pytest.fixture
+def client():
+    metrics.resetStats()
+    app = create_app({'RESULT_STORE': None, 'METRICS': True})
+    yield app.test_client()
+    metrics.uninstrument()
+    metrics.resetStats()
+
+
+def parseMetrics(text):
+    values = {}
+    for line in text.splitlines():
+        if line.startswith('# TYPE '):
+            assert line.split()[3] in ('counter', 'gauge')
+            continue
+        assert sampleLine.match(line), line
+        name, value = line.rsplit(' ', 1)
+        values[name] = float(value)
+    return values
+
+
+def test_metrics_format_and_counters(client):
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    assert parseMetrics(response.get_data(as_text=True))['lietoolbox_instrumented'] == 1
+    for _ in range(3):
+        client.post('/lie/classification',
+                    data={'weight': '1.1, 2, 0.1, 0.5', 'lieType': 'D'})
+    values = parseMetrics(client.get('/metrics').get_data(as_text=True))
+    assert values['lietoolbox_stage_calls_total{stage="parse"}'] == 3
+    assert values['lietoolbox_stage_input_size_total{stage="parse"}'] == 3 * 16
+    assert values['lietoolbox_requests_total{endpoint="lie.classification"}'] == 3
+    assert values['lietoolbox_requests_total{endpoint="metricsText"}'] == 1
+    assert 'lietoolbox_cache_hits_total{cache="orbit"}' in values
+
+
+def test_instrument_twice_counts_once(client):
+    metrics.instrument()
+    metrics.initApp(client.application)
+    Weight.parseStrWeight('1, 2', 'B')
+    assert metrics.snapshot()['stages']['parse']['calls'] == 1
+    client.get('/hello')
+    assert metrics.snapshot()['requests']['hello']['requests'] == 1
+
+
+def test_uninstrument_restores_functions(client):
+    metrics.uninstrument()
+    assert not metrics.isInstrumented()
+    assert not hasattr(Weight.__dict__['parseStrWeight'].__func__, 'stage')
+
+
+def test_no_metrics_route_when_disabled():
+    client = create_app({'RESULT_STORE': None, 'METRICS': False}).test_client()
+    assert client.get('/metrics').status_code == 404
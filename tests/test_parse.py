@@ -0,0 +1,55 @@
+from fractions import Fraction
+
+import pytest
+
+from lieToolbox.weight import Weight
+
+
+@pytest.mark.parametrize('token, expected', [
+    ('3', (3, 0, False)),
+    ('-1.5', (-1.5, 0, False)),
+    ('3/2', (1.5, 0, False)),
+    ('1e-3', (0.001, 0, False)),
+    ('i', (0, 1, True)),
+    ('-i', (0, -1, True)),
+    ('1-2i', (1, -2, True)),
+    ('1/2+3/2i', (0.5, 1.5, True)),
+    ('2.5i', (0, 2.5, True)),
+])
+def test_parseEntry(token, expected):
+    assert Weight.parseEntry(token) == expected
+
+
+@pytest.mark.parametrize('token, expected', [
+    ('3/2', (Fraction(3, 2), 0, False)),
+    ('0.1', (Fraction(1, 10), 0, False)),
+    ('-i', (0, Fraction(-1), True)),
+    ('1/3-2i', (Fraction(1, 3), Fraction(-2), True)),
+])
+def test_parseEntry_exact(token, expected):
+    value = Weight.parseEntry(token, exact=True)
+    assert value == expected
+    assert all(isinstance(x, (int, Fraction)) for x in value[:2])
+
+
+def test_exact_weight_sums_exactly():
+    lbd = Weight.parseExactWeight('0.1, 0.2, 3/10', 'B')
+    assert lbd.entry[0] + lbd.entry[1] == lbd.entry[2]
+
+
+@pytest.mark.parametrize('token', [
+    '__import__("os")', '1/0', '1/0i', '1+1/0i', '2**3', '1..2', 'j', '1+2j',
+    'nan', 'x'])
+@pytest.mark.parametrize('exact', [False, True])
+def test_parseEntry_rejects(token, exact):
+    with pytest.raises(ValueError):
+        Weight.parseEntry(token, exact)
+
+
+def test_parseStrWeight():
+    lbd = Weight.parseStrWeight('1, 2.5 3/2', 'B')
+    assert (lbd.entry, lbd.type) == ([1, 2.5, 1.5], 'R')
+    lbd = Weight.parseStrWeight('1+2i, 1-2i, 3i, 0.5', 'C')
+    assert (lbd.entry, lbd.type) == ([1, 1, 0, 0.5, 2, -2, 3, 0], 'C')
+    with pytest.raises(ValueError):
+        Weight.parseStrWeight('1, __import__("os").system("true")', 'B')
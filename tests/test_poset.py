@@ -0,0 +1,75 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from lieToolbox.poset import OrbitPoset, leqPartitions
+
+
+def coverLabels(ps):
+    return {(ps.label(i), ps.label(j)) for i, j in ps.covers()}
+
+
+def test_C2_is_a_chain():
+    ps = OrbitPoset(2, 'C')
+    assert coverLabels(ps) == {('[1, 1, 1, 1]', '[2, 1, 1]'),
+                               ('[2, 1, 1]', '[2, 2]'),
+                               ('[2, 2]', '[4]')}
+
+
+def test_C3():
+    ps = OrbitPoset(3, 'C')
+    assert coverLabels(ps) == {('[1, 1, 1, 1, 1, 1]', '[2, 1, 1, 1, 1]'),
+                               ('[2, 1, 1, 1, 1]', '[2, 2, 1, 1]'),
+                               ('[2, 2, 1, 1]', '[2, 2, 2]'),
+                               ('[2, 2, 2]', '[3, 3]'),
+                               ('[2, 2, 2]', '[4, 1, 1]'),
+                               ('[3, 3]', '[4, 2]'),
+                               ('[4, 1, 1]', '[4, 2]'),
+                               ('[4, 2]', '[6]')}
+
+
+def test_D4():
+    ps = OrbitPoset(4, 'D')
+    assert len(ps) == 12
+    assert coverLabels(ps) == {
+        ('[1, 1, 1, 1, 1, 1, 1, 1]', '[2, 2, 1, 1, 1, 1]'),
+        ('[2, 2, 1, 1, 1, 1]', '[2, 2, 2, 2] I'),
+        ('[2, 2, 1, 1, 1, 1]', '[2, 2, 2, 2] II'),
+        ('[2, 2, 1, 1, 1, 1]', '[3, 1, 1, 1, 1, 1]'),
+        ('[2, 2, 2, 2] I', '[3, 2, 2, 1]'),
+        ('[2, 2, 2, 2] II', '[3, 2, 2, 1]'),
+        ('[3, 1, 1, 1, 1, 1]', '[3, 2, 2, 1]'),
+        ('[3, 2, 2, 1]', '[3, 3, 1, 1]'),
+        ('[3, 3, 1, 1]', '[4, 4] I'),
+        ('[3, 3, 1, 1]', '[4, 4] II'),
+        ('[3, 3, 1, 1]', '[5, 1, 1, 1]'),
+        ('[4, 4] I', '[5, 3]'),
+        ('[4, 4] II', '[5, 3]'),
+        ('[5, 1, 1, 1]', '[5, 3]'),
+        ('[5, 3]', '[7, 1]')}
+
+
+@pytest.mark.parametrize('n, lieType', [(4, 'A'), (3, 'B'), (3, 'C'), (4, 'D'),
+                                        (5, 'D'), (6, 'D')])
+def test_leq_as_NilpotentOrbit_gt(n, lieType):
+    ps = OrbitPoset(n, lieType)
+    pairs = list(itertools.product(range(len(ps)), repeat=2))
+    a, b = (list(x) for x in zip(*pairs))
+    expected = [ps.orbitList[j] > ps.orbitList[i] for i, j in pairs]
+    assert ps.leq(a, b, chunkSize=7).tolist() == expected
+    assert ps.closureMatrix()[a, b].tolist() == expected
+    assert ps.leq(a, b).tolist() == expected  # from the matrix
+    assert leqPartitions(ps.partitions[a], ps.partitions[b],
+                         ps.veryEvenType[a], ps.veryEvenType[b]).tolist() == expected
+
+
+def test_covers_generate_the_order():
+    ps = OrbitPoset(5, 'D')
+    m = len(ps)
+    reach = np.eye(m, dtype=bool)
+    for i, j in ps.covers():
+        reach[i, j] = True
+    for _ in range(m):
+        reach = reach | ((reach.astype(int) @ reach.astype(int)) > 0)
+    assert (reach == ps.closureMatrix()).all()
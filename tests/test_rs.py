@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+from lieToolbox import RS_algorithm as rsa
+
+
+def test_known_tableau():
+    sequence = [1.1, 2, 0.1, 1.5, 4, 2.5]
+    assert rsa.convert2Index(sequence) == [1, 3, 0, 2, 5, 4]
+    assert rsa.constructYoungTableau([1, 3, 0, 2, 5, 4]) == [[0, 2, 4], [1, 3, 5]]
+    assert rsa.constructShape(sequence) == [3, 3]
+
+
+def test_equal_entries_stay_in_one_row():
+    assert rsa.constructShape([2, 1 + 1e-9, 1, 1]) == [3, 1]
+    assert rsa.constructShape([0.1, 0.1 + 2e-7]) == [2]
+    assert rsa.constructShape([0.1 + 2e-7, 0.1]) == [1, 1]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_shape_is_tableau_shape(seed):
+    rng = random.Random(seed)
+    sequence = [rng.choice([rng.randint(-5, 5), rng.random()]) for _ in range(40)]
+    tableau = rsa.constructYoungTableau(rsa.convert2Index(sequence))
+    assert rsa.constructShape(sequence) == [len(row) for row in tableau]
+    assert sorted(x for row in tableau for x in row) == sorted(rsa.convert2Index(sequence))
+    # longest weakly increasing subsequence = first row (Schensted)
+    index = rsa.convert2Index(sequence)
+    longest = [1] * len(index)
+    for i in range(len(index)):
+        for j in range(i):
+            if index[j] <= index[i]:
+                longest[i] = max(longest[i], longest[j] + 1)
+    assert len(tableau[0]) == max(longest)
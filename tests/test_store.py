@@ -0,0 +1,29 @@
+import io
+from fractions import Fraction
+
+from lieToolbox.store import ResultStore
+from lieToolbox.weight import Weight
+
+result = {'orbit': [3, 1], 'veryEvenType': None, 'gkdim': 2}
+
+
+def test_export_import_round_trip(tmp_path):
+    weights = [Weight([Fraction(1, 3), 2, 0], 'C'),
+               Weight([Fraction(1, 3), Fraction(-5, 7), 2, 0], 'B', 'C'),
+               Weight.parseStrWeight('0.3+0i, 0.7, 1.3', 'B'),
+               Weight.parseStrWeight('1-2i, 0.5, 3', 'D'),
+               Weight([1.1, 2, -0.25], 'D'),
+               Weight([Fraction(2, 3), Fraction(1, 2)], 'A')]
+    store = ResultStore(str(tmp_path / 'a.sqlite'))
+    store.putMany((lbd, result) for lbd in weights)
+    exported = io.StringIO()
+    assert store.exportJSONLines(exported) == len(weights)
+
+    copy = ResultStore(str(tmp_path / 'b.sqlite'))
+    assert copy.importJSONLines(io.StringIO(exported.getvalue())) == len(weights)
+    for lbd in weights:
+        assert copy.get(lbd) == result
+    again = io.StringIO()
+    copy.exportJSONLines(again)
+    assert sorted(again.getvalue().splitlines()) == \
+        sorted(exported.getvalue().splitlines())
@@ -0,0 +1,17 @@
+import sys
+
+import pytest
+
+from lieToolbox.stress import randomCases, stressCore
+
+
+@pytest.fixture
+def switchOften():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_stressCore_matches_sequential(switchOften):
+    assert stressCore(randomCases(60, seed=1), threads=8, rounds=3) == 0
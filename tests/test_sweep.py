@@ -0,0 +1,60 @@
+import io
+import json
+
+import pytest
+
+from lieToolbox.sweep import classifyChunk, initWorker, readWeights, runSweep
+from lieToolbox.weight import Weight, HighestWeightModule
+
+weights = [[1.1, 2, 0.1], [1, 1, 0.5], [0.3, 0.7, 1.3], [2.5, -1, 3],
+           [1.1, 2, 0.1], [0, 0, 0], [4, 0.2, -0.2], [1.5, 0.5, 7]]
+
+
+def expected(weight, lieType):
+    L_lbd = HighestWeightModule(Weight(list(weight), lieType))
+    obt = L_lbd.nilpotentOrbit()
+    return obt.entry, obt.veryEvenType, L_lbd.GKdim()
+
+
+@pytest.mark.parametrize('cacheSize', [0, 1, 5, 100])
+def test_classifyChunk_larger_than_cache(cacheSize):
+    initWorker('B', 'R', cacheSize)
+    chunk = [tuple(float(x) for x in w) for w in weights]
+    for _ in range(2):  # second round partly from the cache
+        values = classifyChunk(chunk)
+        assert [tuple(v) for v in values] == [expected(w, 'B') for w in chunk]
+
+
+def test_runSweep_chunk_larger_than_cache():
+    output = io.StringIO()
+    summary = runSweep(weights * 3, 'D', output, processes=1, chunkSize=20,
+                       cacheSize=5)
+    assert summary['count'] == 3 * len(weights)
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    for weight, record in zip(weights * 3, records):
+        orbit, veryEvenType, gkdim = expected(weight, 'D')
+        assert (record['orbit'], record['veryEvenType'], record['gkdim']) == \
+            (orbit, veryEvenType, gkdim)
+
+
+@pytest.mark.parametrize('line', ['0.3+0i, 0.7, 1.3', '1+1i, 2, 0.5', '0.5, -1i, 2+0i'])
+def test_complex_line_as_parseStrWeight(line):
+    lbd = Weight.parseStrWeight(line, 'B')
+    L_lbd = HighestWeightModule(lbd)
+    obt = L_lbd.nilpotentOrbit()
+    output = io.StringIO()
+    runSweep(readWeights([line]), 'B', output, processes=1)
+    record = json.loads(output.getvalue())
+    assert (record['orbit'], record['veryEvenType'], record['gkdim']) == \
+        (obt.entry, obt.veryEvenType, L_lbd.GKdim())
+    assert Weight.parseStrWeight(record['weight'], 'B').complexEntry() == \
+        lbd.complexEntry()
+    assert Weight.parseStrWeight(record['weight'], 'B').type == lbd.type
+
+
+def test_complex_and_real_weight_not_shared_in_cache():
+    initWorker('B', 'R', 10)
+    real, packed = (0.3, 0.7, 1.3), (0.3 + 0j, 0.7 + 0j, 1.3 + 0j)
+    values = classifyChunk([real, packed])
+    assert tuple(values[0]) == expected(real, 'B')
+    assert tuple(values[1])[::2] == ([7], 9)
@@ -0,0 +1,42 @@
+import pytest
+
+from lieToolbox import tables
+from lieToolbox.poset import OrbitPoset
+from lieToolbox.weight import NilpotentOrbit, Partition
+
+
+@pytest.fixture
+def tableDirectory(tmp_path, monkeypatch):
+    directory = str(tmp_path / 'tables')
+    tables.buildTables(6, directory)
+    monkeypatch.setattr(tables, 'tableDirectory', directory)
+    monkeypatch.setattr(tables, 'tableCache', {})
+    return directory
+
+
+@pytest.mark.parametrize('lieType', 'ABCD')
+def test_table_lookup_as_computed(tableDirectory, lieType):
+    for n in range(1, 7):
+        orbits = NilpotentOrbit.generateOrbitList(n, lieType)
+        tb = tables.findTable(n, lieType)
+        assert [(o.entry, o.veryEvenType) for o in tables.orbitList(n, lieType)] == \
+            [(o.entry, o.veryEvenType) for o in orbits]
+        for i, obt in enumerate(orbits):
+            assert tb.find(obt.entry, obt.veryEvenType) == i
+            assert tables.orbitData(obt) == tables.computeOrbitData(obt.entry, lieType)
+    assert tables.findTable(7, lieType) is None
+    assert tables.orbitList(7, lieType)  # computed without a table
+
+
+def test_poset_reads_table(tableDirectory):
+    ps = OrbitPoset(5, 'D')
+    assert tables.findTable(5, 'D') is not None
+    assert [o.entry for o in ps.orbitList] == \
+        [o.entry for o in NilpotentOrbit.generateOrbitList(5, 'D')]
+
+
+def test_special_is_not_isSpecialType(tableDirectory):
+    tb = tables.findTable(2, 'B')
+    assert Partition([2, 2, 1], 'B').isSpecialType()
+    assert not tb.getInfo(tb.find([2, 2, 1]))['special']
+    assert tables.warmTables(6) == 24